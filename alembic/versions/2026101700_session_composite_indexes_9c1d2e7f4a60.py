@@ -0,0 +1,59 @@
+"""session_composite_indexes
+
+Revision ID: 9c1d2e7f4a60
+Revises: 4ae827539a0c
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c1d2e7f4a60"
+down_revision = "4ae827539a0c"
+branch_labels = None
+depends_on = None
+
+KPI_TABLES = ["cyes", "fstb", "lgrk", "news", "oval", "ovar", "rfct", "sape", "sown"]
+
+# (name, table, columns, extra create_index options)
+INDEXES = [
+    # Paginated listings: WHERE session_id = ? ORDER BY update_time DESC, id DESC
+    ("ix_upload_supplier_session_update_time", "upload_supplier_master_data", ["session_id", "update_time", "id"], {}),
+    (
+        "ix_upload_supplier_session_fvs_update_time",
+        "upload_supplier_master_data",
+        ["session_id", "final_validation_status", "update_time", "id"],
+        {},
+    ),
+    ("ix_upload_supplier_session_ens", "upload_supplier_master_data", ["session_id", "ens_id"], {}),
+    ("ix_supplier_master_session_update_time", "supplier_master_data", ["session_id", "update_time", "id"], {}),
+    ("ix_supplier_master_session_ens", "supplier_master_data", ["session_id", "ens_id"], {}),
+    ("ix_external_supplier_session_ens", "external_supplier_data", ["session_id", "ens_id"], {}),
+    ("ix_company_profile_session_ens", "company_profile", ["session_id", "ens_id"], {}),
+    ("ix_ensid_screening_session_ens", "ensid_screening_status", ["session_id", "ens_id"], {}),
+    # Latest completed screening per ens_id (graph.py), index-only
+    (
+        "ix_ensid_screening_ens_update_time",
+        "ensid_screening_status",
+        ["ens_id", "update_time", "id"],
+        {"postgresql_include": ["session_id", "overall_status"]},
+    ),
+    ("ix_session_screening_update_time", "session_screening_status", ["update_time", "id"], {}),
+] + [(f"ix_{table}_session_ens", table, ["session_id", "ens_id"], {}) for table in KPI_TABLES]
+
+
+# The screening and KPI tables are large and written to continuously, so every index is built
+# CONCURRENTLY: writes keep flowing during the build, which only takes a SHARE UPDATE EXCLUSIVE
+# lock. CONCURRENTLY cannot run inside a transaction, hence the autocommit block. If a build
+# fails, Postgres leaves an INVALID index behind; drop it before re-running the migration.
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, **options)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,93 @@
+"""latest_ens_screening
+
+Revision ID: b3f0a81c5d27
+Revises: 9c1d2e7f4a60
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3f0a81c5d27"
+down_revision = "9c1d2e7f4a60"
+branch_labels = None
+depends_on = None
+
+
+# Keeps latest_ens_screening pointing at the most recent COMPLETED screening of each ens_id
+# (ordered by update_time, then id). A row leaving COMPLETED, or being deleted, while it is the
+# latest makes the function fall back to the next most recent COMPLETED screening.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_latest_ens_screening() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' AND NEW.ens_id IS NOT NULL AND NEW.overall_status = 'COMPLETED' THEN
+        INSERT INTO latest_ens_screening (ens_id, session_id, screening_id, screening_time)
+        VALUES (NEW.ens_id, NEW.session_id, NEW.id, NEW.update_time)
+        ON CONFLICT (ens_id) DO UPDATE
+            SET session_id = EXCLUDED.session_id,
+                screening_id = EXCLUDED.screening_id,
+                screening_time = EXCLUDED.screening_time,
+                update_time = now()
+            WHERE latest_ens_screening.screening_id = EXCLUDED.screening_id
+               OR (latest_ens_screening.screening_time, latest_ens_screening.screening_id)
+                  < (EXCLUDED.screening_time, EXCLUDED.screening_id);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP <> 'INSERT' AND EXISTS (
+        SELECT 1 FROM latest_ens_screening WHERE ens_id = OLD.ens_id AND screening_id = OLD.id
+    ) THEN
+        DELETE FROM latest_ens_screening WHERE ens_id = OLD.ens_id;
+        INSERT INTO latest_ens_screening (ens_id, session_id, screening_id, screening_time)
+        SELECT ens_id, session_id, id, update_time
+        FROM ensid_screening_status
+        WHERE ens_id = OLD.ens_id AND overall_status = 'COMPLETED'
+        ORDER BY update_time DESC, id DESC
+        LIMIT 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    op.create_table(
+        "latest_ens_screening",
+        sa.Column("ens_id", sa.String(length=50), nullable=False),
+        sa.Column("session_id", sa.String(length=50), nullable=False),
+        sa.Column("screening_id", sa.Integer(), nullable=False),
+        sa.Column("screening_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("create_time", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("update_time", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("ens_id"),
+    )
+
+    op.execute(REFRESH_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER trg_latest_ens_screening
+        AFTER INSERT OR UPDATE OR DELETE ON ensid_screening_status
+        FOR EACH ROW EXECUTE FUNCTION refresh_latest_ens_screening();
+        """
+    )
+
+    # Backfill from the screenings already completed
+    op.execute(
+        """
+        INSERT INTO latest_ens_screening (ens_id, session_id, screening_id, screening_time)
+        SELECT DISTINCT ON (ens_id) ens_id, session_id, id, update_time
+        FROM ensid_screening_status
+        WHERE ens_id IS NOT NULL AND overall_status = 'COMPLETED'
+        ORDER BY ens_id, update_time DESC, id DESC;
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_latest_ens_screening ON ensid_screening_status;")
+    op.execute("DROP FUNCTION IF EXISTS refresh_latest_ens_screening();")
+    op.drop_table("latest_ens_screening")
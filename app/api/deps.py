@@ -3,11 +3,13 @@ from datetime import datetime
 from typing import Annotated
 from fastapi import Depends, HTTPException, Request, status, Security
 from sqlalchemy import or_, select
+from azure.storage.blob.aio import BlobServiceClient
+from neo4j import AsyncDriver
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import APIKeyHeader
 
 from app.api import api_messages
-from app.core import database_session
+from app.core import blob_storage, database_session, graph_database
 from app.core.security.jwt import verify_jwt_token
 from app.models import User, Base
 from app.schemas.logger import logger
@@ -18,6 +20,13 @@ api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 async def get_session() -> AsyncGenerator[AsyncSession]:
     async with database_session.get_async_session() as session:
         yield session
+
+def get_graph_driver() -> AsyncDriver:
+    return graph_database.get_graph_driver()
+
+async def get_blob_service_client() -> BlobServiceClient:
+    return blob_storage.get_blob_service_client()
+
 def is_tprp_route(path: str) -> bool:
     return "tprp" in path  # Modify this based on how you match TPRP routes
 
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from neo4j import AsyncDriver
 from app.schemas.requests import *
 from app.schemas.responses import *
 from app.core.supplier.graph import *
@@ -9,12 +11,12 @@ from app.schemas.requests import *
 router = APIRouter()
 
 @router.post("/get-network-graph")
-async def get_graph(filter_request: EntityFilterRequest):
+async def get_graph(filter_request: EntityFilterRequest, driver: AsyncDriver = Depends(deps.get_graph_driver)):
 
     try:
         filter_request = filter_request.dict()
 
-        transformed_data = await run_graph_retrieval(filter_request)
+        transformed_data = await run_graph_retrieval(filter_request, driver)
 
         # print(transformed_data)
 
@@ -31,6 +33,12 @@ async def get_graph(filter_request: EntityFilterRequest):
             detail=f"Failed to generate network graph: {str(error)}"
         )
 
+@router.post("/get-network-graph/stream", description="Network graph as NDJSON: one node or edge per line, then a summary line.")
+async def get_graph_stream(filter_request: EntityFilterRequest, driver: AsyncDriver = Depends(deps.get_graph_driver)):
+
+    filter_request = filter_request.dict()
+    return StreamingResponse(stream_graph_retrieval(filter_request, driver), media_type="application/x-ndjson")
+
 @router.post("/get-submodal-profile")
 async def get_profile(request: SubModalItem,
                       session: AsyncSession = Depends(deps.get_session),
@@ -105,10 +113,11 @@ async def get_findings(request: SubModalItem,
 
 @router.get("/entity-countries")
 async def get_entity_countries(client_id: str = Query(..., description="UUID of the company"), session: AsyncSession = Depends(deps.get_session),
-                       current_user: User = Depends(deps.get_current_user)):
+                       current_user: User = Depends(deps.get_current_user),
+                       driver: AsyncDriver = Depends(deps.get_graph_driver)):
     try:
 
-        transformed_data = await get_distinct_supplier_countries(client_id)
+        transformed_data = await get_distinct_supplier_countries(client_id, driver)
 
         return transformed_data
 
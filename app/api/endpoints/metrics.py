@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core.graph_database import publish_graph_pool_metrics
+from app.core.utils import metrics
+from app.models import User
+
+router = APIRouter()
+
+
+@router.get("/runtime", description="In-process runtime metrics for this worker (upload pool depth, stage timings, pool checkouts, Neo4j pool usage).")
+async def runtime_metrics(current_user_id: User = Depends(deps.get_current_user)):
+    publish_graph_pool_metrics()
+    return metrics.snapshot()
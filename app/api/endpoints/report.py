@@ -1,17 +1,18 @@
 from typing import List
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.requests import BulkPayload, SinglePayloadItem
 from app.schemas.responses import *
 from app.core.supplier.report import *
 from app.api import deps
+from azure.storage.blob.aio import BlobServiceClient
 import pandas as pd
 import io
 from app.core.config import get_settings
 
 router = APIRouter()
 from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import Optional
 from app.models import User
 
@@ -22,17 +23,21 @@ async def download_report(
     session_id: str = Query(..., description="Session ID"),
     ens_id: str = Query(..., description="ENS ID"),
     type_of_file: str = Query(..., description="Type of file (e.g., docx, pdf, csv)"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
     session: AsyncSession = Depends(deps.get_session),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user),
+    blob_service_client: BlobServiceClient = Depends(deps.get_blob_service_client)
 ):
     try:
-        file_data, result = await report_download(session_id, ens_id, type_of_file, session)
+        result = await report_download_stream(
+            session_id, ens_id, type_of_file, session, blob_service_client,
+            range_header=range_header, if_none_match=if_none_match, if_range=if_range
+        )
 
-        if file_data is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No Report Found."
-            )
+        if result["status_code"] == status.HTTP_304_NOT_MODIFIED:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=result["headers"])
 
         # Determine media type based on file type
         media_types = {
@@ -42,22 +47,35 @@ async def download_report(
         }
         media_type = media_types.get(type_of_file.lower(), "application/octet-stream")
 
-        return Response(
-            content=file_data,
+        return StreamingResponse(
+            result["content"],
+            status_code=result["status_code"],
             media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={result}"}
+            headers=result["headers"]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
 
 @router.get("/bulk-download-report/")
 async def bulk_download_report(session_id: str = Query(..., description="Session ID"), 
+    stream: bool = Query(False, description="Stream the zip as reports download instead of building it first"),
     session: AsyncSession = Depends(deps.get_session),
-    current_user: User = Depends(deps.get_current_user)):
+    current_user: User = Depends(deps.get_current_user),
+    blob_service_client: BlobServiceClient = Depends(deps.get_blob_service_client)):
     try:
-        file_data, result = await report_bulk_download(session_id, session)
+        if stream:
+            zip_chunks, result = await report_bulk_download_stream(session_id, session, blob_service_client)
+            return StreamingResponse(
+                zip_chunks,
+                media_type="application/zip",
+                headers={"Content-Disposition": f"attachment; filename={result}"}
+            )
+
+        file_data, result = await report_bulk_download(session_id, session, blob_service_client)
 
         if file_data is None:
             raise HTTPException(
@@ -79,24 +97,25 @@ async def bulk_download_report(session_id: str = Query(..., description="Session
         return {"error": str(e)}
 
 
-@router.get("/reviw-report/", response_model=Dict)
+@router.get("/reviw-report/")
 async def reviw_report(
     session_id: str = Query(..., description="Session ID"),
     ens_id: str = Query(..., description="ENS ID"),
     current_user: User = Depends(deps.get_current_user),
-    dbsession: AsyncSession = Depends(deps.get_session)
+    dbsession: AsyncSession = Depends(deps.get_session),
+    blob_service_client: BlobServiceClient = Depends(deps.get_blob_service_client)
 ):
     try:
         # Pass 'json' as the type_of_file
-        json_data = await reviw_json_report_(dbsession, session_id, ens_id, type_of_file='json')
-        print("json_data",json_data)
-        if not json_data:
+        report_body = await reviw_json_report_(dbsession, session_id, ens_id, type_of_file='json', blob_service_client=blob_service_client)
+        if not report_body:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No Report Found."
             )
 
-        return JSONResponse(content=json_data)
+        # Already-encoded JSON: served as is, without a parse and re-serialise
+        return Response(content=report_body, media_type="application/json")
 
     except HTTPException:
         raise
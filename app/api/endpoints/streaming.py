@@ -45,6 +45,8 @@ async def websocket_session_status(
 
     try:
         initial_state = await get_session_screening_status_static(session_id, session)
+        # The socket stays open indefinitely; hand the pooled connection back now
+        await session.close()
         logger.debug(initial_state)
         await websocket.send_text(json.dumps(initial_state, default=serialize_for_json))
         conn = await asyncpg.connect(DATABASE_URL)
@@ -100,6 +100,7 @@ async def get_entity_data(
     page_no: int = Query(1, ge=1),       
     rows_per_page: int = Query(10, le=1000), 
     final_validation_status: Literal["", "review", "auto_reject", "auto_accept"] = "",
+    cursor: Optional[str] = Query(None, description="Continuation token returned as next_cursor by the previous page"),
     session: AsyncSession = Depends(deps.get_session),
     current_user: User = Depends(deps.get_current_user)
 ):
@@ -112,7 +113,7 @@ async def get_entity_data(
             )
 
         # Fetch data from DB
-        sheet_data = await get_session_supplier(session_id, page_no, rows_per_page, final_validation_status, session)
+        sheet_data = await get_session_supplier(session_id, page_no, rows_per_page, final_validation_status, session, cursor)
 
         return ResponseMessage(
             status="success",
@@ -219,6 +220,7 @@ async def get_main_entity_data(
     session_id: str, 
     page_no: int = Query(1, ge=1),       
     rows_per_page: int = Query(10, le=1000), 
+    cursor: Optional[str] = Query(None, description="Continuation token returned as next_cursor by the previous page"),
     session: AsyncSession = Depends(deps.get_session),
     current_user: User = Depends(deps.get_current_user)
 ):
@@ -228,7 +230,7 @@ async def get_main_entity_data(
             raise HTTPException(status_code=400, detail="No session_id provided.")
 
         # Fetch entity data
-        sheet_data = await get_main_session_supplier(session_id, page_no, rows_per_page, session)
+        sheet_data = await get_main_session_supplier(session_id, page_no, rows_per_page, session, cursor)
 
         # If no data found, raise a 404 error
         if not sheet_data.get("data"):
@@ -256,6 +258,7 @@ async def get_main_entity_data_compiled(
     session_id: str, 
     page_no: int = Query(1, ge=1),       
     rows_per_page: int = Query(10, le=1000), 
+    cursor: Optional[str] = Query(None, description="Continuation token returned as next_cursor by the previous page"),
     session: AsyncSession = Depends(deps.get_session),
     current_user: User = Depends(deps.get_current_user)
 ):
@@ -265,7 +268,7 @@ async def get_main_entity_data_compiled(
             raise HTTPException(status_code=400, detail="No session_id provided.")
 
         # Fetch entity data
-        sheet_data = await get_main_session_supplier_compiled(session_id, page_no, rows_per_page, session)
+        sheet_data = await get_main_session_supplier_compiled(session_id, page_no, rows_per_page, session, cursor)
 
         # If no data found, raise a 404 error
         if not sheet_data.get("data"):
@@ -292,12 +295,13 @@ async def get_session_screening_status_data(
     page_no: int = Query(1, ge=1),       
     rows_per_page: int = Query(10, le=1000), 
     screening_analysis_status: Optional[Literal["", "active", "not_started"]] = "",
+    cursor: Optional[str] = Query(None, description="Continuation token returned as next_cursor by the previous page"),
     session: AsyncSession = Depends(deps.get_session),
     current_user: User = Depends(deps.get_current_user)
 ):
     try:
         # Fetch screening status data
-        sheet_data = await get_session_screening_status(page_no, rows_per_page, screening_analysis_status, session)
+        sheet_data = await get_session_screening_status(page_no, rows_per_page, screening_analysis_status, session, cursor)
 
         # Ensure the data exists
         if not sheet_data["data"]:
@@ -0,0 +1,49 @@
+# Azure Blob Storage async client shared by the whole worker
+#
+# One aio BlobServiceClient per worker, on an aiohttp transport whose connector pools connections to
+# the storage account. It is created on first use (inside the running event loop, as aiohttp requires)
+# and closed at shutdown (close_blob_service_client).
+#
+# https://learn.microsoft.com/en-us/python/api/azure-storage-blob/azure.storage.blob.aio.blobserviceclient
+
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob.aio import BlobServiceClient
+
+from app.core.config import get_settings
+
+_BLOB_SERVICE_CLIENT: BlobServiceClient | None = None
+
+
+def new_blob_service_client() -> BlobServiceClient:
+    storage = get_settings().storage
+    http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=storage.max_connections))
+    transport = AioHttpTransport(
+        session=http_session,
+        session_owner=True,
+        connection_timeout=storage.connection_timeout,
+        read_timeout=storage.read_timeout,
+    )
+    return BlobServiceClient(
+        account_url=storage.storage_account_url,
+        credential=str(storage.sas_token),
+        transport=transport,
+        max_single_get_size=storage.download_chunk_size,
+        max_chunk_get_size=storage.download_chunk_size,
+    )
+
+
+def get_blob_service_client() -> BlobServiceClient:
+    """Return the shared client, creating it on first use; call from within the event loop."""
+    global _BLOB_SERVICE_CLIENT
+    if _BLOB_SERVICE_CLIENT is None:
+        _BLOB_SERVICE_CLIENT = new_blob_service_client()
+    return _BLOB_SERVICE_CLIENT
+
+
+async def close_blob_service_client():
+    global _BLOB_SERVICE_CLIENT
+    if _BLOB_SERVICE_CLIENT is not None:
+        await _BLOB_SERVICE_CLIENT.close()
+        _BLOB_SERVICE_CLIENT = None
@@ -16,7 +16,7 @@
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import AnyHttpUrl, AnyUrl, BaseModel, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy.engine.url import URL
@@ -48,6 +48,18 @@ class Storage(BaseModel):
     container_name: str
     sas_token: str
     storage_account_key: str
+    # Shared async client (app/core/blob_storage.py): pooled HTTP connections to the storage account
+    max_connections: int = 32
+    connection_timeout: int = 10
+    read_timeout: int = 120
+    # Size of each ranged GET when a blob is streamed (also the first request's size)
+    download_chunk_size: int = 4 * 1024 * 1024
+    # Blobs fetched in parallel while building a bulk-download zip
+    download_concurrency: int = 8
+    # Latest report blob per (ens_id, extension), cached per session (app/core/supplier/report_manifest.py)
+    manifest_cache_size: int = 1024
+    # Safety net for reports replaced without an ens_id status notification
+    manifest_cache_ttl: int = 3600
 
 class Urls(BaseModel):
     frontend: str
@@ -61,18 +73,53 @@ class GraphDb(BaseModel):
     uri: str
     user: str
     password: str
+    # Shared driver pool (app/core/graph_database.py)
+    max_connection_pool_size: int = 50
+    # Seconds to wait for a free pooled connection before failing the query
+    connection_acquisition_timeout: float = 30.0
+    # Idle connections older than this (seconds) are pinged before reuse; None disables the check
+    liveness_check_timeout: Optional[float] = 30.0
+    max_connection_lifetime: int = 3600
+
+class GraphCache(BaseModel):
+    # Network-graph results per client and filter set; dropped when a supplier of the client completes screening
+    enabled: bool = True
+    maxsize: int = 256
+    # Safety net for graph writes that arrive without a completion notification
+    ttl: int = 900
+    # Optional shared tier, e.g. redis://redis:6379/1; each worker keeps its own in-process LRU in front of it
+    redis_url: Optional[str] = None
+
+class ReportCache(BaseModel):
+    # Raw JSON review reports keyed by blob ETag; a report's bytes never change under one ETag
+    enabled: bool = True
+    max_bytes: int = 64 * 1024 * 1024
+    # Optional shared tier, e.g. redis://redis:6379/2; each worker keeps its own in-process LRU in front of it
+    redis_url: Optional[str] = None
+    redis_ttl: int = 86400
 
 class AllowedRows(BaseModel):
     general : int
     tprp : int
 
+class Upload(BaseModel):
+    # Rows validated and inserted per round trip; keeps bind parameters under the asyncpg limit
+    chunk_size: int = 500
+    # Worker threads for parsing/validating uploads; extra uploads queue behind them
+    max_workers: int = 4
+    # "copy" loads upload rows with binary COPY; "insert" uses chunked multi-row INSERTs
+    bulk_mode: Literal["copy", "insert"] = "copy"
+
 class Settings(BaseSettings):
     security: Security
     storage: Storage
     database: Database
     urls: Urls
     graphdb: GraphDb
+    graphcache: GraphCache = GraphCache()
+    reportcache: ReportCache = ReportCache()
     allowedrows: AllowedRows
+    upload: Upload = Upload()
 
 
     @computed_field  # type: ignore[prop-decorator]
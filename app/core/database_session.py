@@ -6,6 +6,9 @@
 # https://docs.sqlalchemy.org/en/20/core/pooling.html#sqlalchemy.pool.Pool
 
 
+from contextvars import ContextVar
+
+from sqlalchemy import event
 from sqlalchemy.engine.url import URL
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -15,6 +18,10 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.core.config import get_settings
+from app.core.utils import metrics
+
+# Pool checkouts made while serving the current request; set by CheckoutCounterMiddleware
+_REQUEST_CHECKOUTS: ContextVar[list | None] = ContextVar("request_checkouts", default=None)
 
 
 def new_async_engine(uri: URL) -> AsyncEngine:
@@ -32,5 +39,39 @@ _ASYNC_ENGINE = new_async_engine(get_settings().sqlalchemy_database_uri)
 _ASYNC_SESSIONMAKER = async_sessionmaker(_ASYNC_ENGINE, expire_on_commit=False)
 
 
+@event.listens_for(_ASYNC_ENGINE.sync_engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.increment("db_pool_checkouts")
+    checkouts = _REQUEST_CHECKOUTS.get()
+    if checkouts is not None:
+        checkouts[0] += 1
+
+
+class CheckoutCounterMiddleware:
+    """
+    ASGI middleware recording how many pool checkouts each HTTP request makes.
+
+    A request that keeps its session for its whole lifetime should make exactly one; the distribution is
+    exposed as the db_checkouts_per_request observation (count/avg/max) in GET /metrics/runtime.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        checkouts = [0]
+        token = _REQUEST_CHECKOUTS.set(checkouts)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _REQUEST_CHECKOUTS.reset(token)
+            metrics.observe("db_checkouts_per_request", checkouts[0])
+            if checkouts[0] > 1:
+                metrics.increment("db_requests_with_multiple_checkouts")
+
+
 def get_async_session() -> AsyncSession:  # pragma: no cover
     return _ASYNC_SESSIONMAKER()
@@ -0,0 +1,72 @@
+# Neo4j async driver shared by the whole worker
+#
+# The driver owns a connection pool; sessions are cheap and borrow pooled connections, so one driver is
+# created at startup (init_graph_driver) and closed at shutdown (close_graph_driver).
+#
+# https://neo4j.com/docs/api/python-driver/current/async_api.html#async-driver-configuration
+
+
+from neo4j import AsyncDriver, AsyncGraphDatabase
+
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.schemas.logger import logger
+
+_GRAPH_DRIVER: AsyncDriver | None = None
+
+
+def new_graph_driver() -> AsyncDriver:
+    graphdb = get_settings().graphdb
+    return AsyncGraphDatabase.driver(
+        graphdb.uri,
+        auth=(graphdb.user, graphdb.password),
+        max_connection_pool_size=graphdb.max_connection_pool_size,
+        connection_acquisition_timeout=graphdb.connection_acquisition_timeout,
+        liveness_check_timeout=graphdb.liveness_check_timeout,
+        max_connection_lifetime=graphdb.max_connection_lifetime,
+    )
+
+
+def get_graph_driver() -> AsyncDriver:
+    """Return the shared driver, creating it on first use (e.g. outside the app lifespan)."""
+    global _GRAPH_DRIVER
+    if _GRAPH_DRIVER is None:
+        _GRAPH_DRIVER = new_graph_driver()
+    return _GRAPH_DRIVER
+
+
+async def init_graph_driver():
+    driver = get_graph_driver()
+    try:
+        await driver.verify_connectivity()
+        logger.info("Neo4j connection established.")
+    except Exception as e:
+        # The driver keeps retrying on demand; a graph outage must not stop the API from starting
+        logger.error(f"Failed to connect to Neo4j: {e}")
+
+
+async def close_graph_driver():
+    global _GRAPH_DRIVER
+    if _GRAPH_DRIVER is not None:
+        await _GRAPH_DRIVER.close()
+        _GRAPH_DRIVER = None
+
+
+def publish_graph_pool_metrics():
+    """
+    Record the shared driver's pool state as graph_pool_* gauges.
+
+    The driver has no public pool statistics, so this reads its pool object and skips quietly if
+    that internal layout changes.
+    """
+    if _GRAPH_DRIVER is None:
+        return
+    try:
+        pool = _GRAPH_DRIVER._pool
+        connections = [connection for address_connections in pool.connections.values() for connection in address_connections]
+        in_use = sum(1 for connection in connections if connection.in_use)
+        metrics.set_gauge("graph_pool_in_use", in_use)
+        metrics.set_gauge("graph_pool_idle", len(connections) - in_use)
+        metrics.set_gauge("graph_pool_max_size", pool.pool_config.max_connection_pool_size)
+    except AttributeError as e:
+        logger.debug(f"Neo4j pool metrics unavailable: {e}")
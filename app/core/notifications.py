@@ -0,0 +1,111 @@
+# Postgres LISTEN/NOTIFY fan-out shared by the whole worker
+#
+# One dedicated asyncpg connection listens on every channel that has subscribers and hands each
+# JSON payload to them. Core modules subscribe at import time; the listener is started at app
+# startup and reconnects on its own if the connection drops.
+#
+# https://magicstack.github.io/asyncpg/current/api/index.html#asyncpg.connection.Connection.add_listener
+
+
+import asyncio
+import json
+from collections import defaultdict
+
+import asyncpg
+
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.schemas.logger import logger
+
+RECONNECT_DELAY_SECONDS = 5
+
+_CHANNEL_HANDLERS = defaultdict(list)
+# Called whenever the listener (re)connects, since notifications sent while disconnected are lost
+_RESET_HANDLERS = []
+_listener_task: asyncio.Task | None = None
+_dispatch_tasks = set()
+
+
+def subscribe(channel: str, handler, on_reset=None):
+    """
+    Register an async handler for JSON payloads on a NOTIFY channel.
+
+    :param channel: str - Postgres channel name.
+    :param handler: async callable - Receives the decoded payload dict.
+    :param on_reset: async callable - Optional; called with no arguments on every (re)connect.
+    """
+    _CHANNEL_HANDLERS[channel].append(handler)
+    if on_reset is not None:
+        _RESET_HANDLERS.append(on_reset)
+
+
+def _listen_dsn() -> str:
+    uri = get_settings().sqlalchemy_database_uri.set(drivername="postgresql")
+    return uri.render_as_string(hide_password=False)
+
+
+async def dispatch(channel: str, payload: str):
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        logger.warning(f"Ignoring non-JSON notification on {channel}: {payload}")
+        return
+
+    metrics.increment(f"notifications.{channel}")
+    for handler in _CHANNEL_HANDLERS.get(channel, []):
+        try:
+            await handler(data)
+        except Exception as e:
+            logger.error(f"Notification handler {handler.__name__} failed on {channel}: {e}")
+
+
+def _on_notification(connection, pid, channel, payload):
+    task = asyncio.get_running_loop().create_task(dispatch(channel, payload))
+    _dispatch_tasks.add(task)
+    task.add_done_callback(_dispatch_tasks.discard)
+
+
+async def _listen_forever():
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(_listen_dsn())
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            for channel in list(_CHANNEL_HANDLERS):
+                await connection.add_listener(channel, _on_notification)
+            logger.info(f"Listening for notifications on {', '.join(_CHANNEL_HANDLERS)}")
+
+            for on_reset in _RESET_HANDLERS:
+                await on_reset()
+            metrics.set_gauge("notification_listener_connected", 1)
+
+            await closed.wait()
+            logger.warning("Notification listener connection lost; reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notification listener failed: {e}")
+        finally:
+            metrics.set_gauge("notification_listener_connected", 0)
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+        await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+async def start_notification_listener():
+    global _listener_task
+    if _listener_task is None and _CHANNEL_HANDLERS:
+        _listener_task = asyncio.create_task(_listen_forever())
+
+
+async def stop_notification_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -35,15 +35,7 @@ def submit_name_validation(session_id: str):
 # Your async queue trigger
 async def queue_trigger_analysis_(session_id, session) -> Dict:
     try:
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=session_id, 
-            session=session
-        )
-
-        if not session_supplier_data:
+        if not await session_exists(session_id, session):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No records found for session_id: {session_id}")
 
         # Step 1: Submit to Celery only if not already queued
@@ -106,15 +98,7 @@ async def queue_trigger_analysis_(session_id, session) -> Dict:
 # Your async queue trigger
 async def queue_trigger_entity_validation_(session_id, session) -> Dict:
     try:
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=session_id, 
-            session=session
-        )
-
-        if not session_supplier_data:
+        if not await session_exists(session_id, session):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No records found for session_id: {session_id}")
 
         # Submit to name_validation_queue
@@ -174,15 +158,8 @@ async def queue_trigger_entity_validation_(session_id, session) -> Dict:
         )
 
 async def get_session_queue(session_id: str, session) -> str:
-    session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=session_id, 
-            session=session
-        )
-    if not session_supplier_data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No records found for session_id: {session_id}")
+    if not await session_exists(session_id, session):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No records found for session_id: {session_id}")
 
     if rdb.sismember(SESSION_SET_KEY, session_id):
         return "screening_queue"
@@ -1,19 +1,57 @@
-from neo4j import AsyncGraphDatabase, exceptions as neo4j_exceptions
+import asyncio
+import json
+from neo4j import AsyncDriver, exceptions as neo4j_exceptions
 import pycountry
 from app.core.utils.db_utils import *
 from collections import defaultdict
+from app.core import database_session
 from app.core.config import get_settings
-
-URI = get_settings().graphdb.uri
-USER = get_settings().graphdb.user
-PASSWORD = get_settings().graphdb.password
+from app.core.utils import metrics
+from app.core.supplier.graph_cache import canonical_filters, current_generation, get_cached_graph, store_graph
+
+RATING_COLUMNS = ["kpi_area", "kpi_code", "kpi_definition", "kpi_rating", "update_time"]
+KPI_COLUMNS = ["kpi_area", "kpi_code", "kpi_definition", "kpi_rating", "kpi_flag", "kpi_details"]
+KPI_TABLE_NAMES = ['cyes', 'fstb', 'lgrk', 'oval', 'rfct', 'sape', 'sown', 'news']
+
+# Node lists of a graph record in dedup priority order: a node keeps the category of the first list it is found in
+GRAPH_NODE_LISTS = (("suppliers", "direct"), ("individuals", "indirect"), ("companyCorpGroup", "indirect"), ("individualsCorpGroup", "indirect"))
+GRAPH_RELATIONSHIP_LISTS = ("supplierRelationships", "individualRelationships", "individualRelationshipsCorpGroup", "companyRelationshipsCorpGroup")
+
+# Direct-supplier risk score: sum of theme weight x rating weight, scaled into the overall rating's band
+RATING_THEME_WEIGHTAGE = {
+    "sanctions_rating":3,
+    "government_political_rating":3,
+    "bribery_corruption_overall_rating":2,
+    "other_adverse_media_rating":2,
+    "financials_rating": 2,
+    "additional_indicator_rating":1,
+}
+RATING_WEIGHTAGE = {
+    "High":10,
+    "Medium":5,
+    "Low":1,
+    "No Alerts":0
+}
+MAXIMUM_RATING_RANGE = sum(RATING_WEIGHTAGE["High"] * theme_weight for theme_weight in RATING_THEME_WEIGHTAGE.values())
+# (scale_min, scale_max) of risk_intensity_score per overall rating
+RATING_SCALES = {"High": (50, 100), "Medium": (10, 50), "Low": (0, 10)}
+DEFAULT_RATING_SCALE = (0, 10)
+# (start, end) RGB of the node colour gradient per overall rating
+RATING_GRADIENTS = {
+    "Low": ((90, 129, 20), (185, 219, 101)),
+    "Medium": ((255, 214, 58), (247, 152, 33)),  # Yellow
+    "High": ((236, 108, 89), (197, 37, 37)),
+}
+DEFAULT_NODE_COLOUR = "#BCCCDC"
+# "SHAREHOLDER_OF" -> "SHAREHOLDER"; filled on first use, relationship types are a small fixed set
+RELATIONSHIP_LABELS = {}
 
 def get_country_name(code: str) -> str:
     country = pycountry.countries.get(alpha_2=code.upper())
     return country.name if country else code
 
 # Async Neo4j function
-async def get_distinct_supplier_countries(client_id: str):
+async def get_distinct_supplier_countries(client_id: str, driver: AsyncDriver = None):
 
     fallback_client_id = "5b638302-73cb-4a69-b76d-1efa5c00797a"
     if client_id is None:
@@ -23,14 +61,13 @@ async def get_distinct_supplier_countries(client_id: str):
     if client_id == "string":
         print(f"No Client ID passed, using fallback {fallback_client_id}")
         client_id = fallback_client_id
-    driver = None
     try:
         query = """
         MATCH (s:Supplier)-[:SUPPLIER_OF]->(c:Company {id: $client_id})
         WHERE s.country IS NOT NULL
         RETURN DISTINCT s.country AS countryCode
         """
-        driver = AsyncGraphDatabase.driver(URI, auth=(USER, PASSWORD))
+        driver = driver or get_graph_driver()
         async with driver.session() as session:
             result = await session.run(query, client_id=client_id.strip())
             records = await result.data()
@@ -50,11 +87,8 @@ async def get_distinct_supplier_countries(client_id: str):
         logger.exception(f"Unexpected error while fetching supplier countries: {e}")
         return []
 
-    finally:
-        if driver:
-            await driver.close()
-
-async def run_graph_retrieval(filter_request:dict):
+def resolve_graph_client(filter_request: dict) -> str:
+    """Pop client/client_id from the graph filters and return the client id, applying the fallback client."""
 
     fallback_client_id = "5b638302-73cb-4a69-b76d-1efa5c00797a"
     fallback_client_name = "ARAMCO"
@@ -80,12 +114,29 @@ async def run_graph_retrieval(filter_request:dict):
         print(f"No Client Name passed, using fallback {fallback_client_name}")
         client = fallback_client_name
 
-    records = await fetch_direct_suppliers(client_id, filter_request)
-    transformed_data = await transform_graph_data(records=records, client_id = client_id)
+    return client_id
+
+async def run_graph_retrieval(filter_request:dict, driver: AsyncDriver = None):
+
+    client_id = resolve_graph_client(filter_request)
+
+    use_cache = get_settings().graphcache.enabled
+    if use_cache:
+        filters_key = canonical_filters(filter_request)
+        generation = current_generation(client_id)
+        cached_graph = await get_cached_graph(client_id, filters_key)
+        if cached_graph is not None:
+            return cached_graph
+
+    records = await fetch_direct_suppliers(client_id, filter_request, driver)
+    transformed_data = await transform_graph_data(records=records, client_id = client_id, driver=driver)
+
+    if use_cache:
+        await store_graph(client_id, filters_key, transformed_data, generation)
 
     return transformed_data
 
-async def fetch_direct_suppliers(client_id: str, filters:dict):
+async def fetch_direct_suppliers(client_id: str, filters:dict, driver: AsyncDriver = None):
     """
     Fetches all suppliers connected to the given client (company) in Neo4j.
     """
@@ -94,23 +145,20 @@ async def fetch_direct_suppliers(client_id: str, filters:dict):
     print("Generated Query:", query)
     print("Parameters:", params)
 
-    async with AsyncGraphDatabase.driver(URI, auth=(USER, PASSWORD)) as driver:
-        async with driver.session() as session:
-            result = await session.run(query,params)
-            records = await result.data()
+    driver = driver or get_graph_driver()
+    async with driver.session() as session:
+        result = await session.run(query,params)
+        records = await result.data()
 
     return records
 
-async def transform_graph_data(records, client_id):
-
-    nodes = []
-    links = []
+async def transform_graph_data(records, client_id, driver: AsyncDriver = None):
 
     if len(records)>1:
         print("THIS IS AN ERROR ------> FOUND TWO CLIENT NODES.")
 
     if len(records) == 0:
-        records = await fetch_client_node(client_id)
+        records = await fetch_client_node(client_id, driver)
         record = records[0]
         client_node = record["client"]
         client_node["node_type"] = "Company"
@@ -121,83 +169,229 @@ async def transform_graph_data(records, client_id):
 
     record = records[0]
 
+    print(f"Found {len(record['suppliers'])} suppliers")
+    print(f"Found {len(record['individuals'])} individuals")
+
+    print(f"Found {len(record['companyCorpGroup'])} CG suppliers")
+    print(f"Found {len(record['individualsCorpGroup'])} CG individuals")
+
+    # NODE FORMATTING -> MOVE TO ORCHESTRATION
+    nodes = []
+    seen_ids = set()
+    for node_list, node_category in GRAPH_NODE_LISTS:
+        for node in record[node_list]:
+            if node["id"] not in seen_ids:
+                seen_ids.add(node["id"])
+                nodes.append(_format_node(node, node_category))
+
     client_node = record["client"]
     client_node["type"] = "Company"
-    client_node["node_category"] = "central"
-    suppliers = [{**d, 'node_category': 'direct'} for d in record["suppliers"]]
-    individuals = [{**d, 'node_category': 'indirect'} for d in record["individuals"]]
+    nodes.append(_format_node(client_node, "central"))
 
-    companies_corp_group = [{**d, 'node_category': 'indirect'} for d in record["companyCorpGroup"]]
-    individuals_corp_group = [{**d, 'node_category': 'indirect'} for d in record["individualsCorpGroup"]]
+    links = []
+    seen_links = set()
+    for relationship_list in GRAPH_RELATIONSHIP_LISTS:
+        for relationship in record[relationship_list]:
+            link = _format_edge(relationship)
+            if link is None or (link["source"], link["target"]) in seen_links:
+                continue
+            seen_links.add((link["source"], link["target"]))
+            links.append(link)
+
+    return {"nodes": nodes, "edges": links}
+
+def _format_node(node: dict, node_category: str) -> dict:
+    """Set node_category, rename type to node_type and apply the formatting for the node's category and type."""
+    node["node_category"] = node_category
+    node["node_type"] = node.pop("type")  # rename type to node_type
+    node_type = node["node_type"].lower()
+
+    if node_category == "direct":
+        if node_type == "organization":
+            apply_direct_supplier_formatting(node)
+    elif node_category == "indirect":
+        if node_type == "individual":
+            apply_person_formatting(node)
+        elif node_type == "organization":
+            apply_indirect_supplier_formatting(node)
+    elif node_category == "central":
+        apply_central_company_formatting(node)
+    return node
 
-    print(f"Found {len(suppliers)} suppliers")
-    print(f"Found {len(individuals)} individuals")
+def _format_edge(relationship):
+    """Turn a (start, type, end) relationship into a graph link; self-links return None."""
+    related, relationship_type, target = relationship
+    if related["id"] == target["id"]:
+        return None
+    return {"source": related["id"], "target": target["id"], "relationship_type": _relationship_label(relationship_type)}
 
-    print(f"Found {len(companies_corp_group)} CG suppliers")
-    print(f"Found {len(individuals_corp_group)} CG individuals")
+def _relationship_label(relationship_type: str) -> str:
+    label = RELATIONSHIP_LABELS.get(relationship_type)
+    if label is None:
+        label = RELATIONSHIP_LABELS[relationship_type] = relationship_type.replace("_OF","").replace("_"," ")
+    return label
 
-    seen_ids = set()
+async def stream_graph_retrieval(filter_request: dict, driver: AsyncDriver = None):
+    """
+    Yield the network graph as NDJSON lines, formatted as in run_graph_retrieval.
 
-    # Initialize final list to collect unique nodes
-    nodes = []
+    Lines are {"type": "node", "node": {...}} and {"type": "edge", "edge": {...}}, ending with
+    {"type": "summary", "nodes": n, "edges": m}. Direct suppliers come first, then each supplier's
+    neighbourhood, read record by record; only the ids already sent are kept in memory. A failure
+    after streaming has started ends the stream with {"type": "error", "detail": ...}.
+    """
+    client_id = resolve_graph_client(filter_request)
+    suppliers_query, neighbourhood_query, params = await build_streaming_queries_for_direct_suppliers(client_id, filter_request)
 
-    # Function to add unique items to final_nodes
-    def add_unique_to_final(list_of_nodes):
-        for node in list_of_nodes:
-            if node['id'] not in seen_ids:
-                seen_ids.add(node['id'])
-                nodes.append(node)
+    seen_node_ids = set()
+    seen_edges = set()
 
-    # Add all unique suppliers, individuals, and groups
-    add_unique_to_final(suppliers)
-    add_unique_to_final(individuals)
-    add_unique_to_final(companies_corp_group)
-    add_unique_to_final(individuals_corp_group)
+    def node_line(node: dict, node_category: str):
+        if node["id"] in seen_node_ids:
+            return ""
+        seen_node_ids.add(node["id"])
+        return json.dumps({"type": "node", "node": _format_node(node, node_category)}, default=str) + "\n"
 
-    # nodes = suppliers + individuals + companies_corp_group + individuals_corp_group
-    nodes.append(client_node)
+    def edge_line(relationship):
+        edge = _format_edge(relationship)
+        if edge is None or (edge["source"], edge["target"]) in seen_edges:
+            return ""
+        seen_edges.add((edge["source"], edge["target"]))
+        return json.dumps({"type": "edge", "edge": edge}, default=str) + "\n"
 
-    supplier_relationships = record["supplierRelationships"]
-    management_relationships = record["individualRelationships"]
+    try:
+        driver = driver or get_graph_driver()
+        async with driver.session() as session:
+            result = await session.run(suppliers_query, params)
+            client_sent = False
+            async for record in result:
+                row = record.data()
+                lines = ""
+                if not client_sent:
+                    client_node = row["client"]
+                    client_node["type"] = "Company"
+                    lines += node_line(client_node, "central")
+                    client_sent = True
+                lines += node_line(row["supplier"], "direct")
+                lines += edge_line(row["supplierRelationship"])
+                yield lines
+
+            if not client_sent:
+                records = await fetch_client_node(client_id, driver)
+                client_node = records[0]["client"]
+                client_node["type"] = "Company"
+                client_node = _format_node(client_node, "central")
+                client_node["query_message"] = "No Results Found for Requested Filters"
+                yield json.dumps({"type": "node", "node": client_node}, default=str) + "\n"
+                yield json.dumps({"type": "summary", "nodes": 1, "edges": 0}) + "\n"
+                return
+
+            result = await session.run(neighbourhood_query, params)
+            async for record in result:
+                row = record.data()
+                lines = ""
+                for node in row["individuals"]:
+                    lines += node_line(node, "indirect")
+                for node in row["companyCorpGroup"] + row["individualsCorpGroup"]:
+                    lines += node_line(node, "indirect")
+                for relationship in row["individualRelationships"] + row["individualRelationshipsCorpGroup"] + row["companyRelationshipsCorpGroup"]:
+                    lines += edge_line(relationship)
+                if lines:
+                    yield lines
+    except Exception as e:
+        logger.exception(f"Network graph stream failed for client {client_id}: {e}")
+        yield json.dumps({"type": "error", "detail": f"Failed to generate network graph: {str(e)}"}) + "\n"
+        return
 
-    individuals_relationships_corp_group = record["individualRelationshipsCorpGroup"]
-    supplier_relationships_corp_group = record["companyRelationshipsCorpGroup"]
+    yield json.dumps({"type": "summary", "nodes": len(seen_node_ids), "edges": len(seen_edges)}) + "\n"
 
-    relationships = supplier_relationships+management_relationships+individuals_relationships_corp_group+supplier_relationships_corp_group
-    # print(relationships)
-    for i, (related, relationship_type, target) in enumerate(relationships):
-        if related["id"] == target['id']:
-            continue
-        link = {"source": related["id"], "target":target["id"],"relationship_type": relationship_type.replace("_OF","").replace("_"," ")}
-        links.append(link)
+async def build_dynamic_query_for_direct_suppliers(client_id, filters):
 
-    links = simple_dedup(links, "source", "target")
+    query, params, (individual_pattern, corp_individual_pattern, corp_company_pattern) = await build_direct_supplier_match(client_id, filters)
 
+    # Collapse to one row per client before expanding the neighbourhood, so the patterns
+    # below never multiply each other (managers x shareholders x subsidiaries per supplier)
+    query += """
+    WITH c, collect(DISTINCT r) AS supplierRelationships, collect(DISTINCT s) AS suppliers
+    """
 
-    # NODE FORMATTING -> MOVE TO ORCHESTRATION
-    nodes = list(nodes)
-    final_nodes = []
-    for node in nodes:
-        # print(node)
-        node["node_type"] = node.pop("type")  # rename type to node_type
-
-        if node["node_category"] == "direct":
-            if node["node_type"].lower() == "organization":
-                modified_node = apply_direct_supplier_formatting(node)
-        elif node["node_category"] == "indirect":
-            if node["node_type"].lower() == "individual":
-                modified_node = apply_person_formatting(node)
-                final_nodes.append(modified_node)
-            elif node["node_type"].lower() == "organization":
-                modified_node = apply_indirect_supplier_formatting(node)
-                final_nodes.append(modified_node)
-        elif node["node_category"] == "central":
-            modified_node = apply_central_company_formatting(node)
-            final_nodes.append(modified_node)
-    
-    return {"nodes": list(nodes), "edges": links}
+    # Each pattern is gathered in its own subquery; an aggregating subquery always returns one row,
+    # so a pattern with no matches yields empty lists instead of dropping the client row
+    query += f"""
+    CALL {{
+        WITH suppliers
+        UNWIND suppliers AS s
+        MATCH {individual_pattern}
+        RETURN collect(DISTINCT r1) AS individualRelationships, collect(DISTINCT i) AS individuals
+    }}
+    CALL {{
+        WITH suppliers
+        UNWIND suppliers AS s
+        MATCH {corp_individual_pattern}
+        RETURN collect(DISTINCT r2) AS individualRelationshipsCorpGroup, collect(DISTINCT ic) AS individualsCorpGroup
+    }}
+    CALL {{
+        WITH suppliers
+        UNWIND suppliers AS s
+        MATCH {corp_company_pattern}
+        RETURN collect(DISTINCT r3) AS companyRelationshipsCorpGroup, collect(DISTINCT cc) AS companyCorpGroup
+    }}
+    """
 
-async def build_dynamic_query_for_direct_suppliers(client_id, filters):
+    query += """
+    RETURN c AS client, supplierRelationships, suppliers, individualRelationships, individuals
+    , individualRelationshipsCorpGroup, individualsCorpGroup, companyRelationshipsCorpGroup, companyCorpGroup
+    """
+
+    print(query, "\n" ,params)
+
+    return query, params
+
+
+async def build_streaming_queries_for_direct_suppliers(client_id, filters):
+    """
+    Build the two queries behind the NDJSON graph stream.
+
+    The first returns one row per direct supplier; the second returns each supplier's own
+    neighbourhood (one row per supplier, patterns gathered in per-supplier subqueries), so
+    results can be iterated and emitted without holding the whole graph.
+    """
+    query, params, (individual_pattern, corp_individual_pattern, corp_company_pattern) = await build_direct_supplier_match(client_id, filters)
+
+    suppliers_query = query + """
+    RETURN c AS client, r AS supplierRelationship, s AS supplier
+    """
+
+    neighbourhood_query = query + f"""
+    CALL {{
+        WITH s
+        MATCH {individual_pattern}
+        RETURN collect(DISTINCT r1) AS individualRelationships, collect(DISTINCT i) AS individuals
+    }}
+    CALL {{
+        WITH s
+        MATCH {corp_individual_pattern}
+        RETURN collect(DISTINCT r2) AS individualRelationshipsCorpGroup, collect(DISTINCT ic) AS individualsCorpGroup
+    }}
+    CALL {{
+        WITH s
+        MATCH {corp_company_pattern}
+        RETURN collect(DISTINCT r3) AS companyRelationshipsCorpGroup, collect(DISTINCT cc) AS companyCorpGroup
+    }}
+    RETURN individualRelationships, individuals, individualRelationshipsCorpGroup, individualsCorpGroup,
+           companyRelationshipsCorpGroup, companyCorpGroup
+    """
+
+    return suppliers_query, neighbourhood_query, params
+
+
+async def build_direct_supplier_match(client_id, filters):
+    """
+    Build the MATCH ... WHERE selecting the client's direct suppliers (c, r, s) for the given filters.
+
+    Returns the clause, its parameters and the individual, corporate-group individual and
+    corporate-group company patterns to expand each supplier (s) with.
+    """
     print("filters", filters)
     # pull out indicators from filters
     view_individuals_with_risk_only = filters.get("individuals_with_risk_only",False)
@@ -268,17 +462,17 @@ async def build_dynamic_query_for_direct_suppliers(client_id, filters):
 
     # Add on individuals nodes matching to this supplier:
     if view_individuals_with_risk_only:
-        query += "\nOPTIONAL MATCH (i:Individual)-[r1:MANAGEMENT_OF]->(s)"  # TODO ADD WHERE HERE
+        individual_pattern = "(i:Individual)-[r1:MANAGEMENT_OF]->(s)"  # TODO ADD WHERE HERE
     else:
-        query += "\nOPTIONAL MATCH (i:Individual)-[r1:MANAGEMENT_OF]->(s)"
+        individual_pattern = "(i:Individual)-[r1:MANAGEMENT_OF]->(s)"
 
     # Add on associated corporate group by using relationship
     if view_corp_group_with_risk_only:
-        query += "\nOPTIONAL MATCH (ic:Individual)-[r2:MANAGEMENT_OF|SUBSIDIARY_OF|SHAREHOLDER_OF]->(s)"  # TODO ADD WHERE HERE
-        query += "\nOPTIONAL MATCH (cc:Supplier)-[r3:SUBSIDIARY_OF|SHAREHOLDER_OF]->(s)"  # TODO ADD WHERE HERE
+        corp_individual_pattern = "(ic:Individual)-[r2:MANAGEMENT_OF|SUBSIDIARY_OF|SHAREHOLDER_OF]->(s)"  # TODO ADD WHERE HERE
+        corp_company_pattern = "(cc:Supplier)-[r3:SUBSIDIARY_OF|SHAREHOLDER_OF]->(s)"  # TODO ADD WHERE HERE
     else:
-        query += "\nOPTIONAL MATCH (ic:Individual)-[r2:SHAREHOLDER_OF|BENEFICIAL_OWNER_OF|ULTIMATELY_OWNED_SUBSIDIARY_OF|GLOBAL_ULTIMATE_OWNER_OF|OTHER_ULTIMATE_BENEFICIARY_OF]->(s)"
-        query += "\nOPTIONAL MATCH (cc:Supplier)-[r3:SHAREHOLDER_OF|BENEFICIAL_OWNER_OF|ULTIMATELY_OWNED_SUBSIDIARY_OF|GLOBAL_ULTIMATE_OWNER_OF|OTHER_ULTIMATE_BENEFICIARY_OF]->(s)"
+        corp_individual_pattern = "(ic:Individual)-[r2:SHAREHOLDER_OF|BENEFICIAL_OWNER_OF|ULTIMATELY_OWNED_SUBSIDIARY_OF|GLOBAL_ULTIMATE_OWNER_OF|OTHER_ULTIMATE_BENEFICIARY_OF]->(s)"
+        corp_company_pattern = "(cc:Supplier)-[r3:SHAREHOLDER_OF|BENEFICIAL_OWNER_OF|ULTIMATELY_OWNED_SUBSIDIARY_OF|GLOBAL_ULTIMATE_OWNER_OF|OTHER_ULTIMATE_BENEFICIARY_OF]->(s)"
 
         # """
         # OPTIONAL MATCH (ss:Supplier)-[:SHAREHOLDER_OF]->(s)
@@ -293,20 +487,10 @@ async def build_dynamic_query_for_direct_suppliers(client_id, filters):
         # OPTIONAL MATCH (ou:Supplier)-[:OTHER_ULTIMATE_BENEFICIARY_OF]->(s)
         # """
 
-    query += """
-    RETURN c AS client, collect(DISTINCT r) AS supplierRelationships, collect(DISTINCT s) AS suppliers, collect(DISTINCT r1) AS individualRelationships, collect(DISTINCT i) AS individuals
-    """
-
-    query += """
-    , collect(DISTINCT r2) AS individualRelationshipsCorpGroup, collect(DISTINCT ic) AS individualsCorpGroup, collect(DISTINCT r3) AS companyRelationshipsCorpGroup, collect(DISTINCT cc) AS companyCorpGroup
-    """
+    return query, params, (individual_pattern, corp_individual_pattern, corp_company_pattern)
 
-    print(query, "\n" ,params)
 
-    return query, params
-
-
-async def fetch_client_node(client_id):
+async def fetch_client_node(client_id, driver: AsyncDriver = None):
 
     query = """
     MATCH (c:Company {id: $client_id})
@@ -315,10 +499,10 @@ async def fetch_client_node(client_id):
 
     params = {'client_id': client_id}
 
-    async with AsyncGraphDatabase.driver(URI, auth=(USER, PASSWORD)) as driver:
-        async with driver.session() as session:
-            result = await session.run(query,params)
-            records = await result.data()
+    driver = driver or get_graph_driver()
+    async with driver.session() as session:
+        result = await session.run(query,params)
+        records = await result.data()
 
     return records
 
@@ -331,7 +515,7 @@ def apply_person_formatting(node: dict):
     node["node_size"] = 2
     if (node.get("sanctions_indicator") == "true") or (node.get("pep_indicator") == "true") or (node.get("media_indicator") == "true"):
         node["risk_indicator"] = "true"
-        node["node_colour"] = _convert_score_to_hex_gradient(score=0.01, rating="High")
+        node["node_colour"] = RISK_INDICATOR_COLOUR
         node["node_size"] = 10
         risks = []
         if node.get("sanctions_indicator") == "true":
@@ -355,7 +539,7 @@ def apply_indirect_supplier_formatting(node: dict):
     node["node_size"] = 5
     if (node.get("sanctions_indicator") == "true") or (node.get("pep_indicator") == "true") or (node.get("media_indicator") == "true"):
         node["risk_indicator"] = "true"
-        node["node_colour"] = _convert_score_to_hex_gradient(score=0.01, rating="High")
+        node["node_colour"] = RISK_INDICATOR_COLOUR
         node["node_size"] = 10
         risks = []
         if node.get("sanctions_indicator") == "true":
@@ -371,59 +555,17 @@ def apply_indirect_supplier_formatting(node: dict):
 
 def apply_direct_supplier_formatting(node: dict):
 
-    rating_theme_weightage = {
-        "sanctions_rating":3,
-        "government_political_rating":3,
-        "bribery_corruption_overall_rating":2,
-        "other_adverse_media_rating":2,
-        "financials_rating": 2,
-        "additional_indicator_rating":1,
-    }
-
-    rating_weightage = {
-        "High":10,
-        "Medium":5,
-        "Low":1,
-        "No Alerts":0
-    }
-
-    maximum_range = 0
-    minimum_range = 0
-    for rating_type, rating_weight in rating_theme_weightage.items():
-        maximum_range += rating_weightage["High"]*rating_weight
-
     weighted_rating_score = 0
-    for rating_type, rating_value in node.items():
-        if rating_type in rating_theme_weightage.keys():
-            weighted_rating_score += rating_theme_weightage[rating_type]*rating_weightage[rating_value]
-
-    # print(weighted_rating_score)
+    for rating_type, theme_weight in RATING_THEME_WEIGHTAGE.items():
+        if rating_type in node:
+            weighted_rating_score += theme_weight*RATING_WEIGHTAGE[node[rating_type]]
 
     overall_rating = node.get("overall_rating")
-    if overall_rating == "High":
-        scale_max = 100
-        scale_min = 50
-    elif overall_rating == "Medium":
-        scale_max = 50
-        scale_min = 10
-    elif overall_rating == "Low":
-        scale_max = 10
-        scale_min = 0
-    else:
-        scale_max = 10
-        scale_min = 0
-
-    # print(overall_rating, scale_min, scale_max)
+    scale_min, scale_max = RATING_SCALES.get(overall_rating, DEFAULT_RATING_SCALE)
 
-    scaled_score = (weighted_rating_score-minimum_range)/(maximum_range-minimum_range)
-
-    scaled_weighted_rating_score = (((weighted_rating_score-minimum_range) * (scale_max-scale_min))/(maximum_range-minimum_range))+scale_min
-    scaled_weighted_rating_score = round(scaled_weighted_rating_score)
-
-    # print(scaled_weighted_rating_score, scaled_score)
-
-    node["risk_intensity_score"] = scaled_weighted_rating_score
-    node["node_colour"] = _convert_score_to_hex_gradient(scaled_score, overall_rating)
+    node["risk_intensity_score"] = round((weighted_rating_score * (scale_max-scale_min))/MAXIMUM_RATING_RANGE + scale_min)
+    colours = DIRECT_SUPPLIER_COLOURS.get(overall_rating)
+    node["node_colour"] = colours[weighted_rating_score] if colours else DEFAULT_NODE_COLOUR
     node["node_size"] = 200
 
     return node
@@ -437,23 +579,11 @@ def apply_central_company_formatting(node:dict):
 
 def _convert_score_to_hex_gradient(score, rating):
 
-    if rating == "Low":
-        start_rgb = (90, 129, 20)
-        end_rgb = (185, 219, 101)
-        hex_colour = _interpolate_rgb(start_rgb, end_rgb, score)
-    elif rating == "Medium": # Yellow
-        start_rgb = (255, 214, 58)
-        end_rgb = (247, 152, 33)
-        hex_colour = _interpolate_rgb(start_rgb, end_rgb, score)
-    elif rating == "High":
-        start_rgb = (236, 108, 89)
-        end_rgb = (197, 37, 37)
-        hex_colour = _interpolate_rgb(start_rgb, end_rgb, score)
-    else:
-        hex_colour = "#BCCCDC"
-
-
-    return hex_colour
+    gradient = RATING_GRADIENTS.get(rating)
+    if gradient is None:
+        return DEFAULT_NODE_COLOUR
+    start_rgb, end_rgb = gradient
+    return _interpolate_rgb(start_rgb, end_rgb, score)
 
 def _interpolate_rgb(start_rgb, end_rgb, t):
     r1, g1, b1 = start_rgb
@@ -467,6 +597,13 @@ def _interpolate_rgb(start_rgb, end_rgb, t):
 
     return hex_colour
 
+# Direct-supplier colour per overall rating, indexed by the (integer) weighted rating score
+DIRECT_SUPPLIER_COLOURS = {
+    rating: [_convert_score_to_hex_gradient(score/MAXIMUM_RATING_RANGE, rating) for score in range(MAXIMUM_RATING_RANGE + 1)]
+    for rating in RATING_GRADIENTS
+}
+RISK_INDICATOR_COLOUR = _convert_score_to_hex_gradient(score=0.01, rating="High")
+
 
 async def compile_company_profile(ens_id:str, session):
 
@@ -490,11 +627,15 @@ async def compile_company_profile(ens_id:str, session):
 
 async def compile_company_findings(ens_id: str, session):
 
-    latest_session_id, update_time = await pull_latest_session_id(ens_id, session)
+    with metrics.timed("graph.company_findings.latest_session"):
+        latest_session_id, update_time = await pull_latest_session_id(ens_id, session)
 
-    profile = await pull_profile(ens_id,  latest_session_id, session)
-    ratings = await pull_ratings(ens_id,  latest_session_id, session)
-    findings = await pull_kpis(ens_id,  latest_session_id, session)
+    # Profile on a second pooled session, overlapping ratings (ovar) and all KPI tables in one UNION ALL round trip
+    with metrics.timed("graph.company_findings.profile_ratings_and_kpis"):
+        profile, (ratings, findings) = await asyncio.gather(
+            pull_profile_on_own_session(ens_id, latest_session_id),
+            pull_ratings_and_kpis(ens_id, latest_session_id, session),
+        )
 
     compiled_findings = {
         "profile": profile,
@@ -554,8 +695,8 @@ async def compile_company_financials(ens_id: str, session):
             return str(value)
 
     financials = {}
-    for category, metrics in METRIC_CATEGORIES.items():
-        for metric in metrics:
+    for category, category_metrics in METRIC_CATEGORIES.items():
+        for metric in category_metrics:
             if metric not in all_financial_data:
                 continue
 
@@ -614,9 +755,9 @@ async def compile_company_timeline(ens_id: str, session):
 async def pull_latest_session_id(ens_id: str, session):
 
     # GET THE LATEST COMPLETED SESSION
-    session_id_row = await get_latest_session_for_ens_id("ensid_screening_status", required_columns=["session_id", "overall_status"],ens_id=ens_id, session=session)
-    session_id = session_id_row[0].get("session_id")
-    update_time = session_id_row[0].get("update_time")
+    latest_screening = await get_latest_completed_screening(ens_id, session)
+    session_id = latest_screening.get("session_id")
+    update_time = latest_screening.get("update_time")
 
     return session_id, update_time
 
@@ -631,10 +772,19 @@ async def pull_profile(ens_id: str, latest_session_id: str, session):
     return copr
 
 
+async def pull_profile_on_own_session(ens_id: str, latest_session_id: str):
+
+    # An AsyncSession runs one statement at a time, so a concurrent read needs its own connection
+    async with database_session.get_async_session() as profile_session:
+        return await pull_profile(ens_id, latest_session_id, profile_session)
+
+
 async def pull_ratings(ens_id: str, latest_session_id: str, session):
 
-    required_columns = ["kpi_area", "kpi_code", "kpi_definition", "kpi_rating", "update_time"]
-    res_ratings = await get_dynamic_ens_data_for_session("ovar", required_columns, ens_id, latest_session_id, session)
+    res_ratings = await get_dynamic_ens_data_for_session("ovar", RATING_COLUMNS, ens_id, latest_session_id, session)
+    return format_theme_ratings(res_ratings)
+
+def format_theme_ratings(res_ratings):
     theme_ratings = {}
     for rating_row in res_ratings:
         if rating_row.get("kpi_rating", "").lower() != "deactivated":
@@ -644,7 +794,20 @@ async def pull_ratings(ens_id: str, latest_session_id: str, session):
 
     return theme_ratings
 
-async def pull_kpis(ens_id: str, session_id: str, session):
+async def pull_ratings_and_kpis(ens_id: str, session_id: str, session):
+
+        res = await get_union_ens_data_for_session(
+            {"ovar": RATING_COLUMNS} | {table_name: KPI_COLUMNS for table_name in KPI_TABLE_NAMES},
+            ens_id, session_id, session
+        )
+        ratings = format_theme_ratings(res["ovar"])
+        findings = group_kpis_by_theme(
+            [item for table_name in KPI_TABLE_NAMES for item in res[table_name]]
+        )
+        return ratings, findings
+
+
+def group_kpis_by_theme(gather_all_kpis):
 
         theme_mappings = {
             "sanctions": ["SAN"],
@@ -657,14 +820,6 @@ async def pull_kpis(ens_id: str, session_id: str, session):
 
         reverse_area_mapping = {code: theme for theme, codes in theme_mappings.items() for code in codes}
 
-        required_columns = ["kpi_area", "kpi_code", "kpi_definition", "kpi_rating", "kpi_flag", "kpi_details"]
-        kpi_table_name = ['cyes', 'fstb', 'lgrk', 'oval', 'rfct', 'sape', 'sown', 'news']
-
-        gather_all_kpis = []
-        for table_name in kpi_table_name:
-            res_kpis = await get_dynamic_ens_data_for_session(table_name, required_columns, ens_id, session_id, session)
-            gather_all_kpis.extend(res_kpis)
-
         grouped_data = defaultdict(list)
         for theme in theme_mappings:
             grouped_data[theme] = []
@@ -700,15 +855,3 @@ async def pull_financial_metrics(ens_id: str, latest_session_id: str, session):
             result[metric_column] = metric_values
 
     return result
-
-def simple_dedup(data, key1, key2):
-    seen = set()
-    result = []
-
-    for item in data:
-        key = (item[key1], item[key2])
-        if key not in seen:
-            seen.add(key)
-            result.append(item)
-
-    return result
@@ -0,0 +1,193 @@
+# Network-graph result cache
+#
+# Results of run_graph_retrieval are cached per client and canonical filter set, in a per-worker LRU
+# optionally backed by a Redis tier shared by all workers (settings: GRAPHCACHE__*). A client's entries
+# are dropped when ensid_screening_status reports a COMPLETED screening for one of its sessions
+# (ens_id_status_channel), which is when the supplier graph changes.
+
+import hashlib
+import json
+from collections import defaultdict
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+
+from app.core import database_session, notifications
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.core.utils.cache import TTLCache
+from app.models import STATUS, Base
+from app.schemas.logger import logger
+
+ENS_ID_STATUS_CHANNEL = "ens_id_status_channel"
+REDIS_KEY_PREFIX = "graph_cache"
+# Filter values build_dynamic_query_for_direct_suppliers skips; they must not split the cache
+IGNORED_FILTER_VALUES = (None, "", "string", ["string"], [""], [])
+
+GRAPH_RESULT_CACHE = TTLCache(maxsize=get_settings().graphcache.maxsize, ttl=get_settings().graphcache.ttl)
+# Bumped on invalidation; a client's older local entries become unreachable and age out of the LRU
+_client_generations = defaultdict(int)
+# Bumped when every client is invalidated at once
+_epoch = 0
+# A session never changes client
+SESSION_CLIENT_CACHE = TTLCache(maxsize=4096)
+_redis = None
+
+
+def canonical_filters(filters: dict) -> str:
+    """
+    Serialise a graph filter dict so that equivalent filter sets produce the same key.
+
+    Ignored values are dropped and list values are sorted, as the query matches them with IN.
+    """
+    canonical = {}
+    for field, value in filters.items():
+        if value in IGNORED_FILTER_VALUES:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(value, key=str)
+        canonical[field] = value
+    return json.dumps(canonical, sort_keys=True, default=str)
+
+
+def _redis_client():
+    global _redis
+    redis_url = get_settings().graphcache.redis_url
+    if redis_url and _redis is None:
+        _redis = aioredis.from_url(redis_url)
+    return _redis
+
+
+def _redis_key(client_id: str) -> str:
+    return f"{REDIS_KEY_PREFIX}:{client_id}"
+
+
+def _redis_field(filters_key: str) -> str:
+    return hashlib.sha1(filters_key.encode("utf-8")).hexdigest()
+
+
+def current_generation(client_id: str) -> tuple:
+    """Version of a client's graphs; changes whenever they are invalidated, alone or with every client."""
+    return _epoch, _client_generations[client_id]
+
+
+async def get_cached_graph(client_id: str, filters_key: str):
+    """Return the cached graph for a client and canonical filter set, or None."""
+    generation = current_generation(client_id)
+    graph = GRAPH_RESULT_CACHE.get((client_id, generation, filters_key))
+    if graph is not None:
+        metrics.increment("graph_cache_hits")
+        return graph
+
+    redis_client = _redis_client()
+    if redis_client is not None:
+        try:
+            payload = await redis_client.hget(_redis_key(client_id), _redis_field(filters_key))
+        except Exception as e:
+            logger.warning(f"Graph cache Redis read failed: {e}")
+            payload = None
+        if payload is not None:
+            graph = json.loads(payload)
+            GRAPH_RESULT_CACHE.set((client_id, generation, filters_key), graph)
+            metrics.increment("graph_cache_hits")
+            metrics.increment("graph_cache_redis_hits")
+            return graph
+
+    metrics.increment("graph_cache_misses")
+    return None
+
+
+async def store_graph(client_id: str, filters_key: str, graph: dict, generation: tuple):
+    """
+    Cache a graph computed while the client was at `generation`.
+
+    If the client was invalidated while the graph was being computed, the result is not stored.
+    """
+    if generation != current_generation(client_id):
+        return
+    GRAPH_RESULT_CACHE.set((client_id, generation, filters_key), graph)
+
+    redis_client = _redis_client()
+    if redis_client is not None:
+        try:
+            key = _redis_key(client_id)
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, _redis_field(filters_key), json.dumps(graph, default=str))
+                pipe.expire(key, get_settings().graphcache.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Graph cache Redis write failed: {e}")
+
+
+async def invalidate_client(client_id: str):
+    _client_generations[client_id] += 1
+    metrics.increment("graph_cache_invalidations")
+
+    redis_client = _redis_client()
+    if redis_client is not None:
+        try:
+            await redis_client.delete(_redis_key(client_id))
+        except Exception as e:
+            logger.warning(f"Graph cache Redis invalidation failed for client {client_id}: {e}")
+
+
+async def invalidate_all(shared: bool = True):
+    global _epoch
+    # Generations are kept: resetting them would let a graph computed before this call be stored after it
+    _epoch += 1
+    GRAPH_RESULT_CACHE.clear()
+    metrics.increment("graph_cache_invalidations")
+
+    redis_client = _redis_client()
+    if shared and redis_client is not None:
+        try:
+            async for key in redis_client.scan_iter(match=f"{REDIS_KEY_PREFIX}:*"):
+                await redis_client.delete(key)
+        except Exception as e:
+            logger.warning(f"Graph cache Redis invalidation failed: {e}")
+
+
+async def reset_local_graph_cache():
+    # Notifications may have been missed while the listener was down; Redis entries are
+    # invalidated by the workers that did receive them, and expire after the TTL otherwise
+    await invalidate_all(shared=False)
+
+
+async def _client_ids_for_session(session_id: str) -> list:
+    client_ids = SESSION_CLIENT_CACHE.get(session_id)
+    if client_ids is None:
+        table = Base.metadata.tables.get("session_configuration")
+        async with database_session.get_async_session() as session:
+            result = await session.execute(
+                select(table.c.client_id).where(table.c.session_id == session_id).distinct()
+            )
+            client_ids = result.scalars().all()
+        if client_ids:
+            SESSION_CLIENT_CACHE.set(session_id, client_ids)
+    return client_ids
+
+
+async def handle_ens_status_notification(payload: dict):
+    """Invalidate the graphs of the client whose supplier finished screening."""
+    overall_status = payload.get("overall_status")
+    if overall_status is not None and overall_status != STATUS.COMPLETED.value:
+        return
+
+    session_id = payload.get("session_id")
+    client_ids = await _client_ids_for_session(session_id) if session_id else []
+    if not client_ids:
+        # Cannot tell whose graph changed
+        await invalidate_all()
+        return
+    for client_id in client_ids:
+        await invalidate_client(client_id)
+
+
+async def close_graph_cache():
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+notifications.subscribe(ENS_ID_STATUS_CHANNEL, handle_ens_status_notification, on_reset=reset_local_graph_cache)
@@ -1,103 +1,221 @@
+import asyncio
 import json
-from typing import Dict
+from email.utils import format_datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
 from fastapi import  HTTPException
 import urllib
 from app.core.utils.db_utils import *
-import io
-from app.core.config import get_settings  # Import settings
-from azure.storage.blob import BlobServiceClient
+from app.core.blob_storage import get_blob_service_client
+from app.core.config import get_settings
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
 import zipfile
 from app.schemas.logger import logger
-from azure.core.exceptions import ResourceNotFoundError, HttpResponseError
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError, ResourceModifiedError, HttpResponseError
+from app.core.supplier.report_manifest import get_latest_report_blob, invalidate_reports
+from app.core.supplier.report_cache import get_cached_report, report_cache_key, store_report
+
+
+async def check_session_reports_ready(session_id, session):
+    """
+    Raise unless the session exists and its screening analysis has finished.
+
+    :raises HTTPException: 404 for an unknown session, 400 while screening is queued, in progress or failed.
+    """
+    if not await session_exists(session_id, session):
+        raise HTTPException(status_code=404, detail=f"No records found for session_id: {session_id}")
+
+    initial_state = await get_session_screening_status_static(session_id, session)
+
+    if not initial_state:
+        raise HTTPException(status_code=404, detail=f"No status found for session_id: {session_id}")
+    if len(initial_state):
+        status = initial_state[0]['screening_analysis_status']
+        status_message_map = {
+            STATUS.FAILED: "failed",
+            STATUS.IN_PROGRESS: "is in progress",
+            STATUS.QUEUED: "is not started"
+        }
+        print("status in status_message_map", status in status_message_map)
+        if status in status_message_map:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Screening Analysis Status {status_message_map[status]} for session_id: {session_id}. Please review and correct the uploaded session id."
+            )
+
 
-async def report_download(session_id, ens_id, type_of_file, session)->Dict:
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Resolve an HTTP Range header against a blob of `size` bytes.
+
+    Only a single byte range is honoured (``bytes=0-99``, ``bytes=100-``, ``bytes=-500``); anything
+    else is ignored and the whole blob is served, as RFC 9110 allows.
+
+    :param range_header: str - value of the Range header, or None
+    :param size: int - blob size in bytes
+    :return: tuple - inclusive (start, end) offsets, or None to serve the whole blob
+    :raises HTTPException: 416 when the range starts past the end of the blob.
+    """
+    if not range_header:
+        return None
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, dash, last = ranges.strip().partition("-")
+    if not dash:
+        return None
     try:
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=session_id, 
-            session=session
+        if first:
+            start = int(first)
+            end = int(last) if last else max(size - 1, start)
+        elif last:
+            # Suffix range: the final `last` bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+    if start < 0 or end < start:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail=f"Range {range_header} not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
         )
+    return start, min(end, size - 1)
+
+
+def quoted_etag(etag: str) -> str:
+    # Listing returns bare ETags, get_blob_properties quoted ones; HTTP wants them quoted
+    return etag if etag.startswith('"') else f'"{etag}"'
+
+
+def etag_matches(header_value: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match / If-Range value against `etag` (RFC 9110 13.1.2)."""
+    if not header_value:
+        return False
+    if header_value.strip() == "*":
+        return True
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header_value.split(",")]
+    return quoted_etag(etag).removeprefix("W/") in candidates
+
+
+async def iter_blob_chunks(stream) -> AsyncIterator[bytes]:
+    async for chunk in stream.chunks():
+        yield chunk
+
+
+async def open_latest_report(container_client: ContainerClient, session_id, ens_id, type_of_file, open_blob):
+    """
+    Find the latest `.type_of_file` report of an ens_id through the manifest and open it with `open_blob`.
+
+    A manifest entry can go stale when a report is replaced or removed without a status notification.
+    If `open_blob` then fails with ResourceNotFoundError or ResourceModifiedError, the entry is evicted,
+    the folder is listed again and the open is retried once.
+
+    :param open_blob: async callable - receives the blob properties and returns the result
+    :return: the result of `open_blob`, or None when the ens_id has no such report
+    """
+    for attempt in range(2):
+        latest_blob = await get_latest_report_blob(container_client, session_id, ens_id, type_of_file)
+        if latest_blob is None:
+            return None
+        try:
+            return await open_blob(latest_blob)
+        except (ResourceNotFoundError, ResourceModifiedError):
+            invalidate_reports(session_id, ens_id)
+            if attempt:
+                raise
+
+
+async def report_download_stream(
+    session_id,
+    ens_id,
+    type_of_file,
+    session,
+    blob_service_client: BlobServiceClient = None,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    if_range: Optional[str] = None
+) -> Dict:
+    """
+    Locate the latest report and open it for streaming, honouring conditional and range headers.
+
+    :return: dict - status_code (200, 206 or 304), headers, and content (async iterator of bytes, None for 304)
+    """
+    try:
+        await check_session_reports_ready(session_id, session)
 
-        if not session_supplier_data:
-            raise HTTPException(status_code=400, detail=f"No records found for session_id: {session_id}")
-        
-        initial_state = await get_session_screening_status_static(session_id, session)
-
-        if not initial_state:
-            raise HTTPException(status_code=404, detail=f"No status found for session_id: {session_id}")
-        if len(initial_state):
-            status = initial_state[0]['screening_analysis_status']
-            status_message_map = {
-                STATUS.FAILED: "failed",
-                STATUS.IN_PROGRESS: "is in progress",
-                STATUS.QUEUED: "is not started"
-            }
-            print("status in status_message_map", status in status_message_map)
-            if status in status_message_map:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Screening Analysis Status {status_message_map[status]} for session_id: {session_id}. Please review and correct the uploaded session id."
-                )
-            
         logger.info("Start Report Download")
-        # Retrieve storage settings
-        storage_url = get_settings().storage.storage_account_url
         container_name = session_id  # Session ID is the container name
-        sas_token = str(get_settings().storage.sas_token)
-        logger.info("Initialize BlobServiceClient with SAS token")
-        # Initialize BlobServiceClient with SAS token
-        blob_service_client = BlobServiceClient(account_url=storage_url, credential=sas_token)
-        logger.info("Got Blob_service_client")
-        try:
-            container_client = blob_service_client.get_container_client(container_name)
-        except:
-            logger.error("Failed to get container client")
-            raise HTTPException(status_code=404, detail="Container not found or access denied")
+        blob_service_client = blob_service_client or get_blob_service_client()
+        container_client = blob_service_client.get_container_client(container_name)
+
+        async def open_report(latest_blob):
+            # URL decode the latest filename
+            try :
+                decoded_filename = urllib.parse.unquote(latest_blob.name)
+            except:
+                logger.error("No Report Found")
+                raise HTTPException(
+                    status_code=404,
+                    detail="No Report Found."
+                )
+
+            etag = quoted_etag(latest_blob.etag)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": format_datetime(latest_blob.last_modified, usegmt=True),
+                # Reports are per-user: let the browser keep them, but revalidate before each use
+                "Cache-Control": "private, no-cache",
+                "Accept-Ranges": "bytes",
+            }
+
+            if etag_matches(if_none_match, etag):
+                return {"status_code": 304, "headers": headers, "content": None}
+
+            size = latest_blob.size
+            # A Range is only honoured if the client's copy is still the current one
+            byte_range = parse_range_header(range_header, size) if not if_range or etag_matches(if_range, etag) else None
+
+            # Get the latest file's blob client
+            blob_client = container_client.get_blob_client(decoded_filename)
+
+            # The ETag condition keeps the ranges consistent if the report is replaced mid-download
+            if byte_range is None:
+                stream = await blob_client.download_blob(etag=etag, match_condition=MatchConditions.IfNotModified)
+                status_code = 200
+                headers["Content-Length"] = str(size)
+            else:
+                start, end = byte_range
+                stream = await blob_client.download_blob(
+                    offset=start, length=end - start + 1, etag=etag, match_condition=MatchConditions.IfNotModified
+                )
+                status_code = 206
+                headers["Content-Length"] = str(end - start + 1)
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+            headers["Content-Disposition"] = f"attachment; filename={decoded_filename}"
+            return {"status_code": status_code, "headers": headers, "content": iter_blob_chunks(stream)}
 
-        # Define folder path based on ens_id (no leading slash)
-        folder_path = f"{ens_id}/"
         logger.info("Requesting ens report ")
         try:
-            # List blobs inside the specific folder
-            blob_list = container_client.list_blobs(name_starts_with=folder_path)
-        except:
-            logger.error("Failed to list blobs in container")
+            # Latest blob inside the ens_id folder matching type_of_file
+            result = await open_latest_report(container_client, session_id, ens_id, type_of_file, open_report)
+        except (ResourceNotFoundError, ResourceModifiedError):
+            raise HTTPException(status_code=404, detail="No Report Found.")
+        except HttpResponseError as e:
+            logger.error(f"Failed to list blobs in container: {e}")
             raise HTTPException(status_code=500, detail="Failed to list blobs in container")
 
-
-        # Filter blobs that match session_id, ens_id, and type_of_file
-        matching_blobs = [
-            blob for blob in blob_list 
-            if ens_id in blob.name and blob.name.endswith(f".{type_of_file}")
-        ]
-
         # Ensure at least one matching file exists
-        if not matching_blobs:
+        if result is None:
             raise HTTPException(status_code=404, detail=f"No matching {type_of_file} file found for session_id {session_id} and ens_id {ens_id}")
 
-        # Sort blobs by last modified date to get the latest file
-        latest_blob = max(matching_blobs, key=lambda b: b.last_modified)
-
-        # URL decode the latest filename
-        try : 
-            decoded_filename = urllib.parse.unquote(latest_blob.name)
-        except: 
-            logger.error("No Report Found")
-            raise HTTPException(
-                status_code=404,
-                detail="No Report Found."
-            )
-        # Get the latest file's blob client
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=decoded_filename)
-
-        # Download the blob data
-        stream = blob_client.download_blob()
-        file_data = stream.readall()
+        return result
 
-        return file_data, decoded_filename
-    
     except HTTPException as http_err:
         raise http_err  # Propagate HTTP exceptions
 
@@ -107,74 +225,137 @@ async def report_download(session_id, ens_id, type_of_file, session)->Dict:
             status_code=404,
                 detail="No Report Found."
         )
-    
 
-async def report_bulk_download(session_id, session) -> Dict:
-    try:
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=session_id, 
-            session=session
-        )
 
-        if not session_supplier_data:
-            raise HTTPException(status_code=404, detail=f"No records found for session_id: {session_id}")
+# Bytes handed to the zip compressor per call; compression runs off the event loop
+ZIP_WRITE_CHUNK_SIZE = 1024 * 1024
 
-        initial_state = await get_session_screening_status_static(session_id, session)
 
-        if not initial_state:
-            raise HTTPException(status_code=404, detail=f"No status found for session_id: {session_id}")
-        if len(initial_state):
-            status = initial_state[0]['screening_analysis_status']
-            status_message_map = {
-                STATUS.FAILED: "failed",
-                STATUS.IN_PROGRESS: "is in progress",
-                STATUS.QUEUED: "is not started"
-            }
-            print("status in status_message_map", status in status_message_map)
-            if status in status_message_map:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Screening Analysis Status {status_message_map[status]} for session_id: {session_id}. Please review and correct the uploaded session id."
-                )
-            
-        # Retrieve storage settings
-        storage_url = get_settings().storage.storage_account_url
-        container_name = session_id
-        sas_token = str(get_settings().storage.sas_token)
+class ZipStreamBuffer:
+    """
+    Write-only, unseekable sink for zipfile.ZipFile that hands the written bytes out as they are produced.
 
-        # Initialize BlobServiceClient with SAS token
-        blob_service_client = BlobServiceClient(account_url=storage_url, credential=sas_token)
-        try: 
-            container_client = blob_service_client.get_container_client(container_name)
-        except Exception as e:
-            raise HTTPException(
-                status_code=404,
-                detail="No Report Found."
-            )
+    zipfile writes entries with data descriptors when its file cannot seek, so an archive can be
+    emitted front to back without ever being held whole.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
-        
-        # List all blobs inside the container
-        blob_list = list(container_client.list_blobs())  # Convert generator to list
 
-        # Ensure there are files to download
-        if not blob_list:
-            raise HTTPException(status_code=404, detail=f"No files found for session_id {session_id}")
+async def iter_report_zip(container_client: ContainerClient, blobs: list, concurrency: int) -> AsyncIterator[bytes]:
+    """
+    Yield a zip archive of `blobs`, entry by entry, as the blobs are downloaded.
+
+    Up to `concurrency` blobs download in parallel and at most `concurrency` more wait to be written,
+    so memory depends on the concurrency and report sizes, not on the number of blobs. Entries are
+    written in the order their downloads finish, under their original blob paths.
+    """
+    pending = iter(blobs)
+    downloaded = asyncio.Queue(maxsize=concurrency)
+
+    async def fetch_blobs():
+        for blob in pending:
+            try:
+                stream = await container_client.get_blob_client(blob.name).download_blob()
+                await downloaded.put((blob, await stream.readall()))
+            except Exception as error:
+                await downloaded.put((blob, error))
+
+    workers = [asyncio.create_task(fetch_blobs()) for _ in range(min(concurrency, len(blobs)))]
+    sink = ZipStreamBuffer()
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for _ in range(len(blobs)):
+                blob, file_data = await downloaded.get()
+                if isinstance(file_data, Exception):
+                    logger.error(f"Failed to download {blob.name} for bulk download: {file_data}")
+                    raise file_data
+
+                entry_info = zipfile.ZipInfo(blob.name, date_time=blob.last_modified.timetuple()[:6])
+                entry_info.compress_type = zipfile.ZIP_DEFLATED
+                entry_info.file_size = len(file_data)
+                with zip_file.open(entry_info, "w") as entry:
+                    for offset in range(0, len(file_data), ZIP_WRITE_CHUNK_SIZE):
+                        await asyncio.to_thread(entry.write, file_data[offset:offset + ZIP_WRITE_CHUNK_SIZE])
+                        chunk = sink.drain()
+                        if chunk:
+                            yield chunk
+                del file_data
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        # Central directory, written when the archive closes
+        yield sink.drain()
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+
+async def list_session_report_blobs(session_id, session, blob_service_client: BlobServiceClient = None):
+    """
+    Check the session is ready and list every blob in its container.
+
+    :return: tuple - (container client, list of blob properties)
+    :raises HTTPException: 404 when the container holds no files.
+    """
+    await check_session_reports_ready(session_id, session)
+
+    container_name = session_id
+    blob_service_client = blob_service_client or get_blob_service_client()
+    container_client = blob_service_client.get_container_client(container_name)
+
+    # List all blobs inside the container (properties only)
+    blob_list = [blob async for blob in container_client.list_blobs()]
+
+    # Ensure there are files to download
+    if not blob_list:
+        raise HTTPException(status_code=404, detail=f"No files found for session_id {session_id}")
+
+    return container_client, blob_list
+
+
+async def report_bulk_download_stream(session_id, session, blob_service_client: BlobServiceClient = None):
+    """
+    Validate the session and return an async iterator over its zip archive, plus the archive name.
+
+    Errors found before streaming starts (unknown session, empty container) raise HTTPException;
+    a failed download mid-stream ends the stream early.
+    """
+    try:
+        container_client, blob_list = await list_session_report_blobs(session_id, session, blob_service_client)
+        concurrency = get_settings().storage.download_concurrency
+        return iter_report_zip(container_client, blob_list, concurrency), f"{session_id}.zip"
+
+    except HTTPException as http_err:
+        raise http_err  # Propagate HTTP exceptions
+
+    except Exception as error:
+        logger.error(f"Unexpected error: {error}")
+        raise HTTPException(
+            status_code=404,
+                detail="No Report Found."
+        )
+
 
-        # Create an in-memory ZIP file
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for blob in blob_list:
-                blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob.name)
-                file_data = blob_client.download_blob().readall()
-                zip_file.writestr(blob.name, file_data)  # Add file to ZIP with original path
+async def report_bulk_download(session_id, session, blob_service_client: BlobServiceClient = None) -> Dict:
+    try:
+        zip_chunks, file_name = await report_bulk_download_stream(session_id, session, blob_service_client)
 
-        # Seek to the beginning of the ZIP file
-        zip_buffer.seek(0)
-        
-        return zip_buffer.getvalue(), f"{session_id}.zip"
+        # Whole archive in one bytes object (no intermediate BytesIO copy)
+        return b"".join([chunk async for chunk in zip_chunks]), file_name
 
     except HTTPException as http_err:
         raise http_err  # Propagate HTTP exceptions
@@ -190,55 +371,52 @@ async def reviw_json_report_(
     session,
     session_id,
     ens_id,
-    type_of_file
-) -> Dict:
+    type_of_file,
+    blob_service_client: BlobServiceClient = None
+) -> bytes:
+    """
+    Return the latest JSON report of an ens_id as a ready-to-send ``{"data": <report>}`` body.
+    """
     try:
-        # Step 1: Validate session data exists in DB
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data",
-            required_columns=['session_id'],
-            ens_id="",
-            session_id=session_id,
-            session=session
-        )
-
-        if not session_supplier_data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No records found for session_id: {session_id}"
-            )
-
-        initial_state = await get_session_screening_status_static(session_id, session)
+        # Step 1: Validate session data exists in DB and screening has finished
+        await check_session_reports_ready(session_id, session)
 
-        if not initial_state:
-            raise HTTPException(status_code=404, detail=f"No status found for session_id: {session_id}")
-        if len(initial_state):
-            status = initial_state[0]['screening_analysis_status']
-            status_message_map = {
-                STATUS.FAILED: "failed",
-                STATUS.IN_PROGRESS: "is in progress",
-                STATUS.QUEUED: "is not started"
-            }
-            print("status in status_message_map", status in status_message_map)
-            if status in status_message_map:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Screening Analysis Status {status_message_map[status]} for session_id: {session_id}. Please review and correct the uploaded session id."
-                )
-            
-        # Step 2: Initialize storage connection
-        storage_url = get_settings().storage.storage_account_url
-        sas_token = get_settings().storage.sas_token
+        # Step 2: Storage connection (shared client)
         container_name = session_id
-        folder_path = f"{ens_id}/"
-
-        blob_service_client = BlobServiceClient(account_url=storage_url, credential=sas_token)
+        blob_service_client = blob_service_client or get_blob_service_client()
         container_client = blob_service_client.get_container_client(container_name)
 
-        # Step 3: Try listing blobs — if container doesn't exist, catch it
+        async def read_report(latest_blob):
+            # Fetch the latest blob, unless this version is already cached
+            decoded_filename = urllib.parse.unquote(latest_blob.name)
+            cache_key = report_cache_key(session_id, decoded_filename, latest_blob.etag)
+            file_data = await get_cached_report(cache_key)
+
+            if file_data is None:
+                blob_client = container_client.get_blob_client(decoded_filename)
+                try:
+                    # Pinned to the listed ETag so the cached bytes always match their key
+                    stream = await blob_client.download_blob(
+                        etag=quoted_etag(latest_blob.etag), match_condition=MatchConditions.IfNotModified
+                    )
+                    file_data = await stream.readall()
+                    # Parsed once to validate; the raw bytes are what gets served
+                    json.loads(file_data.decode("utf-8"))
+                except (ResourceNotFoundError, ResourceModifiedError):
+                    raise  # Stale manifest entry: open_latest_report lists again
+                except Exception as e:
+                    logger.error(f"Failed to read or parse blob: {e}")
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Unable to read or parse report JSON"
+                    )
+                await store_report(cache_key, file_data)
+            return file_data
+
+        # Step 3: Find and read the latest matching blob — if container doesn't exist, catch it
         try:
-            blob_list = list(container_client.list_blobs(name_starts_with=folder_path))
-        except ResourceNotFoundError:
+            file_data = await open_latest_report(container_client, session_id, ens_id, type_of_file, read_report)
+        except (ResourceNotFoundError, ResourceModifiedError):
             raise HTTPException(
                 status_code=404,
                 detail=f"No report container found for session_id: {session_id}"
@@ -250,34 +428,15 @@ async def reviw_json_report_(
                 detail="Unable to access blob storage"
             )
 
-        # Step 4: Filter matching blobs
-        matching_blobs = [
-            blob for blob in blob_list
-            if ens_id in blob.name and blob.name.endswith(f".{type_of_file}")
-        ]
-
-        if not matching_blobs:
+        # Step 4: Ensure a matching blob exists
+        if file_data is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No .{type_of_file} report found for session_id {session_id} and ens_id {ens_id}"
             )
 
-        # Step 5: Fetch the latest blob
-        latest_blob = max(matching_blobs, key=lambda b: b.last_modified)
-        decoded_filename = urllib.parse.unquote(latest_blob.name)
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=decoded_filename)
-
-        try:
-            file_data = blob_client.download_blob().readall()
-            json_data = json.loads(file_data.decode("utf-8"))
-        except Exception as e:
-            logger.error(f"Failed to read or parse blob: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Unable to read or parse report JSON"
-            )
-
-        return {"data": json_data}
+        # Pre-encoded {"data": <report>} body
+        return b'{"data":' + file_data + b'}'
 
     except HTTPException as http_err:
         raise http_err  # Propagate HTTP exceptions
@@ -287,4 +446,3 @@ async def reviw_json_report_(
         raise HTTPException(
             status_code=500, detail="Unexpected error occurred while processing the report"
         )
-    
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Review report cache
+#
+# Raw bytes of JSON review reports, keyed by session, blob name and ETag, so /report/reviw-report
+# can answer without downloading, parsing and re-serialising the report. Blobs are immutable under
+# an ETag, so entries never need invalidating: a regenerated report simply has a new key. Each
+# worker keeps a byte-bounded LRU, optionally backed by a Redis tier shared by all workers
+# (settings: REPORTCACHE__*).
+
+import hashlib
+
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.core.utils.cache import ByteLRUCache
+from app.schemas.logger import logger
+
+REDIS_KEY_PREFIX = "review_report"
+
+REVIEW_REPORT_CACHE = ByteLRUCache(max_bytes=get_settings().reportcache.max_bytes)
+_redis = None
+
+
+def _redis_client():
+    global _redis
+    redis_url = get_settings().reportcache.redis_url
+    if redis_url and _redis is None:
+        _redis = aioredis.from_url(redis_url)
+    return _redis
+
+
+def report_cache_key(session_id: str, blob_name: str, etag: str) -> str:
+    return f"{session_id}/{blob_name}@{etag}"
+
+
+def _redis_key(cache_key: str) -> str:
+    return f"{REDIS_KEY_PREFIX}:{hashlib.sha1(cache_key.encode('utf-8')).hexdigest()}"
+
+
+async def get_cached_report(cache_key: str):
+    """Return the cached raw JSON bytes of a report, or None."""
+    if not get_settings().reportcache.enabled:
+        return None
+
+    raw_report = REVIEW_REPORT_CACHE.get(cache_key)
+    if raw_report is not None:
+        metrics.increment("review_report_cache_hits")
+        return raw_report
+
+    redis_client = _redis_client()
+    if redis_client is not None:
+        try:
+            raw_report = await redis_client.get(_redis_key(cache_key))
+        except Exception as e:
+            logger.warning(f"Review report cache Redis read failed: {e}")
+            raw_report = None
+        if raw_report is not None:
+            _store_local(cache_key, raw_report)
+            metrics.increment("review_report_cache_hits")
+            metrics.increment("review_report_cache_redis_hits")
+            return raw_report
+
+    metrics.increment("review_report_cache_misses")
+    return None
+
+
+def _store_local(cache_key: str, raw_report: bytes):
+    REVIEW_REPORT_CACHE.set(cache_key, raw_report)
+    metrics.set_gauge("review_report_cache_bytes", REVIEW_REPORT_CACHE.nbytes)
+
+
+async def store_report(cache_key: str, raw_report: bytes):
+    """Cache the raw JSON bytes of a report that has already been validated as JSON."""
+    if not get_settings().reportcache.enabled:
+        return
+    _store_local(cache_key, raw_report)
+
+    redis_client = _redis_client()
+    if redis_client is not None:
+        try:
+            await redis_client.set(_redis_key(cache_key), raw_report, ex=get_settings().reportcache.redis_ttl)
+        except Exception as e:
+            logger.warning(f"Review report cache Redis write failed: {e}")
+
+
+async def close_report_cache():
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
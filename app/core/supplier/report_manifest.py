@@ -0,0 +1,96 @@
+# Report blob manifest cache
+#
+# For each session, the latest report blob of every ens_id and file extension, so downloads and
+# reviews go straight to the blob instead of listing the ens_id folder each time. An ens_id's entry
+# is filled by one listing and dropped when ensid_screening_status changes for it
+# (ens_id_status_channel), which is when its reports are (re)generated. Per-worker.
+
+from app.core import notifications
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.core.utils.cache import TTLCache
+
+ENS_ID_STATUS_CHANNEL = "ens_id_status_channel"
+
+# session_id -> {ens_id: {extension: BlobProperties}}
+REPORT_MANIFEST_CACHE = TTLCache(
+    maxsize=get_settings().storage.manifest_cache_size, ttl=get_settings().storage.manifest_cache_ttl
+)
+# Bumped on every invalidation; a listing that raced one is not stored
+_invalidations = 0
+
+
+def _extension(blob_name: str) -> str:
+    return blob_name.rpartition(".")[2] if "." in blob_name else ""
+
+
+async def list_latest_reports(container_client, ens_id) -> dict:
+    """
+    List the `ens_id/` folder once and keep the most recently modified blob per extension.
+
+    :return: dict - extension to blob properties
+    """
+    latest = {}
+    async for blob in container_client.list_blobs(name_starts_with=f"{ens_id}/"):
+        if ens_id not in blob.name:
+            continue
+        extension = _extension(blob.name)
+        if extension not in latest or blob.last_modified > latest[extension].last_modified:
+            latest[extension] = blob
+    return latest
+
+
+async def get_latest_report_blob(container_client, session_id, ens_id, type_of_file):
+    """
+    Return the properties of the latest `.type_of_file` report of an ens_id, or None.
+
+    Served from the session's manifest when present; otherwise the ens_id folder is listed once
+    and the latest blob of every extension is remembered.
+    """
+    session_manifest = REPORT_MANIFEST_CACHE.get(session_id)
+    if session_manifest is not None and ens_id in session_manifest:
+        metrics.increment("report_manifest_hits")
+        return session_manifest[ens_id].get(type_of_file)
+
+    metrics.increment("report_manifest_misses")
+    listed_at = _invalidations
+    latest = await list_latest_reports(container_client, ens_id)
+    if latest and listed_at == _invalidations:
+        session_manifest = REPORT_MANIFEST_CACHE.get(session_id)
+        if session_manifest is None:
+            session_manifest = {}
+            REPORT_MANIFEST_CACHE.set(session_id, session_manifest)
+        session_manifest[ens_id] = latest
+    return latest.get(type_of_file)
+
+
+def invalidate_reports(session_id: str, ens_id: str = None):
+    """Forget the manifest of one ens_id in a session, or of the whole session."""
+    global _invalidations
+    _invalidations += 1
+    metrics.increment("report_manifest_invalidations")
+    if ens_id is None:
+        REPORT_MANIFEST_CACHE.pop(session_id)
+        return
+    session_manifest = REPORT_MANIFEST_CACHE.get(session_id)
+    if session_manifest is not None:
+        session_manifest.pop(ens_id, None)
+
+
+async def reset_report_manifest():
+    # Notifications sent while the listener was down are lost
+    global _invalidations
+    _invalidations += 1
+    REPORT_MANIFEST_CACHE.clear()
+
+
+async def handle_ens_status_notification(payload: dict):
+    """Drop the manifest of the ens_id whose screening or report generation moved on."""
+    session_id = payload.get("session_id")
+    if not session_id:
+        await reset_report_manifest()
+        return
+    invalidate_reports(session_id, payload.get("ens_id"))
+
+
+notifications.subscribe(ENS_ID_STATUS_CHANNEL, handle_ens_status_notification, on_reset=reset_report_manifest)
@@ -1,93 +1,31 @@
 from typing import Dict
 
 from fastapi import  HTTPException, status
+from sqlalchemy import ARRAY, String, case
 from app.core.config import get_settings
 from app.core.utils.db_utils import *
-import pandas as pd
+from app.core.utils.upload_utils import aiter_excel_rows, ingest_upload_chunks, prepare_upload_rows, run_in_upload_pool
 import uuid
-import io
 from app.models import *
-import pycountry
 from app.schemas.logger import logger
 
-def validate_and_update_data(data, user_id, session_id):
-    """
-    Validate the data for required fields, generate unique ens_id for each row, 
-    and update each row with a session_id. Add 'upload_' prefix to every key.
-    
-    :param data: List of dictionaries representing rows of data.
-    :param session_id: A session identifier to update in each row.
-    :raises ValueError: If any row is missing required fields.
-    """
-    prefix = "uploaded_"
-
-    for index, row in enumerate(data, start=1):
-        # Add prefix to all keys
-        prefixed_row = {
-    f"uploaded_{key}": str(value) for key, value in row.items()
-} | {
-    f"unmodified_{key}": str(value) for key, value in row.items()
-}
-        prefixed_row['unmodified_country'] = prefixed_row['unmodified_country_copy']
-        # prefixed_row.pop("uploaded_country_copy", None)
-        # prefixed_row.pop("unmodified_country_copy", None)
-        # Validate required fields with prefixed keys
-        missing_fields = []
-        if not prefixed_row.get(f"{prefix}name"):
-            missing_fields.append(f"name")
-        if not prefixed_row.get(f"{prefix}country"):
-            missing_fields.append(f"country")
-        if not prefixed_row.get(f"{prefix}national_id"):
-            missing_fields.append(f"national_id")
-        
-        # If there are missing fields, raise an error with row number and the missing fields
-        if missing_fields:
-            raise ValueError(f"Name, Country, and National ID are mandatory. Please make sure your Excel file contains values in all three columns")
-        
-        # Generate a unique UUID for 'ens_id' and add 'session_id' to the row
-        prefixed_row[f"ens_id"] = str(uuid.uuid4())
-        prefixed_row[f"session_id"] = session_id
-        prefixed_row[f"user_id"] = user_id
-        # Update the data with the new prefixed row
-        data[index - 1] = prefixed_row
-
-    logger.debug("All rows are valid and updated with prefixed keys, ens_id, and session_id.")
-    logger.debug(f"data_validate_and_update_data {data}")
-    
-    return data
-
-country_cache = {}
-def get_country_code_optimized(country_name):
-    if pd.isna(country_name):
-        return country_name
-    if country_name in country_cache:
-        return country_cache[country_name]
-    country = pycountry.countries.get(name=country_name)
-    country_cache[country_name] = country.alpha_2 if country else country_name  # Keep original if not found
-    return country_cache[country_name]
-
 async def process_excel_file(file_contents, client_id, current_user, session) -> Dict:
     try:
         print("current_user", current_user)
-        contents = await file_contents.read()
-        excel_file = io.BytesIO(contents)
-        df = pd.read_excel(excel_file)
-        df = df.where(pd.notnull(df), "")  
-        allowed_rows = get_settings().allowedrows.general
-        if len(df) > allowed_rows:
-            raise ValueError(f"Only {allowed_rows} rows are allowed. Please upload a valid file.")
-        df['country_copy'] = df['country']    
-        df['country'] = df['country'].apply(get_country_code_optimized)
-
-        sheet_data = df.to_dict(orient="records")
+        settings = get_settings()
         session_id = str(uuid.uuid4())
 
-        validate_and_update_data(sheet_data, current_user["user_id"], session_id)
-
-        is_inserted = await insert_dynamic_data("upload_supplier_master_data", sheet_data, session)
+        # Stream the workbook in fixed-size chunks so memory stays bounded regardless of file size
+        rows_inserted = await ingest_upload_chunks(
+            aiter_excel_rows(file_contents, settings.upload.chunk_size),
+            current_user["user_id"],
+            session_id,
+            settings.allowedrows.general,
+            session
+        )
 
         res = {
-            "rows_inserted": is_inserted.get('rows_inserted', 0),
+            "rows_inserted": rows_inserted,
             "session_id": session_id
         }
 
@@ -138,16 +76,17 @@ async def process_vendor_input(vendor_input, client_id, current_user, session) -
         if len(vendor_input) > allowed_rows:
             raise ValueError(f"Only {allowed_rows} rows are allowed. Please upload a valid file.")
         
-        df = pd.DataFrame([v.dict() for v in vendor_input])
-        df['country_copy'] = df['country']
-        df['country'] = df['country'].apply(get_country_code_optimized)
-        
-        processed_vendors = df.to_dict(orient="records")
         session_id = str(uuid.uuid4())
 
-        validate_and_update_data(processed_vendors, current_user["user_id"], session_id)
+        # Normalise and validate on the bounded upload pool, off the event loop
+        processed_vendors = await run_in_upload_pool(
+            prepare_upload_rows, [v.dict() for v in vendor_input], current_user["user_id"], session_id
+        )
 
-        is_inserted = await insert_dynamic_data("upload_supplier_master_data", processed_vendors, session)
+        is_inserted = await bulk_insert_dynamic_data(
+            "upload_supplier_master_data", processed_vendors, session,
+            use_copy=get_settings().upload.bulk_mode == "copy"
+        )
 
         res = {
             "rows_inserted": is_inserted.get('rows_inserted', 0),
@@ -194,14 +133,14 @@ async def process_vendor_input(vendor_input, client_id, current_user, session) -
             detail=f"Error processing the Excel file: {str(error)}"
         )
 
-async def get_session_supplier(sess_id, page_no, rows_per_page, final_validation_status, session) -> Dict:
+async def get_session_supplier(sess_id, page_no, rows_per_page, final_validation_status, session, cursor=None) -> Dict:
     try:
         if not sess_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session ID is required.")
 
         offset = (page_no-1) * rows_per_page if page_no else 0
         limit = rows_per_page if rows_per_page else 10000
-        extra_filters = {"offset": offset, "limit": limit, "final_validation_status": final_validation_status}
+        extra_filters = {"offset": offset, "limit": limit, "final_validation_status": final_validation_status, "cursor": cursor}
 
         select_column = ["id", "uploaded_name", "uploaded_name_international", "uploaded_address", "uploaded_postcode", 
                          "uploaded_city", "uploaded_country", "uploaded_phone_or_fax", "uploaded_email_or_website", 
@@ -238,7 +177,8 @@ async def get_session_supplier(sess_id, page_no, rows_per_page, final_validation
             "total_data": session_supplier_data[1], 
             # "not_validated_count": not_validated_count, 
             "data": session_supplier_data[0], 
-            "session_id": sess_id
+            "session_id": sess_id,
+            "next_cursor": session_supplier_data[2]
         }
 
     except HTTPException as http_err:
@@ -250,6 +190,12 @@ async def get_session_supplier(sess_id, page_no, rows_per_page, final_validation
             detail=f"Error retrieving session supplier data: {str(error)}"
         )
     
+# Columns overwritten from their suggested_ counterpart when a REVIEW suggestion is resolved
+SUGGESTED_COLUMNS = [
+    "name", "name_international", "address", "postcode", "city", "country",
+    "phone_or_fax", "email_or_website", "national_id", "state", "address_type"
+]
+
 async def update_suggestions_bulk(payload, session) -> Dict:
     try:
         logger.debug(f"update_suggestions_bulk: {type(payload)}")
@@ -267,16 +213,8 @@ async def update_suggestions_bulk(payload, session) -> Dict:
                 status_code=404, 
                 detail="Table 'upload_supplier_master_data' does not exist in the database schema."
             )
-        session_supplier_data = await get_dynamic_ens_data(
-            table_name="upload_supplier_master_data", 
-            required_columns=['session_id'], 
-            ens_id="", 
-            session_id=payload.session_id, 
-            session=session
-        )
-
-        if not session_supplier_data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No records found for session_id: {payload.session_id}")
+        if not await session_exists(payload.session_id, session):
+            raise HTTPException(status_code=404, detail=f"No records found for session_id: {payload.session_id}")
 
         initial_state = await get_session_screening_status_static(payload.session_id, session)
 
@@ -296,61 +234,43 @@ async def update_suggestions_bulk(payload, session) -> Dict:
                     status_code=400,
                     detail=f"Supplier name validation {status_message_map[status]} for session_id: {payload.session_id}. Please review and correct the uploaded session id."
                 )
-        # Step 1: Automatically accept all MATCH statuses
-        accept_match_query = (
-            update(table_class)
-            .where(table_class.c.session_id == payload.session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT)
-            .values(final_status=FinalStatus.ACCEPTED)
-        )
-        accepted_rows = await session.execute(accept_match_query)
-        logger.info(f"Accepted Rows with MATCH status: {accepted_rows.rowcount}")
-
-        reject_match_query = (
-            update(table_class)
-            .where(table_class.c.session_id == payload.session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_REJECT)
-            .values(final_status=FinalStatus.REJECTED)
-        )
-        rejected_rows = await session.execute(reject_match_query)
-        logger.info(f"Accepted Rows with MATCH status: {rejected_rows.rowcount}")
-
-        # Step 2: Reject all others unless explicitly accepted in the payload
+        # Step 1: Resolve every auto and review row in one UPDATE; REVIEW rows take the suggested values
+        # and the payload decision, AUTO_ACCEPT/AUTO_REJECT rows are accepted/rejected
         final_response = (
             FinalStatus.ACCEPTED 
             if payload.status.replace(" ", "").strip().lower() in ['accept', 'accepted'] 
             else FinalStatus.REJECTED
         )
-    
-        reject_or_accept_others_query = (
+        final_status_type = table_class.c.final_status.type
+        is_review = table_class.c.final_validation_status == FinalValidatedStatus.REVIEW
+
+        def review_value(column):
+            return case((is_review, table_class.c[f"suggested_{column}"]), else_=table_class.c[column])
+
+        resolve_query = (
             update(table_class)
             .where(table_class.c.session_id == payload.session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.REVIEW) 
+            .where(table_class.c.final_validation_status.in_([
+                FinalValidatedStatus.AUTO_ACCEPT, FinalValidatedStatus.AUTO_REJECT, FinalValidatedStatus.REVIEW
+            ]))
             .values(
-                name=table_class.c.suggested_name,
-                name_international=table_class.c.suggested_name_international,
-                address=table_class.c.suggested_address,
-                postcode=table_class.c.suggested_postcode,
-                city=table_class.c.suggested_city,
-                country=table_class.c.suggested_country,
-                phone_or_fax=table_class.c.suggested_phone_or_fax,
-                email_or_website=table_class.c.suggested_email_or_website,
-                national_id=table_class.c.suggested_national_id,
-                state=table_class.c.suggested_state,
-                address_type=table_class.c.suggested_address_type,             
-                final_status=final_response
+                **{column: review_value(column) for column in SUGGESTED_COLUMNS},
+                final_status=case(
+                    (table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT, literal(FinalStatus.ACCEPTED, final_status_type)),
+                    (table_class.c.final_validation_status == FinalValidatedStatus.AUTO_REJECT, literal(FinalStatus.REJECTED, final_status_type)),
+                    else_=literal(final_response, final_status_type)
+                )
             )
+            .returning(*[table_class.c[column] for column in SUPPLIER_MASTER_SYNC_COLUMNS.values()])
+            .cte("resolved_suggestions")
         )
 
-        result = await session.execute(reject_or_accept_others_query)
-        logger.info(f"Updated Rows (Non-MATCH statuses): {result.rowcount}")
-
-        # Call update_supplier_master_data if needed
-        supplier_master_response = {"updated_ens_ids": []}
-        if accepted_rows.rowcount + result.rowcount > 0:
-            supplier_master_response = await update_supplier_master_data(session, payload.session_id)
-
-        updated_ens_ids = supplier_master_response.get("updated_ens_ids", [])
+        # Step 2: Feed supplier_master_data from the UPDATE's RETURNING rows in the same statement
+        sync_query = build_supplier_master_upsert(resolve_query).add_cte(resolve_query)
+        result = await session.execute(sync_query)
+        updated_ens_ids = list(result.scalars().all())
+        await session.commit()
+        logger.info(f"Inserted or updated {len(updated_ens_ids)} supplier_master_data rows for session_id: {payload.session_id}")
 
         # Construct final response
         return {
@@ -413,12 +333,8 @@ async def update_suggestions_single(payload, session_id, session: AsyncSession)
 
         logger.debug(f"Payload: {payload}")
 
-        # Step 2: Fetch all rows for the session_id
-        query = select(table_class).where(table_class.c.session_id == session_id)
-        result = await session.execute(query)
-        rows = result.fetchall()
-
-        if not rows:
+        # Step 2: Check the session exists without reading its rows
+        if not await session_exists(session_id, session):
             raise HTTPException(
                 status_code=404, 
                 detail=f"No records found for session_id: {session_id}"
@@ -441,61 +357,41 @@ async def update_suggestions_single(payload, session_id, session: AsyncSession)
                     status_code=400,
                     detail=f"Supplier name validation {status_message_map[status]} for session_id: {session_id}. Please review and correct the uploaded session id."
                 )
-        accept_match_query = (
-            update(table_class)
-            .where(table_class.c.session_id == session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT)
-            .values(final_status=FinalStatus.ACCEPTED)
+
+        # Step 3: Stage the payload as array parameters, unnested server side
+        incoming_ens_ids = list({entry.ens_id for entry in payload})
+        payload_accepts = list({entry.ens_id for entry in payload if entry.status.strip().lower() in ['accept', 'accepted']})
+        payload_rejects = list({entry.ens_id for entry in payload if entry.status.strip().lower() not in ['accept', 'accepted']})
+        staged_accepts = select(func.unnest(literal(payload_accepts, ARRAY(String))))
+        staged_rejects = select(func.unnest(literal(payload_rejects, ARRAY(String))))
+        in_session = table_class.c.session_id == session_id
+
+        staged_ids = func.unnest(literal(incoming_ens_ids, ARRAY(String))).table_valued("ens_id").alias("payload")
+        invalid_query = select(staged_ids.c.ens_id).where(
+            ~select(literal(1)).where(in_session, table_class.c.ens_id == staged_ids.c.ens_id).exists()
         )
-        accepted_rows = await session.execute(accept_match_query)
-        logger.info(f"Accepted Rows with MATCH status: {accepted_rows.rowcount}")
+        invalid_ens_ids = list((await session.execute(invalid_query)).scalars().all())
 
-        reject_match_query = (
+        # Step 4: Resolve AUTO_ACCEPT / AUTO_REJECT rows in one statement
+        auto_query = (
             update(table_class)
-            .where(table_class.c.session_id == session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_REJECT)
-            .values(final_status=FinalStatus.REJECTED)
-        )
-        rejected_rows = await session.execute(reject_match_query)
-        logger.info(f"Accepted Rows with MATCH status: {rejected_rows.rowcount}")
-        # Step 3: Fetch accepted ens_ids from DB
-        accepted_rows_query = (
-            select(table_class.c.ens_id)
-            .where(table_class.c.session_id == session_id)
-            .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT)
+            .where(in_session)
+            .where(table_class.c.final_validation_status.in_([FinalValidatedStatus.AUTO_ACCEPT, FinalValidatedStatus.AUTO_REJECT]))
+            .values(final_status=case(
+                (table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT, literal(FinalStatus.ACCEPTED, table_class.c.final_status.type)),
+                else_=literal(FinalStatus.REJECTED, table_class.c.final_status.type)
+            ))
         )
-        result_rows_query = await session.execute(accepted_rows_query)
-        ac_ens_ids = result_rows_query.fetchall()
-        accepted_ens_ids = list({row[0] for row in ac_ens_ids})  # Unique ens_ids
-
-        logger.debug(f"Accepted ens_ids from DB: {accepted_ens_ids}")
-
-        # Step 4: Convert to list of dictionaries for further processing
-        column_names = result.keys()
-        data_dicts = [dict(zip(column_names, row)) for row in rows]
-        db_ens_ids = {str(row["ens_id"]) for row in data_dicts}
-        incoming_ens_ids = {entry.ens_id for entry in payload}
-
-        valid_ens_ids = incoming_ens_ids.intersection(db_ens_ids)
-        invalid_ens_ids = list(incoming_ens_ids - db_ens_ids)
-
-        # Step 5: Categorize ens_ids into accepted & rejected lists
-        accepted_ensid = set()
-        reject_ensid = set()
-
-        for entry in payload:
-            if entry.ens_id in valid_ens_ids:
-                if entry.status.strip().lower() in ['accept', 'accepted']:
-                    accepted_ensid.add(entry.ens_id)
-                else:
-                    reject_ensid.add(entry.ens_id)
-
-        # Step 6: Update accepted ens_ids
-        if accepted_ensid:
+        auto_rows = await session.execute(auto_query)
+        logger.info(f"Resolved Rows with AUTO_ACCEPT/AUTO_REJECT status: {auto_rows.rowcount}")
+
+        # Step 5: Accept REVIEW rows named in the payload, taking the suggested values
+        if payload_accepts:
             accept_query = (
                 update(table_class)
-                .where(table_class.c.ens_id.in_(accepted_ensid))
+                .where(in_session)
                 .where(table_class.c.final_validation_status == FinalValidatedStatus.REVIEW)
+                .where(table_class.c.ens_id.in_(staged_accepts))
                 .values(
                     name=table_class.c.suggested_name,
                     name_international=table_class.c.suggested_name_international,
@@ -513,28 +409,38 @@ async def update_suggestions_single(payload, session_id, session: AsyncSession)
             )
             await session.execute(accept_query)
 
-        # Step 7: Update rejected ens_ids (including those not in accepted_ensid)
-        all_ens_ids = {str(row["ens_id"]) for row in data_dicts}  # Convert to string
-        logger.debug(f"all_ens_ids {all_ens_ids}")
-        # Include already accepted ens_ids from DB
-        if accepted_ens_ids:
-            accepted_ensid.update(accepted_ens_ids)
-        remaining_rejected = all_ens_ids - accepted_ensid
-        reject_ensid.update(remaining_rejected)
-
-        if reject_ensid:
-            reject_query = (
-                update(table_class)
-                .where(table_class.c.ens_id.in_(reject_ensid))
-                .values(final_status=FinalStatus.REJECTED)
+        # Step 6: Reject payload rejects, and by default everything neither accepted nor AUTO_ACCEPT
+        reject_query = (
+            update(table_class)
+            .where(in_session)
+            .where(or_(
+                table_class.c.ens_id.in_(staged_rejects),
+                and_(
+                    table_class.c.final_validation_status != FinalValidatedStatus.AUTO_ACCEPT,
+                    table_class.c.ens_id.not_in(staged_accepts)
+                )
+            ))
+            .values(final_status=FinalStatus.REJECTED)
+            .returning(table_class.c.ens_id)
+        )
+        reject_ensid = set((await session.execute(reject_query)).scalars().all())
+
+        # Step 7: Sync supplier_master_data only when a payload accept or an AUTO_ACCEPT row exists
+        invalid_set = set(invalid_ens_ids)
+        sync_needed = any(ens_id not in invalid_set for ens_id in payload_accepts)
+        if not sync_needed:
+            auto_accepted_query = (
+                select(literal(1))
+                .where(in_session)
+                .where(table_class.c.final_validation_status == FinalValidatedStatus.AUTO_ACCEPT)
+                .limit(1)
             )
-            await session.execute(reject_query)
+            sync_needed = (await session.execute(auto_accepted_query)).first() is not None
 
         # Step 8: Commit the transaction
         await session.commit()
 
-        logger.debug(f"Final Accepted ens_ids: {accepted_ensid}")
-        logger.debug(f"Final Rejected ens_ids: {reject_ensid}")
+        logger.debug(f"Final Rejected ens_ids: {len(reject_ensid)}")
 
         # Step 9: Update supplier master data
         # if len(list(accepted_ensid)):
@@ -542,7 +448,7 @@ async def update_suggestions_single(payload, session_id, session: AsyncSession)
         #     logger.debug(f"Response from update_supplier_master_data: {response_supplier_master_data}")
         # # Call update_supplier_master_data if needed
         supplier_master_response = {"updated_ens_ids": []}
-        if len(list(accepted_ensid)):
+        if sync_needed:
             supplier_master_response = await update_supplier_master_data(session, session_id)
 
         updated_ens_ids = supplier_master_response.get("updated_ens_ids", [])
@@ -570,7 +476,7 @@ async def update_suggestions_single(payload, session_id, session: AsyncSession)
             detail=f"An unexpected error occurred: {str(error)}"
         )
         
-async def get_main_session_supplier(sess_id, page_no, rows_per_page, session) -> Dict:
+async def get_main_session_supplier(sess_id, page_no, rows_per_page, session, cursor=None) -> Dict:
     try:
         logger.debug(f"get_main_session_supplier for session_id: {sess_id}")
 
@@ -578,7 +484,7 @@ async def get_main_session_supplier(sess_id, page_no, rows_per_page, session) ->
         offset = (page_no-1) * rows_per_page if page_no else 0
         limit = rows_per_page if rows_per_page else 10000
         logger.debug(f"offset {offset} limit {limit}")
-        extra_filters = {"offset": offset, "limit": limit}
+        extra_filters = {"offset": offset, "limit": limit, "cursor": cursor}
 
         select_column = [
             "id", "name", "name_international", "address", "postcode", "city", "country", "uploaded_name",
@@ -608,7 +514,8 @@ async def get_main_session_supplier(sess_id, page_no, rows_per_page, session) ->
             "status": "success",
             "total_data": session_supplier_data[1],
             "data": session_supplier_data[0],
-            "session_id": sess_id
+            "session_id": sess_id,
+            "next_cursor": session_supplier_data[2]
         }
 
         return res
@@ -623,7 +530,7 @@ async def get_main_session_supplier(sess_id, page_no, rows_per_page, session) ->
             detail=f"An unexpected error occurred: {str(error)}"
         )
     
-async def get_main_session_supplier_compiled(sess_id, page_no, rows_per_page, session) -> Dict:
+async def get_main_session_supplier_compiled(sess_id, page_no, rows_per_page, session, cursor=None) -> Dict:
     try:
         logger.debug(f"get_main_session_supplier for session_id: {sess_id}")
 
@@ -667,14 +574,27 @@ async def get_main_session_supplier_compiled(sess_id, page_no, rows_per_page, se
                 )
                 .where(supplier_table.c.session_id == sess_id)
                 .order_by(supplier_table.c.update_time.desc(), supplier_table.c.id.desc())
-                .offset(offset)
-                .limit(limit)
             )
 
+            # Keyset mode: seek past the last (update_time, id) instead of skipping rows
+            if cursor:
+                cursor_update_time, cursor_id = decode_pagination_cursor(cursor)
+                join_query = join_query.where(
+                    tuple_(supplier_table.c.update_time, supplier_table.c.id) < tuple_(
+                        literal(cursor_update_time, supplier_table.c.update_time.type),
+                        literal(cursor_id, supplier_table.c.id.type)
+                    )
+                )
+                offset = 0
+
+            join_query = join_query.offset(offset).limit(limit)
+
             result = await session.execute(join_query)
             rows = result.fetchall()
             columns = result.keys()
             formatted_res = [dict(zip(columns, row)) for row in rows]
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Query execution or formatting failed: {e}")
             raise HTTPException(
@@ -712,11 +632,16 @@ async def get_main_session_supplier_compiled(sess_id, page_no, rows_per_page, se
                 detail="Failed to retrieve total record count."
             )
 
+        next_cursor = None
+        if len(formatted_res) == limit:
+            next_cursor = encode_pagination_cursor(formatted_res[-1]["update_time"], formatted_res[-1]["id"])
+
         return {
             "status": "success",
             "total_data": total_count,
             "data": formatted_res,
-            "session_id": sess_id
+            "session_id": sess_id,
+            "next_cursor": next_cursor
         }
 
     except HTTPException as http_err:
@@ -737,13 +662,13 @@ async def get_main_session_supplier_compiled(sess_id, page_no, rows_per_page, se
             detail=f"An unexpected error occurred: {str(error)}"
         )
     
-async def get_session_screening_status(page_no: int, rows_per_page: int, screening_analysis_status, session) -> Dict:
+async def get_session_screening_status(page_no: int, rows_per_page: int, screening_analysis_status, session, cursor=None) -> Dict:
     try:
         # Calculate offset and limit based on page_no and rows_per_page
         offset = (page_no-1) * rows_per_page if page_no else 0
         limit = rows_per_page if rows_per_page else 10000
         logger.debug(f"offset {offset} limit {limit}")
-        extra_filters = {"offset": offset, "limit": limit, "screening_analysis_status": screening_analysis_status}
+        extra_filters = {"offset": offset, "limit": limit, "screening_analysis_status": screening_analysis_status, "cursor": cursor}
 
         select_column = [
             "id", "session_id", "overall_status", "list_upload_status", 
@@ -773,7 +698,8 @@ async def get_session_screening_status(page_no: int, rows_per_page: int, screeni
         return {
             "status": "success",
             "total_data": session_screening_status_data[1], 
-            "data": session_screening_status_data[0]
+            "data": session_screening_status_data[0],
+            "next_cursor": session_screening_status_data[2]
         }
 
     except HTTPException as http_err:
@@ -1,6 +1,5 @@
 import asyncio
 from typing import Dict
-import pycountry
 import requests
 from app.core.config import get_settings
 from app.core.security.jwt import create_jwt_token
@@ -8,71 +7,14 @@ from app.core.supplier.supplier import update_suggestions_bulk
 from app.schemas.requests import BulkPayload
 from fastapi import  HTTPException, status
 from app.core.utils.db_utils import *
-import pandas as pd
+from app.core.utils.upload_utils import aiter_excel_rows, ingest_upload_chunks
 import uuid
-import io
 from app.models import *
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
 from datetime import datetime, timedelta
 from azure.storage.blob import generate_container_sas, ContainerSasPermissions, BlobClient
 from app.schemas.logger import logger
 
-def validate_and_update_data(data, user_id, session_id):
-    """
-    Validate the data for required fields, generate unique ens_id for each row, 
-    and update each row with a session_id. Add 'upload_' prefix to every key.
-    
-    :param data: List of dictionaries representing rows of data.
-    :param session_id: A session identifier to update in each row.
-    :raises ValueError: If any row is missing required fields.
-    """
-    prefix = "uploaded_"
-
-    for index, row in enumerate(data, start=1):
-        # Add prefix to all keys
-        prefixed_row = {
-    f"uploaded_{key}": str(value) for key, value in row.items()
-} | {
-    f"unmodified_{key}": str(value) for key, value in row.items()
-}
-        prefixed_row['unmodified_country'] = prefixed_row['unmodified_country_copy']
-        # prefixed_row.pop("uploaded_country_copy", None)
-        # prefixed_row.pop("unmodified_country_copy", None)
-        # Validate required fields with prefixed keys
-        missing_fields = []
-        if not prefixed_row.get(f"{prefix}name"):
-            missing_fields.append(f"name")
-        if not prefixed_row.get(f"{prefix}country"):
-            missing_fields.append(f"country")
-        if not prefixed_row.get(f"{prefix}national_id"):
-            missing_fields.append(f"national_id")
-        
-        # If there are missing fields, raise an error with row number and the missing fields
-        if missing_fields:
-            raise ValueError(f"Name, Country, and National ID are mandatory. Please make sure your Excel file contains values in all three columns")
-        
-        # Generate a unique UUID for 'ens_id' and add 'session_id' to the row
-        prefixed_row[f"ens_id"] = str(uuid.uuid4())
-        prefixed_row[f"session_id"] = session_id
-        prefixed_row[f"user_id"] = user_id
-        # Update the data with the new prefixed row
-        data[index - 1] = prefixed_row
-
-    logger.debug("All rows are valid and updated with prefixed keys, ens_id, and session_id.")
-    logger.debug(f"data_validate_and_update_data {data}")
-    
-    return data
-
-country_cache = {}
-def get_country_code_optimized(country_name):
-    if pd.isna(country_name):
-        return country_name
-    if country_name in country_cache:
-        return country_cache[country_name]
-    country = pycountry.countries.get(name=country_name)
-    country_cache[country_name] = country.alpha_2 if country else country_name  # Keep original if not found
-    return country_cache[country_name]
-
 async def process_excel_file(file_contents, current_user, session) -> Dict:
     try:
         logger.info(f"TPRP process request for, {current_user}")
@@ -81,25 +23,20 @@ async def process_excel_file(file_contents, current_user, session) -> Dict:
         
         if validate_request >= 5:
             raise ValueError("Maximum 5 requests can run at one time")
-        contents = await file_contents.read()
-        excel_file = io.BytesIO(contents)
-        df = pd.read_excel(excel_file)
-        df = df.where(pd.notnull(df), "")  
-        allowed_rows = get_settings().allowedrows.tprp
-        if len(df) > allowed_rows:
-            raise ValueError(f"Only {allowed_rows} rows are allowed. Please upload a valid file.")
-        df['country_copy'] = df['country']    
-        df['country'] = df['country'].apply(get_country_code_optimized)
-
-        sheet_data = df.to_dict(orient="records")
+        settings = get_settings()
         session_id = str(uuid.uuid4())
 
-        validate_and_update_data(sheet_data, current_user['user_id'], session_id)
-
-        is_inserted = await insert_dynamic_data("upload_supplier_master_data", sheet_data, session)
+        # Stream the workbook in fixed-size chunks so memory stays bounded regardless of file size
+        rows_inserted = await ingest_upload_chunks(
+            aiter_excel_rows(file_contents, settings.upload.chunk_size),
+            current_user['user_id'],
+            session_id,
+            settings.allowedrows.tprp,
+            session
+        )
 
         res = {
-            "rows_inserted": is_inserted.get('rows_inserted', 0),
+            "rows_inserted": rows_inserted,
             "session_id": session_id
         }
 
@@ -240,6 +177,7 @@ async def run_full_pipeline_background(session_id, session):
                     ens_id="",
                     session_id=session_id,
                     session=session,
+                    with_total=False,
                     extra_filters=extra_filters
                 )
                 supplier_status = session_screening_status_data[0][0]['supplier_name_validation_status']
@@ -412,9 +350,7 @@ async def get_session_screening_status_static(
         ]
         merged_data = {**formatted_res[0], **session_sas}
 
-        # Return the formatted result
-        await session.close()
-
+        # Return the formatted result (session lifetime belongs to the caller)
         logger.debug(f"______merged_data_____ {merged_data}")
     
         return merged_data
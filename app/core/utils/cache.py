@@ -0,0 +1,114 @@
+# Small in-process caches shared by the core modules.
+#
+# These are per-worker: every uvicorn worker keeps its own copy, so only cache
+# values that are safe to serve slightly stale or that are explicitly invalidated.
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU mapping whose entries expire ``ttl`` seconds after they were stored.
+
+    :param maxsize: Maximum number of entries; the least recently used entry is evicted first.
+    :param ttl: Entry lifetime in seconds, or None to keep entries until evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("'maxsize' must be a positive integer.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ByteLRUCache:
+    """
+    LRU mapping of bytes values bounded by their total size rather than their count.
+
+    Values larger than the whole budget are not stored.
+
+    :param max_bytes: Maximum total ``len()`` of the stored values; least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("'max_bytes' must be a positive integer.")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        self.pop(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.nbytes += len(value)
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.pop(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.nbytes -= len(value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,93 @@
+import json
+
+import pandas as pd
+import pycountry
+
+from app.core.config import PROJECT_DIR
+from app.schemas.logger import logger
+
+COUNTRY_DATA_FILE = PROJECT_DIR / "country_data.json"
+
+# Everyday spellings that are neither pycountry names nor in country_data.json
+COMMON_ALIASES = {
+    "usa": "US",
+    "u.s.": "US",
+    "u.s.a.": "US",
+    "united states of america": "US",
+    "america": "US",
+    "uk": "GB",
+    "u.k.": "GB",
+    "great britain": "GB",
+    "britain": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "wales": "GB",
+    "northern ireland": "GB",
+    "uae": "AE",
+    "south korea": "KR",
+    "korea": "KR",
+    "north korea": "KP",
+    "russia": "RU",
+    "iran": "IR",
+    "vietnam": "VN",
+    "laos": "LA",
+    "syria": "SY",
+    "bolivia": "BO",
+    "venezuela": "VE",
+    "tanzania": "TZ",
+    "moldova": "MD",
+    "czech republic": "CZ",
+    "turkey": "TR",
+    "holland": "NL",
+    "ivory coast": "CI",
+}
+
+
+def _fold(value) -> str:
+    return " ".join(str(value).split()).casefold()
+
+
+def build_country_alias_index() -> dict:
+    """
+    Build the case-folded lookup of country spellings to ISO alpha-2 codes.
+
+    Sources, lowest precedence first: common aliases, country_data.json, pycountry alpha-2/alpha-3 codes,
+    names, common names and official names.
+    """
+    index = dict(COMMON_ALIASES)
+
+    try:
+        with open(COUNTRY_DATA_FILE, encoding="utf-8") as country_file:
+            for entry in json.load(country_file):
+                index[_fold(entry["countryName"])] = entry["countryCode"].upper()
+    except (OSError, ValueError, KeyError) as error:
+        logger.warning(f"country_data.json not loaded into the country alias index: {error}")
+
+    for country in pycountry.countries:
+        for attribute in ("alpha_3", "alpha_2", "name", "common_name", "official_name"):
+            value = getattr(country, attribute, None)
+            if value:
+                index[_fold(value)] = country.alpha_2
+
+    return index
+
+
+COUNTRY_ALIAS_INDEX = build_country_alias_index()
+
+
+def normalise_country(value):
+    """Return the alpha-2 code for a single country spelling, or the original value if unknown."""
+    if pd.isna(value):
+        return value
+    return COUNTRY_ALIAS_INDEX.get(_fold(value), value)
+
+
+def normalise_country_column(countries: pd.Series) -> pd.Series:
+    """
+    Map a column of country spellings to alpha-2 codes in one vectorised pass.
+
+    Each distinct spelling is folded and looked up once; the column is then translated with a
+    single dict-backed map. Unknown and empty values are kept as they are.
+    """
+    codes = {value: normalise_country(value) for value in countries.dropna().unique()}
+    return countries.map(codes).astype(object).where(countries.notna(), countries)
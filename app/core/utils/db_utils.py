@@ -1,17 +1,57 @@
-import os
+import base64
+import enum
+import json
 from typing import Dict
 from fastapi import Depends, logger, HTTPException, status
-from neo4j import AsyncGraphDatabase
-from sqlalchemy import and_, func, or_, tuple_,  update
+from neo4j import AsyncDriver
+from sqlalchemy import and_, cast, func, literal, null, or_, tuple_, union_all, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models import STATUS, Base, FinalStatus, FinalValidatedStatus, OribisMatchStatus
 from app.api import deps
+from app.core.graph_database import get_graph_driver
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import aliased
 from datetime import datetime, timedelta
 from app.schemas.logger import logger
+from app.core.utils.cache import TTLCache
+
+# Session ids are immutable UUIDs once uploaded, so a positive existence answer never goes stale
+SESSION_EXISTS_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
+# Private labels for the keyset columns appended to paginated selects
+CURSOR_UPDATE_TIME_LABEL = "_cursor_update_time"
+CURSOR_ID_LABEL = "_cursor_id"
+TOTAL_COUNT_LABEL = "_total_count"
+
+# asyncpg rejects statements with more bind parameters than this
+ASYNCPG_MAX_BIND_PARAMS = 32767
+# Records streamed per COPY; bounds the tuples materialised at once
+COPY_CHUNK_SIZE = 5000
+
+def encode_pagination_cursor(update_time: datetime, row_id: int) -> str:
+    """
+    Build an opaque continuation token from the (update_time, id) of the last row on a page.
+    """
+    payload = json.dumps({"update_time": update_time.isoformat(), "id": row_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_pagination_cursor(cursor: str):
+    """
+    Decode a continuation token produced by encode_pagination_cursor.
+
+    :raises HTTPException: 400 if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["update_time"]), int(payload["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' is not a valid continuation token."
+        )
 
 async def get_dynamic_ens_data(
     table_name: str, 
@@ -19,6 +59,7 @@ async def get_dynamic_ens_data(
     ens_id: str = "", 
     session_id: str = "", 
     session=None, 
+    with_total: bool = True,
     **kwargs
 ):
     try:
@@ -34,6 +75,14 @@ async def get_dynamic_ens_data(
 
         # Prepare columns to select
         columns_to_select = [getattr(table_class.c, column) for column in required_columns]
+        # Paginated reads also carry the keyset columns so the next cursor can be built. DISTINCT reads
+        # by ens_id cannot: the unique id would make every row distinct, so they page by offset only
+        keyset_paginated = bool(extra_filters) and not ens_id
+        if keyset_paginated:
+            columns_to_select += [
+                table_class.c.update_time.label(CURSOR_UPDATE_TIME_LABEL),
+                table_class.c.id.label(CURSOR_ID_LABEL)
+            ]
         query = select(*columns_to_select)
 
         # Apply filters
@@ -42,28 +91,9 @@ async def get_dynamic_ens_data(
         if session_id:
             query = query.where(table_class.c.session_id == str(session_id))
         query = query.order_by(table_class.c.update_time.desc(), table_class.c.id.desc())
-        # Execute query to check if session_id or ens_id exists
-        exists_query = select(func.count()).select_from(table_class)
-
-        if ens_id:
-            exists_query = exists_query.where(table_class.c.ens_id == str(ens_id))
-        if session_id:
-            exists_query = exists_query.where(table_class.c.session_id == str(session_id))
-
-        exists_result = await session.execute(exists_query)
-        record_count = exists_result.scalar()
 
-        if record_count == 0:
-            if session_id and ens_id :
-                raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="No data found for the given session_id or ens_id."
-                    ) 
-            elif session_id :
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"No records found for session_id : {session_id}"
-                ) 
+        total_count = None
+        total_count_included = False
 
         # Apply validation status filter
         if extra_filters:
@@ -99,13 +129,46 @@ async def get_dynamic_ens_data(
                     detail="'limit' must be a positive integer."
                 )
 
-            # Count total rows before pagination
-            total_count_query = select(func.count()).select_from(table_class)
-            if query._where_criteria:
-                total_count_query = total_count_query.filter(*query._where_criteria)
-
-            total_count_result = await session.execute(total_count_query)
-            total_count = total_count_result.scalar()
+            cursor = extra_filters.get("cursor")
+            if cursor and ens_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="'cursor' cannot be combined with 'ens_id'; use 'offset' instead."
+                )
+            # Filter set before any keyset predicate, which is what the total describes
+            filter_criteria = query._where_criteria
+            # The caller's columns only: the keyset labels carry the unique id and would count every row
+            columns_to_count = [getattr(table_class.c, column) for column in required_columns]
+
+            def filter_set_count():
+                # COUNT of the rows the page is drawn from; DISTINCT rows when an ens_id is given
+                if ens_id:
+                    return select(func.count()).select_from(
+                        select(*columns_to_count).where(*filter_criteria).distinct().subquery()
+                    )
+                return select(func.count()).select_from(table_class).where(*filter_criteria)
+
+            # Fetch the total alongside the page instead of a separate COUNT round trip
+            if with_total:
+                if cursor or ens_id:
+                    # The window would only see rows past the cursor, and runs before DISTINCT,
+                    # so count the unseeked filter set instead
+                    total_count_column = filter_set_count().correlate(None).scalar_subquery()
+                else:
+                    total_count_column = func.count().over()
+                query = query.add_columns(total_count_column.label(TOTAL_COUNT_LABEL))
+                total_count_included = True
+
+            # Keyset mode: seek past the last (update_time, id) instead of skipping rows
+            if cursor:
+                cursor_update_time, cursor_id = decode_pagination_cursor(cursor)
+                query = query.where(
+                    tuple_(table_class.c.update_time, table_class.c.id) < tuple_(
+                        literal(cursor_update_time, table_class.c.update_time.type),
+                        literal(cursor_id, table_class.c.id.type)
+                    )
+                )
+                offset = 0
 
             # Apply offset and limit
             query = query.offset(offset).limit(limit)
@@ -116,14 +179,49 @@ async def get_dynamic_ens_data(
         columns = result.keys()
         rows = result.all()
 
+        # An empty result is the only case where we still need to tell "no such session" apart
+        if not rows and session_id:
+            exists_query = select(literal(1)).select_from(table_class).where(
+                table_class.c.session_id == str(session_id)
+            )
+            if ens_id:
+                exists_query = exists_query.where(table_class.c.ens_id == str(ens_id))
+
+            exists_result = await session.execute(exists_query.limit(1))
+            if exists_result.first() is None:
+                if ens_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="No data found for the given session_id or ens_id."
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No records found for session_id : {session_id}"
+                )
+
         formatted_res = [dict(zip(columns, row)) for row in rows]
-        try:
-            total_count
-        except:
+
+        if total_count_included:
+            for row in formatted_res:
+                total_count = row.pop(TOTAL_COUNT_LABEL)
+            if total_count is None:
+                # Page past the end of a non-empty filter set: fall back to a plain count
+                total_count_result = await session.execute(filter_set_count())
+                total_count = total_count_result.scalar()
+        if total_count is None:
             total_count = len(formatted_res)
 
+        # Strip the keyset columns and hand back a token for the following page
+        next_cursor = None
+        if keyset_paginated:
+            for row in formatted_res:
+                last_update_time = row.pop(CURSOR_UPDATE_TIME_LABEL)
+                last_id = row.pop(CURSOR_ID_LABEL)
+            if formatted_res and len(formatted_res) == limit:
+                next_cursor = encode_pagination_cursor(last_update_time, last_id)
+
         logger.debug(f"formatted_res______ {formatted_res}")
-        return formatted_res, total_count
+        return formatted_res, total_count, next_cursor
 
     except HTTPException as http_err:
         raise http_err  # Pass FastAPI exceptions as they are
@@ -140,6 +238,54 @@ async def get_dynamic_ens_data(
             detail=f"An unexpected error occurred: {str(e)}"
         )
 
+async def session_exists(
+    session_id: str,
+    session: AsyncSession,
+    table_name: str = "upload_supplier_master_data"
+) -> bool:
+    """
+    Check whether any row exists for session_id using an indexed LIMIT 1 probe.
+    Positive answers are memoised in SESSION_EXISTS_CACHE; negative answers are always re-checked.
+
+    :param session_id: str - The session to look for.
+    :param session: AsyncSession - The database session.
+    :param table_name: str - The session-scoped table to probe.
+    :return: bool - True if at least one row carries the session_id.
+    """
+    if not session_id:
+        return False
+
+    cache_key = (table_name, str(session_id))
+    if SESSION_EXISTS_CACHE.get(cache_key):
+        return True
+
+    table_class = Base.metadata.tables.get(table_name)
+    if table_class is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Table '{table_name}' does not exist in the database schema."
+        )
+
+    try:
+        query = (
+            select(literal(1))
+            .select_from(table_class)
+            .where(table_class.c.session_id == str(session_id))
+            .limit(1)
+        )
+        result = await session.execute(query)
+        exists = result.first() is not None
+
+    except SQLAlchemyError as sa_err:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(sa_err)}"
+        )
+
+    if exists:
+        SESSION_EXISTS_CACHE.set(cache_key, True)
+    return exists
+
 async def update_dynamic_ens_data(
     table_name: str,
     kpi_data: dict,
@@ -240,7 +386,8 @@ async def insert_dynamic_ens_data(
 async def insert_dynamic_data(
     table_name: str,
     data: list,
-    session: AsyncSession = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_session),
+    commit: bool = True
 ):
     """
     Insert data dynamically into the specified table without additional constraints.
@@ -249,6 +396,7 @@ async def insert_dynamic_data(
         table_name (str): Name of the table where data will be inserted.
         kpi_data (list): List of dictionaries containing the data to insert.
         session (AsyncSession): Async database session.
+        commit (bool): Commit after the insert. Pass False to batch several inserts in one transaction.
     
     Returns:
         dict: A dictionary with the status and message of the operation.
@@ -278,7 +426,8 @@ async def insert_dynamic_data(
         result = await session.execute(query)  # `result` stores the execution details
         logger.debug(f"rowcount:  {result.rowcount}")
         # Commit the transaction
-        await session.commit()
+        if commit:
+            await session.commit()
 
         # Get the number of rows inserted
         rows_inserted = result.rowcount
@@ -302,6 +451,123 @@ async def insert_dynamic_data(
         logger.error(f"An unexpected error occurred: {e}")
         return {"error": "An unexpected error occurred", "status": "failure"}
     
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def copy_dynamic_data(
+    table_name: str,
+    data: list,
+    session: AsyncSession,
+    commit: bool = True,
+    chunk_size: int = COPY_CHUNK_SIZE
+):
+    """
+    Bulk load rows with asyncpg binary COPY (copy_records_to_table) on the session's connection.
+
+    Runs inside the session transaction, so it commits or rolls back with it. Only the columns present
+    in the data are copied; scalar Python-side column defaults are filled in because COPY bypasses them,
+    and server defaults (id sequence, enums, timestamps) apply to the omitted columns.
+
+    :param table_name: str - Name of the table.
+    :param data: list - List of row dicts; keys that are not table columns are ignored.
+    :param session: AsyncSession - Database session (asyncpg driver).
+    :param commit: bool - Commit after the load.
+    :param chunk_size: int - Records sent per COPY.
+    :return: dict - Same shape as insert_dynamic_data.
+    """
+    try:
+        table_class = Base.metadata.tables.get(table_name)
+        if table_class is None:
+            raise ValueError(f"Table '{table_name}' does not exist in the database schema.")
+        if not data:
+            return {"status": "failure", "message": "No valid data left after filtering extra columns."}
+
+        provided = set().union(*(row.keys() for row in data))
+        columns = [
+            column for column in table_class.columns
+            if column.name in provided
+            or (column.default is not None and column.default.is_scalar)
+        ]
+        if not columns:
+            return {"status": "failure", "message": "No valid data left after filtering extra columns."}
+        defaults = [column.default.arg if column.default is not None and column.default.is_scalar else None for column in columns]
+        names = [column.name for column in columns]
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():
+            # Let SQLAlchemy open its transaction first so the COPY is part of it
+            await session.execute(select(literal(1)))
+
+        rows_inserted = 0
+        for chunk in _chunks(data, chunk_size):
+            records = [
+                tuple(
+                    value.name if isinstance(value, enum.Enum) else value
+                    for value in (row.get(name, default) for name, default in zip(names, defaults))
+                )
+                for row in chunk
+            ]
+            await driver_connection.copy_records_to_table(
+                table_name, records=records, columns=names, schema_name=table_class.schema
+            )
+            rows_inserted += len(records)
+
+        if commit:
+            await session.commit()
+
+        logger.info(f"{rows_inserted} row(s) were copied into the {table_name} table.")
+        return {"status": "success", "message": f"Inserted {rows_inserted} rows successfully.", "rows_inserted": rows_inserted}
+
+    except ValueError as ve:
+        logger.error(f"Error: {ve}")
+        return {"error": str(ve), "status": "failure"}
+
+    except Exception as e:
+        logger.error(f"COPY into {table_name} failed: {e}")
+        return {"error": "Database error", "status": "failure"}
+
+async def bulk_insert_dynamic_data(
+    table_name: str,
+    data: list,
+    session: AsyncSession,
+    use_copy: bool = True,
+    commit: bool = True
+):
+    """
+    Insert many rows, using binary COPY when the driver supports it and chunked multi-row INSERTs otherwise.
+
+    INSERT chunks are sized so a single statement stays under the asyncpg bind parameter limit.
+
+    :param table_name: str - Name of the table.
+    :param data: list - List of row dicts.
+    :param session: AsyncSession - Database session.
+    :param use_copy: bool - Prefer COPY (settings.upload.bulk_mode == "copy").
+    :param commit: bool - Commit after all rows are written.
+    :return: dict - Same shape as insert_dynamic_data.
+    """
+    if use_copy:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        if hasattr(raw_connection.driver_connection, "copy_records_to_table"):
+            return await copy_dynamic_data(table_name, data, session, commit=commit)
+        logger.warning(f"Driver does not support COPY; falling back to INSERT for {table_name}")
+
+    columns_per_row = max((len(row) for row in data), default=1)
+    rows_per_statement = max(1, ASYNCPG_MAX_BIND_PARAMS // columns_per_row)
+    rows_inserted = 0
+    for chunk in _chunks(data, rows_per_statement):
+        is_inserted = await insert_dynamic_data(table_name, chunk, session, commit=False)
+        if is_inserted.get("status") != "success":
+            return is_inserted
+        rows_inserted += is_inserted.get("rows_inserted", 0)
+
+    if commit:
+        await session.commit()
+    return {"status": "success", "message": f"Inserted {rows_inserted} rows successfully.", "rows_inserted": rows_inserted}
+
 async def upsert_session_screening_status(
     columns_data: list,
     session_id: str,
@@ -356,6 +622,40 @@ async def upsert_session_screening_status(
         # Catch any other exceptions
         logger.error(f"An unexpected error occurred: {e}")
         return {"error": "An unexpected error occurred", "status": "failure"}
+# upload_supplier_master_data columns copied into supplier_master_data, keyed by their supplier_master_data name
+SUPPLIER_MASTER_SYNC_COLUMNS = {
+    "name": "name", "name_international": "name_international", "address": "address", "postcode": "postcode",
+    "city": "city", "country": "country", "phone_or_fax": "phone_or_fax", "email_or_website": "email_or_website",
+    "national_id": "national_id", "state": "state", "ens_id": "ens_id", "session_id": "session_id", "bvd_id": "bvd_id",
+    "validation_status": "validation_status", "final_status": "final_status", "uploaded_name": "uploaded_name",
+    "external_vendor_id": "uploaded_external_vendor_id"
+}
+
+def build_supplier_master_upsert(source, *criteria):
+    """
+    Build an INSERT INTO supplier_master_data ... SELECT ... ON CONFLICT DO UPDATE ... RETURNING ens_id
+    statement that copies accepted rows with a bvd_id from `source`, entirely server side.
+
+    :param source: Table or CTE exposing the upload_supplier_master_data columns.
+    :param criteria: Extra WHERE criteria on `source` (e.g. the session filter).
+    :return: Insert statement returning the upserted ens_ids.
+    """
+    supplier_master_table = Base.metadata.tables.get("supplier_master_data")
+
+    accepted_rows = select(
+        *[source.c[upload_column] for upload_column in SUPPLIER_MASTER_SYNC_COLUMNS.values()]
+    ).where(
+        source.c.final_status == FinalStatus.ACCEPTED,
+        source.c.bvd_id.isnot(None),
+        *criteria
+    )
+
+    query = insert(supplier_master_table).from_select(list(SUPPLIER_MASTER_SYNC_COLUMNS), accepted_rows)
+    return query.on_conflict_do_update(
+        index_elements=["ens_id", "session_id"],
+        set_={column: query.excluded[column] for column in SUPPLIER_MASTER_SYNC_COLUMNS if column not in ["ens_id", "session_id"]}
+    ).returning(supplier_master_table.c.ens_id)
+
 async def update_supplier_master_data(session, session_id) -> Dict:
     try:
         # Fetch table metadata dynamically
@@ -368,56 +668,19 @@ async def update_supplier_master_data(session, session_id) -> Dict:
                 detail="Table 'upload_supplier_master_data' or 'supplier_master_data' does not exist in the database schema."
             )
 
-        required_columns = [
-            "name", "name_international", "address", "postcode", "city", "country",
-            "phone_or_fax", "email_or_website", "national_id", "state", "ens_id", 
-            "session_id", "bvd_id", "validation_status", "final_status", "uploaded_name", "uploaded_external_vendor_id"
-        ]
-        columns_to_select = [
-            getattr(upload_supplier_master_table.c, column) for column in required_columns
-        ]
-
-        query = select(*columns_to_select).where(
-            and_(
-                upload_supplier_master_table.c.final_status == FinalStatus.ACCEPTED,
-                upload_supplier_master_table.c.session_id == session_id,
-                upload_supplier_master_table.c.bvd_id.isnot(None)
-            )
+        # Copy accepted rows straight from upload_supplier_master_data; nothing leaves Postgres
+        query = build_supplier_master_upsert(
+            upload_supplier_master_table,
+            upload_supplier_master_table.c.session_id == session_id
         )
-
         result = await session.execute(query)
-        columns = result.keys()
-        rows = result.fetchall()
-
-        if not rows:
-            return {
-                "status": "success",
-                "session_id": session_id,
-                "message": f"No valid records found for session_id: {session_id}. No updates were performed.",
-                "updated_ens_ids": []
-            }
-
-        RENAME_MAP = {"uploaded_external_vendor_id": "external_vendor_id"}
-
-        rows_to_insert = [
-            {RENAME_MAP.get(k, k): v for k, v in zip(columns, row)}
-            for row in rows
-        ]
-
-        query2 = insert(supplier_master_table).values(rows_to_insert)
-        query2 = query2.on_conflict_do_update(
-            index_elements=["ens_id", "session_id"],
-            set_={col: query2.excluded[col] for col in rows_to_insert[0].keys() if col not in ["ens_id", "session_id"]}
-        ).returning(supplier_master_table.c.ens_id)
-
-        result = await session.execute(query2)
         inserted_or_updated_rows = result.fetchall()
 
         if not inserted_or_updated_rows:
             return {
                 "status": "success",
                 "session_id": session_id,
-                "message": "No changes were made as no new data was available for insertion or update.",
+                "message": f"No valid records found for session_id: {session_id}. No updates were performed.",
                 "updated_ens_ids": []
             }
 
@@ -484,31 +747,26 @@ async def validate_user_request(current_user, session: AsyncSession = Depends(de
     logger.debug(f"Query Result: {count}")
     return count
 
-async def run_neo4j_query(cypher_query: str) -> dict:
+async def run_neo4j_query(cypher_query: str, driver: AsyncDriver = None) -> dict:
     try:
-
-        URI = os.environ.get("GRAPHDB__URI")
-        USER = os.environ.get("GRAPHDB__USER")
-        PASSWORD = os.environ.get("GRAPHDB__PASSWORD")
-
-        async with AsyncGraphDatabase.driver(URI, auth=(USER, PASSWORD)) as driver:
-            async with driver.session() as session:
-                result = await session.run(cypher_query)
-
-                # Try fetching records (for read queries)
-                try:
-                    records = await result.data()
-                    return {
-                        "status": "pass",
-                        "message": "Query executed successfully.",
-                        "records": records
-                    }
-                except Exception:
-                    # For write queries that don't return anything
-                    return {
-                        "status": "pass",
-                        "message": "Query executed successfully. No return values."
-                    }
+        driver = driver or get_graph_driver()
+        async with driver.session() as session:
+            result = await session.run(cypher_query)
+
+            # Try fetching records (for read queries)
+            try:
+                records = await result.data()
+                return {
+                    "status": "pass",
+                    "message": "Query executed successfully.",
+                    "records": records
+                }
+            except Exception:
+                # For write queries that don't return anything
+                return {
+                    "status": "pass",
+                    "message": "Query executed successfully. No return values."
+                }
 
     except Exception as e:
         return {
@@ -637,37 +895,13 @@ async def get_latest_session_for_ens_id(
 
         # Apply filters
         if ens_id:
-            query = query.where(table_class.c.ens_id == str(ens_id) and table_class.c.overall_status == "COMPLETED").distinct()
+            query = query.where(and_(table_class.c.ens_id == str(ens_id), table_class.c.overall_status == STATUS.COMPLETED))
         if session_id:
             query = query.where(table_class.c.session_id == str(session_id))
 
         query = query.order_by(table_class.c.update_time.desc(), table_class.c.id.desc())
         query = query.limit(1)
 
-
-        # Execute query to check if session_id or ens_id exists
-        exists_query = select(func.count()).select_from(table_class)
-
-        if ens_id:
-            exists_query = exists_query.where(table_class.c.ens_id == str(ens_id) and table_class.c.overall_status == "COMPLETED")
-        if session_id:
-            exists_query = exists_query.where(table_class.c.session_id == str(session_id))
-
-        exists_result = await session.execute(exists_query)
-        record_count = exists_result.scalar()
-
-        if record_count == 0:
-            if session_id and ens_id :
-                raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="No data found for the given session_id or ens_id."
-                    ) 
-            elif session_id :
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"No records found for session_id : {session_id}"
-                ) 
-
         # Execute query
         result = await session.execute(query)
         columns = result.keys()
@@ -695,6 +929,35 @@ async def get_latest_session_for_ens_id(
             detail=f"An unexpected error occurred: {str(e)}"
         )
 
+async def get_latest_completed_screening(ens_id: str, session: AsyncSession) -> Dict:
+    """
+    Return the latest COMPLETED screening of an ens_id with a single primary-key read on latest_ens_screening.
+
+    :param ens_id: str - Entity id.
+    :param session: AsyncSession - Database session.
+    :return: dict - session_id and update_time (of the ensid_screening_status row) of the latest completed screening.
+    :raises HTTPException: 404 if the ens_id has no completed screening.
+    """
+    latest_table = Base.metadata.tables.get("latest_ens_screening")
+    try:
+        result = await session.execute(
+            select(latest_table.c.session_id, latest_table.c.screening_time.label("update_time"))
+            .where(latest_table.c.ens_id == str(ens_id))
+        )
+        row = result.mappings().first()
+    except SQLAlchemyError as sa_err:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(sa_err)}"
+        )
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No completed screening found for ens_id : {ens_id}"
+        )
+    return dict(row)
+
 async def get_dynamic_ens_data_for_session(
         table_name: str,
         required_columns: list,
@@ -733,7 +996,7 @@ async def get_dynamic_ens_data_for_session(
             dict(zip(columns, row)) for row in rows
         ]
 
-        await session.close()
+        # Session lifetime belongs to deps.get_session; closing here forced a fresh pool checkout per query
         return formatted_res
 
     except ValueError as ve:
@@ -748,6 +1011,63 @@ async def get_dynamic_ens_data_for_session(
         print(f"An unexpected error occurred: {e}")
         return []
 
+async def get_union_ens_data_for_session(
+        table_columns: dict,
+        ens_id: str,
+        session_id: str,
+        session: AsyncSession = Depends(deps.get_session)
+):
+    """
+    Fetch the rows of one ens_id/session_id from several same-shaped tables in a single UNION ALL round trip.
+
+    :param table_columns: dict - {table_name: [columns]}; every table is selected with the union of all
+        listed columns, NULL standing in for columns not requested for that table.
+    :param ens_id: str - Entity id.
+    :param session_id: str - Session id.
+    :param session: AsyncSession - Database session.
+    :return: dict - {table_name: [row dicts with that table's requested columns]}, in the given table order.
+    """
+    try:
+        all_columns = list(dict.fromkeys(column for columns in table_columns.values() for column in columns))
+        selects = []
+        for ordinal, (table_name, columns) in enumerate(table_columns.items()):
+            table_class = Base.metadata.tables.get(table_name)
+            if table_class is None:
+                raise ValueError(
+                    f"Table '{table_name}' does not exist in the database schema."
+                )
+            selects.append(
+                select(
+                    literal(ordinal).label("source_ordinal"),
+                    *[
+                        table_class.c[column] if column in columns else cast(null(), table_class.c[column].type).label(column)
+                        for column in all_columns
+                    ]
+                )
+                .where(table_class.c.ens_id == str(ens_id))
+                .where(table_class.c.session_id == str(session_id))
+                .distinct()
+            )
+
+        query = union_all(*selects).order_by("source_ordinal")
+        result = await session.execute(query)
+
+        table_names = list(table_columns)
+        formatted_res = {table_name: [] for table_name in table_names}
+        for row in result.mappings():
+            table_name = table_names[row["source_ordinal"]]
+            formatted_res[table_name].append({column: row[column] for column in table_columns[table_name]})
+
+        return formatted_res
+
+    except ValueError as ve:
+        logger.error(f"Error: {ve}")
+        return {table_name: [] for table_name in table_columns}
+
+    except SQLAlchemyError as sa_err:
+        logger.error(f"Database error: {sa_err}")
+        return {table_name: [] for table_name in table_columns}
+
 async def get_session_screening_status_static(
     session_id: str,
     session: AsyncSession = Depends(deps.get_session)
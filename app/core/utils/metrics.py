@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# In-process runtime metrics (per uvicorn worker), exposed through GET /metrics/runtime.
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = defaultdict(float)
+# Observed values: durations from timed() in milliseconds, or plain quantities such as checkouts per request
+_observations = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0})
+
+
+def increment(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def adjust_gauge(name: str, delta: float):
+    with _lock:
+        _gauges[name] += delta
+
+
+def observe(name: str, value: float):
+    with _lock:
+        observation = _observations[name]
+        observation["count"] += 1
+        observation["total"] += value
+        observation["max"] = max(observation["max"], value)
+
+
+@contextmanager
+def timed(name: str):
+    """Record the wall-clock duration of the wrapped block, in milliseconds, under `name`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - started) * 1000)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "observations": {
+                name: {**observation, "avg": observation["total"] / observation["count"] if observation["count"] else 0.0}
+                for name, observation in _observations.items()
+            },
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _observations.clear()
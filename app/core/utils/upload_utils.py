@@ -0,0 +1,251 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException, UploadFile, status
+from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.utils import metrics
+from app.core.utils.country_utils import normalise_country_column
+from app.core.utils.db_utils import bulk_insert_dynamic_data
+from app.schemas.logger import logger
+
+_upload_pool = None
+
+
+def get_upload_pool() -> ThreadPoolExecutor:
+    global _upload_pool
+    if _upload_pool is None:
+        _upload_pool = ThreadPoolExecutor(
+            max_workers=get_settings().upload.max_workers,
+            thread_name_prefix="upload"
+        )
+    return _upload_pool
+
+
+async def run_in_upload_pool(func, *args, **kwargs):
+    """
+    Run a CPU-bound upload step (parse, normalise, validate) on the bounded upload pool.
+
+    The event loop stays free while the step runs; when every worker is busy the call waits
+    in the pool queue, which is reported as the upload_pool_queued gauge.
+    """
+    # Released exactly once: by the worker that picks the call up, or by the caller if it gives up first
+    left_queue = threading.Lock()
+
+    def leave_queue():
+        if left_queue.acquire(blocking=False):
+            metrics.adjust_gauge("upload_pool_queued", -1)
+
+    def run():
+        leave_queue()
+        metrics.adjust_gauge("upload_pool_running", 1)
+        try:
+            with metrics.timed(f"upload_pool.{func.__name__}"):
+                return func(*args, **kwargs)
+        finally:
+            metrics.adjust_gauge("upload_pool_running", -1)
+
+    metrics.adjust_gauge("upload_pool_queued", 1)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_upload_pool(), run)
+    finally:
+        leave_queue()
+
+
+def shutdown_upload_pool():
+    global _upload_pool
+    if _upload_pool is not None:
+        _upload_pool.shutdown(wait=False, cancel_futures=True)
+        _upload_pool = None
+
+
+MANDATORY_UPLOAD_COLUMNS = ["name", "country", "national_id"]
+# Offending row numbers listed in a validation error before it is truncated
+MAX_REPORTED_ROWS = 20
+
+
+def generate_ens_ids(count: int) -> List[str]:
+    """Generate `count` random (version 4) UUID strings from a single os.urandom call."""
+    random_bytes = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    random_bytes[:, 6] = (random_bytes[:, 6] & 0x0F) | 0x40  # version 4
+    random_bytes[:, 8] = (random_bytes[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_digits = random_bytes.tobytes().hex()
+    return [
+        f"{hex_digits[i:i + 8]}-{hex_digits[i + 8:i + 12]}-{hex_digits[i + 12:i + 16]}-{hex_digits[i + 16:i + 20]}-{hex_digits[i + 20:i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
+
+def validate_and_update_data(df: pd.DataFrame, user_id, session_id, row_offset: int = 0) -> List[Dict]:
+    """
+    Validate the uploaded rows for required fields and build upload_supplier_master_data rows.
+
+    Every column is stringified and added twice, with 'uploaded_' and 'unmodified_' prefixes; unmodified_country
+    takes the country as typed (country_copy). Each row gets a new ens_id plus the session_id and user_id.
+
+    :param df: DataFrame - Uploaded rows, with 'country' normalised and the original in 'country_copy'.
+    :param user_id: str - Id of the uploading user.
+    :param session_id: str - Session the rows belong to.
+    :param row_offset: int - Number of rows preceding this frame in the upload, for error row numbers.
+    :return: list - One dict per row, ready for insertion.
+    :raises ValueError: If any row is missing name, country or national_id; lists the offending row numbers.
+    """
+    if df.empty:
+        return []
+
+    # str() per cell, as the stored values always were ("None" for missing vendor fields)
+    values = df.astype(object).map(str)
+
+    missing = pd.Series(False, index=values.index)
+    for column in MANDATORY_UPLOAD_COLUMNS:
+        missing |= values[column].eq("") if column in values.columns else True
+    if missing.any():
+        row_numbers = (np.flatnonzero(missing.to_numpy()) + row_offset + 1).tolist()
+        reported = ", ".join(str(number) for number in row_numbers[:MAX_REPORTED_ROWS])
+        if len(row_numbers) > MAX_REPORTED_ROWS:
+            reported += f" and {len(row_numbers) - MAX_REPORTED_ROWS} more"
+        raise ValueError(
+            f"Name, Country, and National ID are mandatory. Please make sure your Excel file contains values in all three columns "
+            f"(missing in row(s) {reported})"
+        )
+
+    prepared = pd.concat([values.add_prefix("uploaded_"), values.add_prefix("unmodified_")], axis=1)
+    prepared["unmodified_country"] = prepared["unmodified_country_copy"]
+    prepared["ens_id"] = generate_ens_ids(len(prepared))
+    prepared["session_id"] = session_id
+    prepared["user_id"] = user_id
+
+    logger.debug(f"{len(prepared)} rows are valid and updated with prefixed keys, ens_id, and session_id.")
+
+    columns = list(prepared.columns)
+    return [dict(zip(columns, row)) for row in zip(*(prepared[column].tolist() for column in columns))]
+
+
+def iter_excel_rows(file_obj, chunk_size: int) -> Iterator[List[Dict]]:
+    """
+    Stream the first worksheet of an .xlsx file as lists of row dicts keyed by the header row.
+
+    The workbook is opened in openpyxl read-only mode, so only the current chunk is held in memory.
+    Empty cells become "" and fully empty rows are skipped, matching the previous pandas load.
+
+    :param file_obj: file - Seekable binary file holding the workbook.
+    :param chunk_size: int - Maximum number of rows per yielded chunk.
+    """
+    file_obj.seek(0)
+    workbook = load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [(position, str(name).strip()) for position, name in enumerate(header) if name is not None]
+
+        chunk = []
+        for values in rows:
+            if all(value is None or value == "" for value in values):
+                continue
+            chunk.append({
+                name: ("" if position >= len(values) or values[position] is None else values[position])
+                for position, name in columns
+            })
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+
+async def aiter_excel_rows(file: UploadFile, chunk_size: int) -> AsyncIterator[List[Dict]]:
+    """
+    Async wrapper around iter_excel_rows; parsing runs on the upload pool so the event loop stays free.
+
+    :param file: UploadFile - Uploaded workbook (spooled to disk by Starlette for large files).
+    :param chunk_size: int - Maximum number of rows per yielded chunk.
+    """
+    chunks = iter_excel_rows(file.file, chunk_size)
+    try:
+        while True:
+            chunk = await run_in_upload_pool(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        await run_in_upload_pool(chunks.close)
+
+
+def prepare_upload_rows(rows: List[Dict], user_id, session_id, row_offset: int = 0) -> List[Dict]:
+    """
+    Normalise the country column of raw upload rows and turn them into upload_supplier_master_data rows.
+
+    :param rows: list - Raw rows as read from the sheet or the request body.
+    :param user_id: str - Id of the uploading user.
+    :param session_id: str - Session the rows belong to.
+    :param row_offset: int - Number of rows preceding these in the upload, for error row numbers.
+    :raises ValueError: If any row is missing required fields.
+    """
+    df = pd.DataFrame(rows, dtype=object)
+    if 'country' not in df.columns:
+        df['country'] = ""
+    df['country_copy'] = df['country']
+    df['country'] = normalise_country_column(df['country'])
+    return validate_and_update_data(df, user_id, session_id, row_offset)
+
+
+async def ingest_upload_chunks(
+    chunks: AsyncIterator[List[Dict]],
+    user_id,
+    session_id: str,
+    allowed_rows: int,
+    session: AsyncSession
+) -> int:
+    """
+    Validate and insert upload rows chunk by chunk inside a single transaction.
+
+    Nothing is committed unless every chunk validates and inserts; any failure rolls the upload back.
+
+    :param chunks: async iterator - Lists of raw row dicts.
+    :param user_id: str - Id of the uploading user.
+    :param session_id: str - Session the rows belong to.
+    :param allowed_rows: int - Maximum number of rows accepted for one upload.
+    :param session: AsyncSession - Database session.
+    :return: int - Number of rows inserted.
+    :raises ValueError: If the row limit is exceeded or a row is missing required fields.
+    """
+    rows_inserted = 0
+    rows_read = 0
+    try:
+        async for chunk in chunks:
+            row_offset = rows_read
+            rows_read += len(chunk)
+            if rows_read > allowed_rows:
+                raise ValueError(f"Only {allowed_rows} rows are allowed. Please upload a valid file.")
+
+            upload_rows = await run_in_upload_pool(prepare_upload_rows, chunk, user_id, session_id, row_offset)
+            is_inserted = await bulk_insert_dynamic_data(
+                "upload_supplier_master_data", upload_rows, session,
+                use_copy=get_settings().upload.bulk_mode == "copy", commit=False
+            )
+            if is_inserted.get("status") != "success":
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error inserting uploaded rows: {is_inserted.get('error', is_inserted.get('message'))}"
+                )
+            rows_inserted += is_inserted.get("rows_inserted", 0)
+
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    logger.info(f"{rows_inserted} row(s) ingested for session {session_id}")
+    return rows_inserted
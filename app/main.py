@@ -1,11 +1,16 @@
-import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from neo4j import AsyncGraphDatabase
 
 from app.api.api_router import api_router, auth_router
 from app.core.config import get_settings
+from app.core.blob_storage import close_blob_service_client
+from app.core.database_session import CheckoutCounterMiddleware
+from app.core.graph_database import close_graph_driver, init_graph_driver
+from app.core.notifications import start_notification_listener, stop_notification_listener
+from app.core.supplier.graph_cache import close_graph_cache
+from app.core.supplier.report_cache import close_report_cache
+from app.core.utils.upload_utils import shutdown_upload_pool
 
 app = FastAPI(
     title="minimal fastapi postgres template",
@@ -27,6 +32,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Counts connection pool checkouts per request (GET /metrics/runtime)
+app.add_middleware(CheckoutCounterMiddleware)
+
 # Guards against HTTP Host Header attacks
 app.add_middleware(
     TrustedHostMiddleware,
@@ -36,13 +44,15 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    try:
-        driver = AsyncGraphDatabase.driver(
-            os.environ.get("GRAPHDB__URI"),
-            auth=(os.environ.get("GRAPHDB__USER"), os.environ.get("GRAPHDB__PASSWORD")),
-        )
-        async with driver.session() as session:
-            await session.run("RETURN 1")
-        print("Neo4j connection established.")
-    except Exception as e:
-        print("Failed to connect to Neo4j:", str(e))
\ No newline at end of file
+    await init_graph_driver()
+    await start_notification_listener()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_upload_pool()
+    await close_graph_driver()
+    await stop_notification_listener()
+    await close_graph_cache()
+    await close_report_cache()
+    await close_blob_service_client()
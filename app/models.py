@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy.sql import expression
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import ARRAY, BigInteger, Boolean, Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, Uuid, func, Enum as SQLAlchemyEnum
+from sqlalchemy import ARRAY, BigInteger, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint, Uuid, func, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -192,6 +192,12 @@ class UploadSupplierMasterData(Base):
     user_id = Column(String, ForeignKey("users_table.user_id", ondelete="CASCADE"))  # Change to correct PK
     uploaded_external_vendor_id = Column(String, nullable=True)
     duplicate_in_session = Column(SQLAlchemyEnum(DUPINSESSION), nullable=False, server_default=expression.literal(DUPINSESSION.UNIQUE.value))
+    # Session-led indexes for the paginated listing, the status-filtered listing and per-ens_id updates
+    __table_args__ = (
+        Index('ix_upload_supplier_session_update_time', 'session_id', 'update_time', 'id'),
+        Index('ix_upload_supplier_session_fvs_update_time', 'session_id', 'final_validation_status', 'update_time', 'id'),
+        Index('ix_upload_supplier_session_ens', 'session_id', 'ens_id'),
+    )
 
 
 class SupplierMasterData(Base):
@@ -219,6 +225,8 @@ class SupplierMasterData(Base):
     # Ensure unique constraint for (ens_id, session_id)
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', name='supplier_master_ensid_session'),
+        Index('ix_supplier_master_session_update_time', 'session_id', 'update_time', 'id'),
+        Index('ix_supplier_master_session_ens', 'session_id', 'ens_id'),
     )
 
 class ExternalSupplierData(Base):
@@ -314,6 +322,7 @@ class ExternalSupplierData(Base):
     # Add the UniqueConstraint on the combination of ens_id and session_id
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', name='unique_ens_session'),
+        Index('ix_external_supplier_session_ens', 'session_id', 'ens_id'),
     )
 
 class KPISchemas(Base):    
@@ -336,6 +345,7 @@ class KpiCyes(KPISchemas):
     # Ensure unique constraint for (ens_id, session_id, kpi_code)
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpicyes'),
+        Index('ix_cyes_session_ens', 'session_id', 'ens_id'),
     )
     
 
@@ -343,6 +353,7 @@ class KpiFstb(KPISchemas):
     __tablename__ = "fstb"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpifstb'),
+        Index('ix_fstb_session_ens', 'session_id', 'ens_id'),
     )
     
 
@@ -350,6 +361,7 @@ class KpiLgrk(KPISchemas):
     __tablename__ = "lgrk"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpilgrk'),
+        Index('ix_lgrk_session_ens', 'session_id', 'ens_id'),
     )
     
 
@@ -357,6 +369,7 @@ class KpiNews(KPISchemas):
     __tablename__ = "news"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpinews'),
+        Index('ix_news_session_ens', 'session_id', 'ens_id'),
     )
 
 
@@ -364,29 +377,34 @@ class KpiOval(KPISchemas):
     __tablename__ = "oval"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpioval'),
+        Index('ix_oval_session_ens', 'session_id', 'ens_id'),
     )
 
 class KpiOvar(KPISchemas):
     __tablename__ = "ovar"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpiovar'),
+        Index('ix_ovar_session_ens', 'session_id', 'ens_id'),
     )
 
 class KpiRfct(KPISchemas):
     __tablename__ = "rfct"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpirfct'),
+        Index('ix_rfct_session_ens', 'session_id', 'ens_id'),
     )
 class KpiSape(KPISchemas):
     __tablename__ = "sape"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpisape'),
+        Index('ix_sape_session_ens', 'session_id', 'ens_id'),
     )
     
 class KpiSown(KPISchemas):
     __tablename__ = "sown"
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', 'kpi_code', name='unique_ensid_session_kpisown'),
+        Index('ix_sown_session_ens', 'session_id', 'ens_id'),
     )
 class EnsidScreeningStatus(Base):
     __tablename__ = "ensid_screening_status"
@@ -401,7 +419,21 @@ class EnsidScreeningStatus(Base):
     # Ensure unique constraint for (ens_id, session_id)
     __table_args__ = (
         UniqueConstraint('ens_id', 'session_id', name='unique_ensid_session_ensid_screening_status'),
+        Index('ix_ensid_screening_session_ens', 'session_id', 'ens_id'),
+        # Latest screening per ens_id, answered from the index alone
+        Index('ix_ensid_screening_ens_update_time', 'ens_id', 'update_time', 'id', postgresql_include=['session_id', 'overall_status']),
     )
+
+class LatestEnsScreening(Base):
+    # Latest COMPLETED ensid_screening_status row per ens_id, kept current by the
+    # trg_latest_ens_screening trigger on ensid_screening_status (see the latest_ens_screening migration)
+    __tablename__ = "latest_ens_screening"
+
+    ens_id = Column(String(50), primary_key=True)
+    session_id = Column(String(50), nullable=False)
+    screening_id = Column(Integer, nullable=False)  # ensid_screening_status.id
+    screening_time = Column(DateTime(timezone=True), nullable=False)  # ensid_screening_status.update_time
+
 class SessionScreeningStatus(Base):
     __tablename__ = "session_screening_status"
 
@@ -414,6 +446,7 @@ class SessionScreeningStatus(Base):
     # Ensure unique constraint for (ens_id, session_id)
     __table_args__ = (
         UniqueConstraint('session_id', name='unique_sessionid_session'),
+        Index('ix_session_screening_update_time', 'update_time', 'id'),
     )
 
 
@@ -458,6 +491,7 @@ class CompanyProfile(Base):
 
     __table_args__ = (
         UniqueConstraint("ens_id", "session_id", name="unique_ensid_session"),
+        Index("ix_company_profile_session_ens", "session_id", "ens_id"),
     )
 
 
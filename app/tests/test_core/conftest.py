@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+
+BLOBS_MODIFIED = datetime(2026, 10, 15, 10, 0, tzinfo=timezone.utc)
+
+
+class FakeDownload:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def readall(self) -> bytes:
+        return self._data
+
+    async def chunks(self):
+        yield self._data
+
+
+class FakeContainerClient:
+    """
+    In-memory stand-in for an aio ContainerClient: listing, and downloads optionally pinned to an ETag.
+
+    Blobs are stored in insertion order, each one a minute newer than the previous, and every write
+    gets a new ETag. Counts listings and downloads, and the peak number of downloads in flight.
+    """
+
+    def __init__(self, blobs: dict = None, fail: str = None, latency: float = 0.0):
+        self.properties = {}
+        self.data = {}
+        self.fail = fail
+        self.latency = latency
+        self.listings = 0
+        self.downloads = 0
+        self.active = 0
+        self.peak = 0
+        self._writes = 0
+        for name, data in (blobs or {}).items():
+            self.put(name, data)
+
+    def put(self, name: str, data: bytes):
+        self.properties[name] = SimpleNamespace(
+            name=name,
+            etag=f"0x8DC{self._writes:05d}",
+            last_modified=BLOBS_MODIFIED + timedelta(minutes=self._writes),
+            size=len(data),
+        )
+        self.data[name] = data
+        self._writes += 1
+
+    def blob_list(self) -> list:
+        return list(self.properties.values())
+
+    async def list_blobs(self, name_starts_with: str = ""):
+        self.listings += 1
+        for blob in self.blob_list():
+            if blob.name.startswith(name_starts_with):
+                yield blob
+
+    def get_blob_client(self, name: str):
+        async def download_blob(offset: int = None, length: int = None, etag: str = None, match_condition=None):
+            self.downloads += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(self.latency)
+                if name == self.fail:
+                    raise OSError(f"connection reset while reading {name}")
+                if name not in self.properties:
+                    raise ResourceNotFoundError(f"{name} does not exist")
+                if etag is not None and etag.strip('"') != self.properties[name].etag:
+                    raise ResourceModifiedError(f"{name} no longer has ETag {etag}")
+                data = self.data[name]
+                if offset is not None:
+                    data = data[offset:offset + length if length is not None else None]
+                return FakeDownload(data)
+            finally:
+                self.active -= 1
+
+        return SimpleNamespace(download_blob=download_blob)
+
+
+@pytest.fixture
+def fake_container_client():
+    """Factory for FakeContainerClient."""
+    return FakeContainerClient
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from app.core import blob_storage
+from app.core.config import get_settings
+
+BLOB_LATENCY_SECONDS = 0.05
+BLOB_BODY = b"%PDF-1.7 report" * 1024
+
+
+async def start_fake_storage(peers: set, in_flight: dict):
+    """Minimal stand-in for the Blob service GET endpoint, with a fixed per-request latency."""
+    async def get_blob(request: web.Request) -> web.Response:
+        peers.add(request.transport.get_extra_info("peername"))
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            await asyncio.sleep(BLOB_LATENCY_SECONDS)
+        finally:
+            in_flight["now"] -= 1
+        headers = {
+            "Content-Range": f"bytes 0-{len(BLOB_BODY) - 1}/{len(BLOB_BODY)}",
+            "ETag": '"0x8DCREPORT"',
+            "Last-Modified": "Thu, 15 Oct 2026 10:00:00 GMT",
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-version": "2025-01-05",
+        }
+        return web.Response(body=BLOB_BODY, status=206, headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/{container}/{blob:.*}", get_blob)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_shared_client_downloads_concurrently_over_a_bounded_pool(monkeypatch) -> None:
+    peers = set()
+    in_flight = {"now": 0, "peak": 0}
+    runner, account_url = await start_fake_storage(peers, in_flight)
+    storage = get_settings().storage
+    monkeypatch.setattr(storage, "storage_account_url", account_url)
+    monkeypatch.setattr(storage, "sas_token", "sv=2025-01-05&sr=c&sp=r&sig=fake")
+    monkeypatch.setattr(storage, "max_connections", 4)
+    await blob_storage.close_blob_service_client()
+
+    downloads = 16
+    try:
+        client = blob_storage.get_blob_service_client()
+        assert blob_storage.get_blob_service_client() is client
+        container_client = client.get_container_client("session-1")
+
+        async def download(n: int) -> bytes:
+            stream = await container_client.get_blob_client(f"ens-{n}/report.pdf").download_blob()
+            return await stream.readall()
+
+        bodies = await asyncio.gather(*(download(n) for n in range(downloads)))
+    finally:
+        await blob_storage.close_blob_service_client()
+        await runner.cleanup()
+
+    assert all(body == BLOB_BODY for body in bodies)
+    # Downloads share the pool: never more than four connections, all of them busy at once
+    assert len(peers) <= 4
+    assert in_flight["peak"] == 4
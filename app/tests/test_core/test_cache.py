@@ -0,0 +1,72 @@
+import pytest
+
+from app.core.utils import cache
+from app.core.utils.cache import ByteLRUCache, TTLCache
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    lru = TTLCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    ttl_cache = TTLCache(maxsize=10, ttl=60)
+    ttl_cache.set("session", True)
+
+    now = 1059.0
+    assert ttl_cache.get("session") is True
+
+    now = 1061.0
+    assert ttl_cache.get("session") is None
+    assert len(ttl_cache) == 0
+
+
+def test_hits_and_misses_are_counted() -> None:
+    lru = TTLCache(maxsize=10)
+    lru.set("a", 1)
+
+    lru.get("a")
+    lru.get("missing")
+
+    assert (lru.hits, lru.misses) == (1, 1)
+
+
+def test_pop_removes_entry() -> None:
+    lru = TTLCache(maxsize=10)
+    lru.set("a", 1)
+
+    assert lru.pop("a") == 1
+    assert lru.pop("a", "gone") == "gone"
+
+
+def test_byte_lru_is_bounded_by_total_size() -> None:
+    lru = ByteLRUCache(max_bytes=10)
+    lru.set("a", b"aaaa")
+    lru.set("b", b"bbbb")
+    assert lru.get("a") == b"aaaa"
+
+    lru.set("c", b"cccc")
+
+    assert lru.get("b") is None
+    assert lru.get("a") == b"aaaa"
+    assert lru.nbytes == 8
+
+
+def test_byte_lru_skips_values_larger_than_the_budget() -> None:
+    lru = ByteLRUCache(max_bytes=10)
+    lru.set("a", b"aaaa")
+    lru.set("a", b"x" * 11)
+
+    assert lru.get("a") is None
+    assert lru.nbytes == 0
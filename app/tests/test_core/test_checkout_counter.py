@@ -0,0 +1,35 @@
+import pytest
+
+from app.core import database_session
+from app.core.database_session import CheckoutCounterMiddleware
+from app.core.utils import metrics
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_checkouts_are_counted_per_http_request() -> None:
+    metrics.reset()
+
+    async def app(scope, receive, send):
+        for _ in range(scope["checkouts"]):
+            database_session._count_checkout(None, None, None)
+
+    middleware = CheckoutCounterMiddleware(app)
+    await middleware({"type": "http", "checkouts": 1}, None, None)
+    await middleware({"type": "http", "checkouts": 3}, None, None)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["observations"]["db_checkouts_per_request"]["count"] == 2
+    assert snapshot["observations"]["db_checkouts_per_request"]["max"] == 3
+    assert snapshot["counters"]["db_pool_checkouts"] == 4
+    assert snapshot["counters"]["db_requests_with_multiple_checkouts"] == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_checkouts_outside_a_request_only_hit_the_global_counter() -> None:
+    metrics.reset()
+
+    database_session._count_checkout(None, None, None)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["db_pool_checkouts"] == 1
+    assert "db_checkouts_per_request" not in snapshot["observations"]
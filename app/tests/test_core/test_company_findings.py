@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.core.supplier import graph
+
+
+class FakeSessionContext:
+    async def __aenter__(self):
+        return "profile-session"
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_profile_is_read_concurrently_on_its_own_session(monkeypatch) -> None:
+    union_started = asyncio.Event()
+    profile_started = asyncio.Event()
+
+    async def pull_latest_session_id(ens_id, session):
+        return "session-1", "2026-10-15T10:00:00"
+
+    async def pull_profile(ens_id, latest_session_id, session):
+        profile_started.set()
+        # Only completes if the ratings/KPI union is already in flight
+        await union_started.wait()
+        return {"name": "Acme", "session": session}
+
+    async def pull_ratings_and_kpis(ens_id, session_id, session):
+        union_started.set()
+        await profile_started.wait()
+        return {"sanctions_rating": "Low"}, {"sanctions": []}
+
+    monkeypatch.setattr(graph, "pull_latest_session_id", pull_latest_session_id)
+    monkeypatch.setattr(graph, "pull_profile", pull_profile)
+    monkeypatch.setattr(graph, "pull_ratings_and_kpis", pull_ratings_and_kpis)
+    monkeypatch.setattr(graph.database_session, "get_async_session", FakeSessionContext)
+
+    findings = await asyncio.wait_for(graph.compile_company_findings("ens-1", "request-session"), timeout=1)
+
+    assert findings["profile"] == {"name": "Acme", "session": "profile-session"}
+    assert findings["ratings"] == {"sanctions_rating": "Low"}
+    assert findings["findings"] == {"sanctions": []}
+    assert findings["metadata"]["latest_session_id"] == "session-1"
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from app.core.utils.country_utils import normalise_country, normalise_country_column
+
+
+def test_names_codes_and_aliases_resolve_case_insensitively() -> None:
+    countries = pd.Series(["Germany", "germany", "DEU", "de", "USA", "uk", " United  Kingdom ", "Korea (South)"])
+
+    assert normalise_country_column(countries).tolist() == ["DE", "DE", "DE", "DE", "US", "GB", "GB", "KR"]
+
+
+def test_unknown_and_empty_values_are_kept() -> None:
+    countries = pd.Series(["Atlantis", "", None], dtype=object)
+
+    assert normalise_country_column(countries).tolist() == ["Atlantis", "", None]
+
+
+def test_single_value_lookup_matches_column_lookup() -> None:
+    assert normalise_country("Viet Nam") == "VN"
+    assert normalise_country("Atlantis") == "Atlantis"
+    assert normalise_country(None) is None
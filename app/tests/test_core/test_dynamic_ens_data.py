@@ -0,0 +1,178 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.utils.db_utils import (
+    TOTAL_COUNT_LABEL,
+    encode_pagination_cursor,
+    get_dynamic_ens_data,
+)
+
+UPDATE_TIME = datetime(2026, 10, 15, 10, 0, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, keys: list, rows: list):
+        self._keys = keys
+        self._rows = rows
+
+    def keys(self):
+        return self._keys
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar(self):
+        return self._rows[0][0] if self._rows else None
+
+
+class FakeSession:
+    """Answers each execute() with the next queued result and keeps the compiled SQL."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, query):
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+        return self.results.pop(0)
+
+
+class SqliteSession:
+    """Runs each statement for real against an in-memory sqlite table."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def execute(self, query):
+        return self.connection.execute(query)
+
+
+@pytest.fixture
+def sqlite_session():
+    # Only the columns the queries touch; the model's own DDL is Postgres-specific
+    with create_engine("sqlite://").connect() as connection:
+        connection.execute(text(
+            "CREATE TABLE upload_supplier_master_data "
+            "(id INTEGER PRIMARY KEY, ens_id TEXT, session_id TEXT, name TEXT, update_time TIMESTAMP)"
+        ))
+        yield SqliteSession(connection)
+
+
+def insert_upload_rows(session: SqliteSession, *rows) -> None:
+    session.connection.execute(
+        text(
+            "INSERT INTO upload_supplier_master_data (id, ens_id, session_id, name, update_time) "
+            "VALUES (:id, :ens_id, 'session-1', :name, '2026-10-15 10:00:00')"
+        ),
+        [{"id": n, "ens_id": ens_id, "name": name} for n, (ens_id, name) in enumerate(rows)],
+    )
+
+
+def page_rows(count: int, total=None) -> list:
+    rows = [(f"ens-{n}", "Supplier", UPDATE_TIME, n) for n in range(count)]
+    return [row + (total,) for row in rows] if total is not None else rows
+
+
+def page_result(count: int, total=None) -> FakeResult:
+    keys = ["ens_id", "name", "_cursor_update_time", "_cursor_id"]
+    return FakeResult(keys + [TOTAL_COUNT_LABEL] if total is not None else keys, page_rows(count, total))
+
+
+async def fetch(session, **kwargs):
+    extra_filters = {"offset": 0, "limit": 2, **kwargs.pop("extra_filters", {})}
+    return await get_dynamic_ens_data(
+        "upload_supplier_master_data", ["ens_id", "name"], session_id="session-1",
+        session=session, extra_filters=extra_filters, **kwargs
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_first_page_reads_the_total_from_a_window_count() -> None:
+    session = FakeSession(page_result(2, total=7))
+
+    rows, total, next_cursor = await fetch(session)
+
+    assert "count(*) OVER ()" in session.statements[0]
+    assert total == 7
+    assert rows == [{"ens_id": "ens-0", "name": "Supplier"}, {"ens_id": "ens-1", "name": "Supplier"}]
+    assert next_cursor == encode_pagination_cursor(UPDATE_TIME, 1)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cursor_page_counts_the_unseeked_filter_set() -> None:
+    session = FakeSession(page_result(1, total=7))
+
+    _, total, next_cursor = await fetch(session, extra_filters={"cursor": encode_pagination_cursor(UPDATE_TIME, 5)})
+
+    assert "OVER" not in session.statements[0]
+    assert "(SELECT count(*) AS count_1 \nFROM upload_supplier_master_data \nWHERE" in session.statements[0]
+    assert total == 7
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_distinct_page_and_total_count_duplicate_rows_once(sqlite_session) -> None:
+    insert_upload_rows(
+        sqlite_session,
+        ("ens-1", "Acme"), ("ens-1", "Acme"), ("ens-1", "Acme"), ("ens-1", "Acme GmbH"), ("ens-2", "Other"),
+    )
+
+    rows, total, next_cursor = await fetch(sqlite_session, ens_id="ens-1")
+
+    # Three identical (ens_id, name) rows collapse to one under DISTINCT
+    assert sorted(row["name"] for row in rows) == ["Acme", "Acme GmbH"]
+    assert total == 2
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cursor_is_rejected_for_distinct_reads() -> None:
+    session = FakeSession()
+
+    with pytest.raises(HTTPException) as error:
+        await fetch(session, ens_id="ens-1", extra_filters={"cursor": encode_pagination_cursor(UPDATE_TIME, 5)})
+
+    assert error.value.status_code == 400
+    assert session.statements == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_without_total_the_page_size_is_returned() -> None:
+    session = FakeSession(page_result(2))
+
+    rows, total, _ = await fetch(session, with_total=False)
+
+    assert "count(" not in session.statements[0]
+    assert len(rows) == 2
+    assert total == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_page_past_the_end_probes_for_the_session_then_counts() -> None:
+    session = FakeSession(page_result(0, total=0), FakeResult(["anon_1"], [(1,)]), FakeResult(["count_1"], [(7,)]))
+
+    rows, total, next_cursor = await fetch(session, extra_filters={"offset": 100})
+
+    assert rows == []
+    assert total == 7
+    assert next_cursor is None
+    assert "LIMIT" in session.statements[1]
+    assert session.statements[2].startswith("SELECT count(*)")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_empty_page_of_an_unknown_session_is_a_404() -> None:
+    session = FakeSession(page_result(0, total=0), FakeResult(["anon_1"], []))
+
+    with pytest.raises(HTTPException) as error:
+        await fetch(session)
+
+    assert error.value.status_code == 404
+    assert len(session.statements) == 2
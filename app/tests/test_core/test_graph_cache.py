@@ -0,0 +1,67 @@
+import pytest
+
+from app.core.supplier import graph_cache
+from app.core.utils import metrics
+
+
+def test_equivalent_filter_sets_share_a_key() -> None:
+    first = graph_cache.canonical_filters({"country": ["SA", "AE"], "name": None, "overall_rating": ["string"]})
+    second = graph_cache.canonical_filters({"overall_rating": [], "country": ["AE", "SA"]})
+
+    assert first == second
+    assert first != graph_cache.canonical_filters({"country": ["SA"]})
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_cache_counts_hits_and_misses() -> None:
+    metrics.reset()
+    await graph_cache.invalidate_all()
+    key = graph_cache.canonical_filters({"country": ["SA"]})
+
+    assert await graph_cache.get_cached_graph("client-a", key) is None
+    await graph_cache.store_graph("client-a", key, {"nodes": [], "edges": []}, graph_cache.current_generation("client-a"))
+    assert await graph_cache.get_cached_graph("client-a", key) == {"nodes": [], "edges": []}
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["graph_cache_hits"] == 1
+    assert counters["graph_cache_misses"] == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_completed_screening_invalidates_only_that_client() -> None:
+    await graph_cache.invalidate_all()
+    key = graph_cache.canonical_filters({})
+    for client_id in ("client-a", "client-b"):
+        await graph_cache.store_graph(client_id, key, {"client": client_id}, graph_cache.current_generation(client_id))
+    graph_cache.SESSION_CLIENT_CACHE.set("session-1", ["client-a"])
+
+    await graph_cache.handle_ens_status_notification({"session_id": "session-1", "overall_status": "IN_PROGRESS"})
+    assert await graph_cache.get_cached_graph("client-a", key) == {"client": "client-a"}
+
+    await graph_cache.handle_ens_status_notification({"session_id": "session-1", "overall_status": "COMPLETED"})
+    assert await graph_cache.get_cached_graph("client-a", key) is None
+    assert await graph_cache.get_cached_graph("client-b", key) == {"client": "client-b"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_computed_across_an_invalidation_is_not_stored() -> None:
+    await graph_cache.invalidate_all()
+    key = graph_cache.canonical_filters({})
+    generation = graph_cache.current_generation("client-a")
+
+    await graph_cache.invalidate_client("client-a")
+    await graph_cache.store_graph("client-a", key, {"stale": True}, generation)
+
+    assert await graph_cache.get_cached_graph("client-a", key) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_computed_across_a_full_invalidation_is_not_stored() -> None:
+    await graph_cache.invalidate_all()
+    key = graph_cache.canonical_filters({})
+    generation = graph_cache.current_generation("client-a")
+
+    await graph_cache.invalidate_all()
+    await graph_cache.store_graph("client-a", key, {"stale": True}, generation)
+
+    assert await graph_cache.get_cached_graph("client-a", key) is None
@@ -0,0 +1,30 @@
+import pytest
+
+from app.core import graph_database
+from app.core.config import get_settings
+from app.core.utils import metrics
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_driver_is_shared_until_closed() -> None:
+    await graph_database.close_graph_driver()
+
+    driver = graph_database.get_graph_driver()
+    assert graph_database.get_graph_driver() is driver
+
+    await graph_database.close_graph_driver()
+    assert graph_database.get_graph_driver() is not driver
+    await graph_database.close_graph_driver()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_pool_metrics_report_configured_size() -> None:
+    metrics.reset()
+    graph_database.get_graph_driver()
+
+    graph_database.publish_graph_pool_metrics()
+
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["graph_pool_max_size"] == get_settings().graphdb.max_connection_pool_size
+    assert gauges["graph_pool_in_use"] == 0
+    await graph_database.close_graph_driver()
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from app.core.supplier.graph import stream_graph_retrieval
+
+
+class FakeRecord:
+    def __init__(self, row: dict):
+        self._row = row
+
+    def data(self) -> dict:
+        return self._row
+
+
+class FakeResult:
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield FakeRecord(row)
+
+
+class FakeSession:
+    def __init__(self, results: list):
+        self._results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, params):
+        return FakeResult(self._results.pop(0))
+
+
+class FakeDriver:
+    def __init__(self, *results):
+        self._results = list(results)
+
+    def session(self):
+        return FakeSession(self._results)
+
+
+def supplier(supplier_id: str) -> dict:
+    return {"id": supplier_id, "type": "Organization", "overall_rating": "Low", "sanctions_rating": "Low"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_stream_emits_each_node_and_edge_once() -> None:
+    client = {"id": "client", "type": "Company"}
+    shared_owner = {"id": "owner", "type": "Individual"}
+    suppliers_rows = [
+        {"client": dict(client), "supplier": supplier("s1"), "supplierRelationship": ({"id": "s1"}, "SUPPLIER_OF", {"id": "client"})},
+        {"client": dict(client), "supplier": supplier("s2"), "supplierRelationship": ({"id": "s2"}, "SUPPLIER_OF", {"id": "client"})},
+    ]
+    neighbourhood_rows = [
+        {
+            "individuals": [], "individualRelationships": [],
+            "individualsCorpGroup": [dict(shared_owner)],
+            "individualRelationshipsCorpGroup": [({"id": "owner"}, "SHAREHOLDER_OF", {"id": "s1"})],
+            # s2 is a direct supplier as well as a shareholder of s1
+            "companyCorpGroup": [supplier("s2")],
+            "companyRelationshipsCorpGroup": [({"id": "s2"}, "SHAREHOLDER_OF", {"id": "s1"})],
+        },
+        {
+            "individuals": [], "individualRelationships": [],
+            "individualsCorpGroup": [dict(shared_owner)],
+            "individualRelationshipsCorpGroup": [({"id": "owner"}, "SHAREHOLDER_OF", {"id": "s2"}), ({"id": "owner"}, "SHAREHOLDER_OF", {"id": "s2"})],
+            "companyCorpGroup": [], "companyRelationshipsCorpGroup": [],
+        },
+    ]
+    driver = FakeDriver(suppliers_rows, neighbourhood_rows)
+
+    chunks = [chunk async for chunk in stream_graph_retrieval({"client": "Aramco", "client_id": "client"}, driver)]
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+
+    nodes = {line["node"]["id"]: line["node"] for line in lines if line["type"] == "node"}
+    edges = [line["edge"] for line in lines if line["type"] == "edge"]
+    assert list(nodes) == ["client", "s1", "s2", "owner"]
+    assert nodes["client"]["node_category"] == "central"
+    assert nodes["s2"]["node_category"] == "direct"
+    assert nodes["owner"]["node_type"] == "Individual"
+    assert len(edges) == 5
+    assert {"source": "owner", "target": "s1", "relationship_type": "SHAREHOLDER"} in edges
+    assert lines[-1] == {"type": "summary", "nodes": 4, "edges": 5}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graph_stream_reports_failures_in_band() -> None:
+    class FailingDriver:
+        def session(self):
+            raise RuntimeError("graph unavailable")
+
+    chunks = [chunk async for chunk in stream_graph_retrieval({"client": None, "client_id": "client"}, FailingDriver())]
+
+    assert json.loads(chunks[-1]) == {"type": "error", "detail": "Failed to generate network graph: graph unavailable"}
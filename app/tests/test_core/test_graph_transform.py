@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.supplier.graph import RATING_THEME_WEIGHTAGE, transform_graph_data
+
+
+def graph_record(**overrides) -> dict:
+    record = {
+        "client": {"id": "client"},
+        "suppliers": [], "individuals": [], "companyCorpGroup": [], "individualsCorpGroup": [],
+        "supplierRelationships": [], "individualRelationships": [],
+        "individualRelationshipsCorpGroup": [], "companyRelationshipsCorpGroup": [],
+    }
+    record.update(overrides)
+    return record
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_transform_returns_formatted_nodes_once_each() -> None:
+    high_risk = {"id": "s1", "type": "Organization", "overall_rating": "High", **{field: "High" for field in RATING_THEME_WEIGHTAGE}}
+    record = graph_record(
+        suppliers=[high_risk],
+        individuals=[{"id": "p1", "type": "Individual", "pep_indicator": "true"}],
+        # s1 is also in the corporate group; it stays a direct supplier
+        companyCorpGroup=[{"id": "s1", "type": "Organization"}],
+        supplierRelationships=[({"id": "s1"}, "SUPPLIER_OF", {"id": "client"})],
+        individualRelationships=[({"id": "p1"}, "MANAGEMENT_OF", {"id": "s1"}), ({"id": "p1"}, "MANAGEMENT_OF", {"id": "s1"})],
+        individualRelationshipsCorpGroup=[({"id": "s1"}, "SHAREHOLDER_OF", {"id": "s1"})],
+        companyRelationshipsCorpGroup=[({"id": "p1"}, "ULTIMATELY_OWNED_SUBSIDIARY_OF", {"id": "client"})],
+    )
+
+    graph = await transform_graph_data([record], "client")
+
+    nodes = {node["id"]: node for node in graph["nodes"]}
+    assert list(nodes) == ["s1", "p1", "client"]
+    assert nodes["s1"]["node_category"] == "direct"
+    assert nodes["s1"]["risk_intensity_score"] == 100
+    assert nodes["s1"]["node_colour"] == "#c52525"
+    assert nodes["p1"]["node_risk_description"] == "Risks: PeP"
+    assert nodes["client"]["node_type"] == "Company"
+    assert nodes["client"]["node_size"] == 450
+    assert graph["edges"] == [
+        {"source": "s1", "target": "client", "relationship_type": "SUPPLIER"},
+        {"source": "p1", "target": "s1", "relationship_type": "MANAGEMENT"},
+        {"source": "p1", "target": "client", "relationship_type": "ULTIMATELY OWNED SUBSIDIARY"},
+    ]
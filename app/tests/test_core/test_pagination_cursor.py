@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.utils.db_utils import decode_pagination_cursor, encode_pagination_cursor
+
+
+def test_cursor_round_trips_update_time_and_id() -> None:
+    update_time = datetime(2025, 6, 9, 12, 10, 32, 875807, tzinfo=timezone.utc)
+    cursor = encode_pagination_cursor(update_time, 4242)
+
+    assert decode_pagination_cursor(cursor) == (update_time, 4242)
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = encode_pagination_cursor(datetime.now(timezone.utc), 1)
+
+    assert "=" not in cursor
+    assert "+" not in cursor
+    assert "/" not in cursor
+
+
+def test_malformed_cursor_is_rejected() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        decode_pagination_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == 400
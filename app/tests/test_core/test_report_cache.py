@@ -0,0 +1,33 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.supplier import report, report_cache, report_manifest
+from app.core.utils import metrics
+
+REPORT = {"ens_id": "ens-1", "sections": [{"title": "Sanctions", "rating": "Low"}] * 50}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_review_report_is_downloaded_once_and_served_pre_encoded(monkeypatch, fake_container_client) -> None:
+    async def reports_ready(session_id, session):
+        return None
+
+    monkeypatch.setattr(report, "check_session_reports_ready", reports_ready)
+    await report_manifest.reset_report_manifest()
+    report_cache.REVIEW_REPORT_CACHE.clear()
+    metrics.reset()
+    container_client = fake_container_client({"ens-1/report.json": json.dumps(REPORT, indent=2).encode("utf-8")})
+    blob_service_client = SimpleNamespace(get_container_client=lambda name: container_client)
+
+    bodies = [
+        await report.reviw_json_report_(None, "session-1", "ens-1", "json", blob_service_client=blob_service_client)
+        for _ in range(3)
+    ]
+
+    assert json.loads(bodies[0]) == {"data": REPORT}
+    assert bodies[0] == bodies[1] == bodies[2]
+    assert container_client.downloads == 1
+    counters = metrics.snapshot()["counters"]
+    assert (counters["review_report_cache_misses"], counters["review_report_cache_hits"]) == (1, 2)
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.supplier import report
+from app.core.supplier.report import etag_matches, parse_range_header
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=900-", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=500-5000", (500, 999)),
+        # Not honoured: the whole report is served instead
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+        ("bytes=9-0", None),
+        ("bytes=abc-", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range_header(header, expected) -> None:
+    assert parse_range_header(header, SIZE) == expected
+
+
+def test_range_past_the_end_is_unsatisfiable() -> None:
+    with pytest.raises(HTTPException) as error:
+        parse_range_header("bytes=1000-", SIZE)
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == "bytes */1000"
+
+
+def test_etag_matches_quoted_weak_and_listed_values() -> None:
+    assert etag_matches('"0x8DCREPORT"', "0x8DCREPORT")
+    assert etag_matches('W/"0x8DCREPORT"', '"0x8DCREPORT"')
+    assert etag_matches('"0x8DCOLDER", "0x8DCREPORT"', "0x8DCREPORT")
+    assert etag_matches("*", "0x8DCREPORT")
+    assert not etag_matches('"0x8DCOLDER"', "0x8DCREPORT")
+    assert not etag_matches(None, "0x8DCREPORT")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unknown_session_is_not_found_on_every_report_path(monkeypatch) -> None:
+    async def session_exists(session_id, session):
+        return False
+
+    monkeypatch.setattr(report, "session_exists", session_exists)
+
+    with pytest.raises(HTTPException) as download_error:
+        await report.report_download_stream("missing-session", "ens-1", "pdf", None)
+    with pytest.raises(HTTPException) as bulk_error:
+        await report.report_bulk_download_stream("missing-session", None)
+    with pytest.raises(HTTPException) as review_error:
+        await report.reviw_json_report_(None, "missing-session", "ens-1", "json")
+
+    for error in (download_error, bulk_error, review_error):
+        assert error.value.status_code == 404
+        assert error.value.detail == "No records found for session_id: missing-session"
@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.supplier import report, report_manifest
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_one_listing_serves_every_extension_of_an_ens_id(fake_container_client) -> None:
+    await report_manifest.reset_report_manifest()
+    container_client = fake_container_client({
+        "ens-1/old.pdf": b"old", "ens-1/new.pdf": b"new", "ens-1/report.docx": b"docx", "ens-2/report.pdf": b"pdf"
+    })
+
+    latest_pdf = await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "pdf")
+    latest_docx = await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "docx")
+    missing_json = await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "json")
+
+    assert latest_pdf.name == "ens-1/new.pdf"
+    assert latest_docx.name == "ens-1/report.docx"
+    assert missing_json is None
+    assert container_client.listings == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_status_notification_drops_only_that_ens_id(fake_container_client) -> None:
+    await report_manifest.reset_report_manifest()
+    container_client = fake_container_client({"ens-1/report.pdf": b"pdf", "ens-2/report.pdf": b"pdf"})
+    for ens_id in ("ens-1", "ens-2"):
+        await report_manifest.get_latest_report_blob(container_client, "session-1", ens_id, "pdf")
+
+    await report_manifest.handle_ens_status_notification({"session_id": "session-1", "ens_id": "ens-1"})
+    await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-2", "pdf")
+    assert container_client.listings == 2
+
+    container_client.put("ens-1/regenerated.pdf", b"pdf")
+    latest = await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "pdf")
+    assert latest.name == "ens-1/regenerated.pdf"
+    assert container_client.listings == 3
+
+
+@pytest.fixture
+def reports_ready(monkeypatch):
+    async def session_ready(session_id, session):
+        return None
+
+    monkeypatch.setattr(report, "check_session_reports_ready", session_ready)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_download_of_a_replaced_report_lists_again_and_retries(reports_ready, fake_container_client) -> None:
+    await report_manifest.reset_report_manifest()
+    container_client = fake_container_client({"ens-1/report.pdf": b"first"})
+    blob_service_client = SimpleNamespace(get_container_client=lambda name: container_client)
+    await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "pdf")
+
+    # Replaced without a status notification: the manifest still holds the old ETag
+    container_client.put("ens-1/report.pdf", b"second")
+    result = await report.report_download_stream("session-1", "ens-1", "pdf", None, blob_service_client)
+
+    assert result["status_code"] == 200
+    assert b"".join([chunk async for chunk in result["content"]]) == b"second"
+    assert container_client.listings == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_review_of_a_removed_report_falls_back_to_the_latest_remaining(reports_ready, fake_container_client) -> None:
+    await report_manifest.reset_report_manifest()
+    container_client = fake_container_client({"ens-1/older.json": b'{"v": 1}', "ens-1/newer.json": b'{"v": 2}'})
+    blob_service_client = SimpleNamespace(get_container_client=lambda name: container_client)
+    await report_manifest.get_latest_report_blob(container_client, "session-1", "ens-1", "json")
+
+    del container_client.properties["ens-1/newer.json"]
+    body = await report.reviw_json_report_(None, "session-1", "ens-1", "json", blob_service_client=blob_service_client)
+
+    assert json.loads(body) == {"data": {"v": 1}}
+    assert container_client.listings == 2
@@ -0,0 +1,30 @@
+import io
+import zipfile
+
+import pytest
+
+from app.core.supplier.report import iter_report_zip
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_streamed_zip_holds_every_report_and_bounds_parallel_downloads(fake_container_client) -> None:
+    bodies = {f"ens-{n}/report.pdf": f"report {n} ".encode() * 5000 for n in range(12)}
+    container_client = fake_container_client(bodies, latency=0.01)
+
+    chunks = [chunk async for chunk in iter_report_zip(container_client, container_client.blob_list(), concurrency=3)]
+
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert {name: archive.read(name) for name in archive.namelist()} == bodies
+        assert archive.getinfo("ens-0/report.pdf").date_time == (2026, 10, 15, 10, 0, 0)
+    assert container_client.peak == 3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_streamed_zip_stops_on_a_failed_download(fake_container_client) -> None:
+    bodies = {f"ens-{n}/report.pdf": b"report" for n in range(4)}
+    container_client = fake_container_client(bodies, fail="ens-2/report.pdf", latency=0.01)
+
+    with pytest.raises(OSError):
+        [chunk async for chunk in iter_report_zip(container_client, container_client.blob_list(), concurrency=2)]
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from openpyxl import Workbook
+
+from app.core.utils import metrics, upload_utils
+from app.core.utils.upload_utils import (
+    generate_ens_ids,
+    iter_excel_rows,
+    prepare_upload_rows,
+    run_in_upload_pool,
+)
+
+
+def make_workbook(rows: list[list]) -> io.BytesIO:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "country", "national_id"])
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_rows_are_streamed_in_fixed_size_chunks() -> None:
+    workbook = make_workbook([[f"Supplier {i}", "Germany", 1000 + i] for i in range(7)])
+
+    chunks = list(iter_excel_rows(workbook, chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[0][0] == {"name": "Supplier 0", "country": "Germany", "national_id": 1000}
+
+
+def test_blank_cells_become_empty_strings_and_blank_rows_are_skipped() -> None:
+    workbook = make_workbook([["Acme", None, 42], [None, None, None], ["Globex", "France", 7]])
+
+    (chunk,) = list(iter_excel_rows(workbook, chunk_size=10))
+
+    assert chunk == [
+        {"name": "Acme", "country": "", "national_id": 42},
+        {"name": "Globex", "country": "France", "national_id": 7},
+    ]
+
+
+def test_prepare_upload_rows_normalises_country_and_prefixes_columns() -> None:
+    rows = prepare_upload_rows([{"name": "Acme", "country": "Germany", "national_id": 42}], "user-1", "session-1")
+
+    assert rows[0]["uploaded_country"] == "DE"
+    assert rows[0]["unmodified_country"] == "Germany"
+    assert rows[0]["uploaded_national_id"] == "42"
+    assert rows[0]["session_id"] == "session-1"
+    assert rows[0]["user_id"] == "user-1"
+
+
+def test_prepare_upload_rows_rejects_missing_mandatory_fields() -> None:
+    with pytest.raises(ValueError):
+        prepare_upload_rows([{"name": "Acme", "country": "", "national_id": 42}], "user-1", "session-1")
+
+
+def test_validation_error_reports_every_offending_row_number() -> None:
+    rows = [
+        {"name": "Acme", "country": "Germany", "national_id": 1},
+        {"name": "", "country": "Germany", "national_id": 2},
+        {"name": "Globex", "country": "France", "national_id": ""},
+    ]
+
+    with pytest.raises(ValueError, match=r"row\(s\) 502, 503\)"):
+        prepare_upload_rows(rows, "user-1", "session-1", row_offset=500)
+
+
+def test_generated_ens_ids_are_unique_version_4_uuids() -> None:
+    ens_ids = generate_ens_ids(1000)
+
+    assert len(set(ens_ids)) == 1000
+    assert all(str(uuid.UUID(ens_id)) == ens_id and uuid.UUID(ens_id).version == 4 for ens_id in ens_ids)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_run_in_upload_pool_returns_result_and_settles_gauges() -> None:
+    rows = [{"name": f"Supplier {i}", "country": "Germany", "national_id": i} for i in range(50)]
+
+    prepared = await run_in_upload_pool(prepare_upload_rows, rows, "user-1", "session-1")
+
+    assert len(prepared) == 50
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["upload_pool_queued"] == 0
+    assert gauges["upload_pool_running"] == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cancelled_queued_call_leaves_the_queue_gauge(monkeypatch) -> None:
+    monkeypatch.setattr(upload_utils, "_upload_pool", ThreadPoolExecutor(max_workers=1))
+    release = threading.Event()
+    busy = asyncio.create_task(run_in_upload_pool(release.wait))
+    queued = asyncio.create_task(run_in_upload_pool(sum, [1, 2]))
+    await asyncio.sleep(0.05)
+    assert metrics.snapshot()["gauges"]["upload_pool_queued"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await busy
+
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["upload_pool_queued"] == 0
+    assert gauges["upload_pool_running"] == 0
+    upload_utils.shutdown_upload_pool()
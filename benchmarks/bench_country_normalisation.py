@@ -0,0 +1,68 @@
+"""
+Microbenchmark: normalising a 50k-row country column.
+
+Compares the previous per-value ``apply`` over ``pycountry.countries.get(name=...)`` with the
+prebuilt alias index applied through ``Series.map``.
+
+    python -m benchmarks.bench_country_normalisation
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+import pycountry
+
+from app.core.utils.country_utils import normalise_country_column
+
+SPELLINGS = [
+    "Germany", "germany", "DE", "DEU", "United Kingdom", "UK", "USA", "United States",
+    "France", "  India ", "Korea (South)", "Viet Nam", "Vietnam", "Brazil", "Atlantis", "",
+]
+
+
+def legacy_apply(countries: pd.Series) -> pd.Series:
+    cache = {}
+
+    def lookup(country_name):
+        if pd.isna(country_name):
+            return country_name
+        if country_name not in cache:
+            country = pycountry.countries.get(name=country_name)
+            cache[country_name] = country.alpha_2 if country else country_name
+        return cache[country_name]
+
+    return countries.apply(lookup)
+
+
+def best_of(func, countries: pd.Series, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(countries)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(rows: int, repeat: int):
+    random.seed(7)
+    countries = pd.Series(random.choices(SPELLINGS, k=rows), dtype=object)
+
+    legacy = best_of(legacy_apply, countries, repeat)
+    mapped = best_of(normalise_country_column, countries, repeat)
+    alpha_2_codes = {country.alpha_2 for country in pycountry.countries}
+    resolved_legacy = legacy_apply(countries).isin(alpha_2_codes).mean()
+    resolved_mapped = normalise_country_column(countries).isin(alpha_2_codes).mean()
+
+    print(f"rows: {rows}")
+    print(f"apply + pycountry.get : {legacy * 1000:8.1f} ms  resolved {resolved_legacy:.0%}")
+    print(f"alias index Series.map: {mapped * 1000:8.1f} ms  resolved {resolved_mapped:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,123 @@
+"""
+Compare the network-graph Cypher before and after the per-pattern CALL {}
+rewrite of build_dynamic_query_for_direct_suppliers.
+
+Against a scratch Neo4j (never a shared one) a synthetic client is seeded with
+suppliers that each have managers, individual shareholders and corporate
+shareholders. Both queries are run under PROFILE and the script prints the
+largest intermediate row count in the plan, total db hits and wall-clock latency:
+
+    python -m benchmarks.bench_graph_query --uri neo4j://localhost:7687 --user neo4j --password secret
+
+Without a server, --offline prints the intermediate row counts the two query
+shapes produce for the same synthetic graph, computed directly:
+
+    python -m benchmarks.bench_graph_query --offline
+"""
+
+import argparse
+import asyncio
+import time
+
+from neo4j import AsyncGraphDatabase
+
+from app.core.supplier.graph import build_dynamic_query_for_direct_suppliers
+
+CLIENT_ID = "bench-client"
+CORP_RELATIONSHIPS = "SHAREHOLDER_OF|BENEFICIAL_OWNER_OF|ULTIMATELY_OWNED_SUBSIDIARY_OF|GLOBAL_ULTIMATE_OWNER_OF|OTHER_ULTIMATE_BENEFICIARY_OF"
+
+# Query shape before the rewrite: three chained OPTIONAL MATCHes aggregated at the end
+LEGACY_QUERY = f"""
+MATCH (c:Company {{id: $client_id}})<-[r:SUPPLIER_OF]-(s:Supplier)
+OPTIONAL MATCH (i:Individual)-[r1:MANAGEMENT_OF]->(s)
+OPTIONAL MATCH (ic:Individual)-[r2:{CORP_RELATIONSHIPS}]->(s)
+OPTIONAL MATCH (cc:Supplier)-[r3:{CORP_RELATIONSHIPS}]->(s)
+RETURN c AS client, collect(DISTINCT r) AS supplierRelationships, collect(DISTINCT s) AS suppliers, collect(DISTINCT r1) AS individualRelationships, collect(DISTINCT i) AS individuals
+, collect(DISTINCT r2) AS individualRelationshipsCorpGroup, collect(DISTINCT ic) AS individualsCorpGroup, collect(DISTINCT r3) AS companyRelationshipsCorpGroup, collect(DISTINCT cc) AS companyCorpGroup
+"""
+
+SEED_QUERY = """
+CREATE (c:Company {id: $client_id, name: 'Bench Client'})
+WITH c
+UNWIND range(1, $suppliers) AS n
+CREATE (s:Supplier {id: 'bench-s-' + n, name: 'Supplier ' + n, country: 'SA'})-[:SUPPLIER_OF]->(c)
+FOREACH (m IN range(1, $managers) |
+    CREATE (:Individual {id: 'bench-m-' + n + '-' + m})-[:MANAGEMENT_OF]->(s))
+FOREACH (h IN range(1, $shareholders) |
+    CREATE (:Individual {id: 'bench-h-' + n + '-' + h})-[:SHAREHOLDER_OF]->(s))
+FOREACH (k IN range(1, $subsidiaries) |
+    CREATE (:Supplier {id: 'bench-k-' + n + '-' + k})-[:SHAREHOLDER_OF]->(s))
+"""
+
+CLEANUP_QUERY = "MATCH (n) WHERE n.id STARTS WITH 'bench-' DETACH DELETE n"
+
+
+def plan_rows(plan: dict) -> list:
+    rows = [plan.get("rows", 0)]
+    for child in plan.get("children", []):
+        rows += plan_rows(child)
+    return rows
+
+
+def plan_db_hits(plan: dict) -> int:
+    return plan.get("dbHits", 0) + sum(plan_db_hits(child) for child in plan.get("children", []))
+
+
+async def profile(driver, query: str, params: dict, repeat: int):
+    async with driver.session() as session:
+        result = await session.run("PROFILE " + query, params)
+        summary = await result.consume()
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await session.run(query, params)
+            await result.data()
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return max(plan_rows(summary.profile)), plan_db_hits(summary.profile), latencies[len(latencies) // 2]
+
+
+async def run(args):
+    new_query, params = await build_dynamic_query_for_direct_suppliers(CLIENT_ID, {})
+    async with AsyncGraphDatabase.driver(args.uri, auth=(args.user, args.password)) as driver:
+        await driver.execute_query(CLEANUP_QUERY)
+        await driver.execute_query(
+            SEED_QUERY, client_id=CLIENT_ID, suppliers=args.suppliers, managers=args.managers,
+            shareholders=args.shareholders, subsidiaries=args.subsidiaries
+        )
+        try:
+            for label, query in (("chained OPTIONAL MATCH", LEGACY_QUERY), ("per-pattern CALL {}", new_query)):
+                max_rows, db_hits, median_ms = await profile(driver, query, params, args.repeat)
+                print(f"{label:24} max intermediate rows={max_rows:>10}  db hits={db_hits:>10}  median={median_ms:8.1f} ms")
+        finally:
+            await driver.execute_query(CLEANUP_QUERY)
+
+
+def offline(args):
+    per_supplier = max(1, args.managers) * max(1, args.shareholders) * max(1, args.subsidiaries)
+    print(f"chained OPTIONAL MATCH   rows before aggregation={args.suppliers * per_supplier:>10}")
+    largest_pattern = max(args.managers, args.shareholders, args.subsidiaries, 1)
+    print(f"per-pattern CALL {{}}      rows before aggregation={args.suppliers * largest_pattern:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="neo4j://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="neo4j")
+    parser.add_argument("--suppliers", type=int, default=500)
+    parser.add_argument("--managers", type=int, default=12)
+    parser.add_argument("--shareholders", type=int, default=15)
+    parser.add_argument("--subsidiaries", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--offline", action="store_true", help="print computed row counts without a Neo4j server")
+    args = parser.parse_args()
+
+    if args.offline:
+        offline(args)
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()